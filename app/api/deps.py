@@ -1,4 +1,6 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
@@ -46,3 +48,21 @@ async def get_current_user(
         raise credentials_exception
 
     return user
+
+
+# --- Optimistic concurrency ---
+def get_if_match(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """
+    Expected entity version from the If-Match header.
+    Accepts 3, "3" and W/"3"; no header means last write wins.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    value = if_match.strip().removeprefix("W/").strip('"')
+    if not value.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be an entity version",
+        )
+    return int(value)
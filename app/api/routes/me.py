@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.pagination import CursorPage
+from app.schemas.task import TaskRead
+from app.services.task_service import TaskService
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.get(
+    "/tasks",
+    response_model=CursorPage[TaskRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_my_tasks(
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor of the previous page"
+    ),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    status: Optional[str] = Query(default=None, description="Filter by status"),
+    priority: Optional[int] = Query(default=None, description="Filter by priority"),
+    due_from: Optional[datetime] = Query(
+        default=None, description="Only tasks due at or after this time"
+    ),
+    due_to: Optional[datetime] = Query(
+        default=None, description="Only tasks due before this time"
+    ),
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """List tasks assigned to the current user across projects, soonest due first."""
+    return await task_service.get_my_tasks(
+        user_id=current_user.id,
+        page_size=page_size,
+        cursor=cursor,
+        status=status,
+        priority=priority,
+        due_from=due_from,
+        due_to=due_to,
+    )
@@ -1,18 +1,33 @@
+from datetime import date, datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import JSONResponse
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_if_match
 from app.models.user import User
-from app.schemas.pagination import PaginatedResponse
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage, PaginatedResponse
 from app.schemas.project import (
+    ArchiveJobQueued,
+    ArchiveJobRead,
     ProjectCreate,
     ProjectDetailRead,
+    ProjectListItem,
     ProjectRead,
+    ProjectStats,
     ProjectUpdate,
+    ProjectWorkload,
 )
 from app.schemas.sprint import SprintCreate, SprintRead
-from app.schemas.task import TaskCreate, TaskRead
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkCreateResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskCreate,
+    TaskRead,
+)
 from app.services.project_service import ProjectService
 from app.services.sprint_service import SprintService
 from app.services.task_service import TaskService
@@ -28,15 +43,21 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 async def create_project(
     data: ProjectCreate,
     current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     project_service: ProjectService = Depends(),
 ):
-    """Create a new project. Returns single resource."""
-    return await project_service.create_project(data, owner_id=current_user.id)
+    """
+    Create a new project. Returns single resource.
+    Retries with the same Idempotency-Key return the first result.
+    """
+    return await project_service.create_project(
+        data, owner_id=current_user.id, idempotency_key=idempotency_key
+    )
 
 
 @router.get(
     "",
-    response_model=PaginatedResponse[ProjectRead],
+    response_model=PaginatedResponse[ProjectListItem],
     status_code=status.HTTP_200_OK,
 )
 async def list_my_projects(
@@ -48,6 +69,11 @@ async def list_my_projects(
     ),
     sort_by: str = Query(default="created_at", description="Sort by field"),
     order: str = Query(default="asc", pattern="^(asc|desc)$", description="Sort order"),
+    include: Optional[str] = Query(
+        default=None,
+        pattern="^counts$",
+        description="'counts' adds task/member counts and the active sprint",
+    ),
     current_user: User = Depends(get_current_user),
     project_service: ProjectService = Depends(),
 ):
@@ -60,6 +86,7 @@ async def list_my_projects(
         search=search,
         sort_by=sort_by,
         order=order,
+        include_counts=include == "counts",
     )
 
 
@@ -70,11 +97,93 @@ async def list_my_projects(
 )
 async def get_project(
     project_id: int,
+    sprints_limit: int = Query(
+        default=10, ge=1, le=50, description="Sprints embedded in the response"
+    ),
+    current_user: User = Depends(get_current_user),
+    project_service: ProjectService = Depends(),
+):
+    """Get a single project with its active and most recent sprints."""
+    return await project_service.get_project_detail(
+        project_id, current_user.id, sprints_limit=sprints_limit
+    )
+
+
+@router.get(
+    "/{project_id}/stats",
+    response_model=ProjectStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_stats(
+    project_id: int,
+    current_user: User = Depends(get_current_user),
+    project_service: ProjectService = Depends(),
+):
+    """Task counts of a project by status, priority and assignee, plus overdue."""
+    return await project_service.get_project_stats(
+        project_id=project_id, user_id=current_user.id
+    )
+
+
+@router.get(
+    "/{project_id}/workload",
+    response_model=ProjectWorkload,
+    status_code=status.HTTP_200_OK,
+)
+async def get_project_workload(
+    project_id: int,
+    sprint_id: Optional[int] = Query(None, description="Only tasks of this sprint"),
     current_user: User = Depends(get_current_user),
     project_service: ProjectService = Depends(),
 ):
-    """Get a single project. No pagination needed."""
-    return await project_service.get_project_detail(project_id, current_user.id)
+    """Open tasks and weighted load per assignee, by status and priority."""
+    return await project_service.get_project_workload(
+        project_id=project_id, user_id=current_user.id, sprint_id=sprint_id
+    )
+
+
+@router.get(
+    "/{project_id}/history",
+    response_model=CursorPage[HistoryRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_project_history(
+    project_id: int,
+    cursor: Optional[str] = Query(
+        default=None, description="'next_cursor' of the previous page"
+    ),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    changed_by: Optional[int] = Query(
+        default=None, description="Only changes made by this user"
+    ),
+    action: Optional[str] = Query(
+        default=None, description="Filter by action (create, update, delete, ...)"
+    ),
+    changed_from: Optional[datetime] = Query(
+        default=None, description="Only changes at or after this time"
+    ),
+    changed_to: Optional[datetime] = Query(
+        default=None, description="Only changes before this time"
+    ),
+    full: bool = Query(
+        default=False,
+        description="Complete before/after snapshots instead of the changed fields",
+    ),
+    current_user: User = Depends(get_current_user),
+    project_service: ProjectService = Depends(),
+):
+    """List the history of a project, newest first, with keyset pagination."""
+    return await project_service.get_project_history(
+        project_id=project_id,
+        user_id=current_user.id,
+        page_size=page_size,
+        cursor=cursor,
+        changed_by=changed_by,
+        action=action,
+        changed_from=changed_from,
+        changed_to=changed_to,
+        full=full,
+    )
 
 
 @router.patch(
@@ -86,28 +195,66 @@ async def update_project(
     project_id: int,
     data: ProjectUpdate,
     current_user: User = Depends(get_current_user),
+    expected_version: Optional[int] = Depends(get_if_match),
     project_service: ProjectService = Depends(),
 ):
-    """Update a project. Returns single updated resource."""
+    """
+    Update a project. Returns single updated resource.
+    Send If-Match: <version> to reject stale edits (409).
+    """
     return await project_service.update_project(
         project_id=project_id,
         data=data,
         user_id=current_user.id,
+        expected_version=expected_version,
     )
 
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{project_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": ArchiveJobQueued,
+            "description": "Tasks are archived by a background job",
+        }
+    },
+)
 async def delete_project(
     project_id: int,
     current_user: User = Depends(get_current_user),
     project_service: ProjectService = Depends(),
 ):
-    """Delete a project. No response content."""
-    await project_service.delete_project(
+    """
+    Delete a project. No response content, unless its tasks are too many to
+    archive in the request: 202 with the archive job to follow.
+    """
+    queued = await project_service.delete_project(
         project_id=project_id,
         user_id=current_user.id,
     )
-    return None
+    if queued is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content=queued.model_dump()
+    )
+
+
+@router.get(
+    "/{project_id}/archive-jobs/{job_id}",
+    response_model=ArchiveJobRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_archive_job(
+    project_id: int,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    project_service: ProjectService = Depends(),
+):
+    """Progress of the background archive of a deleted project's tasks."""
+    return await project_service.get_archive_job(
+        project_id=project_id, job_id=job_id, user_id=current_user.id
+    )
 
 
 @router.get(
@@ -123,8 +270,21 @@ async def list_project_sprints(
     search: Optional[str] = Query(
         default=None, description="Search in title/description"
     ),
-    start_date: Optional[str] = Query(default=None, description="Filter by start date"),
-    end_date: Optional[str] = Query(default=None, description="Filter by end date"),
+    start_date: Optional[date] = Query(
+        default=None, description="Sprints starting on or after this date"
+    ),
+    end_date: Optional[date] = Query(
+        default=None, description="Sprints ending on or before this date"
+    ),
+    active_on: Optional[date] = Query(
+        default=None, description="Sprints whose dates include this day"
+    ),
+    overlaps_from: Optional[date] = Query(
+        default=None, description="Sprints overlapping the window from this day"
+    ),
+    overlaps_to: Optional[date] = Query(
+        default=None, description="Sprints overlapping the window up to this day"
+    ),
     sort_by: str = Query(default="created_at", description="Sort by field"),
     order: str = Query(default="asc", pattern="^(asc|desc)$", description="Sort order"),
     current_user: User = Depends(get_current_user),
@@ -139,6 +299,9 @@ async def list_project_sprints(
         search=search,
         start_date=start_date,
         end_date=end_date,
+        active_on=active_on,
+        overlaps_from=overlaps_from,
+        overlaps_to=overlaps_to,
         sort_by=sort_by,
         order=order,
     )
@@ -177,6 +340,9 @@ async def list_project_tasks(
         default=None, description="Filter by assigned user"
     ),
     sprint_id: Optional[int] = Query(default=None, description="Filter by sprint"),
+    parent_of: Optional[int] = Query(
+        default=None, description="Only subtasks (at any depth) of this task"
+    ),
     search: Optional[str] = Query(
         default=None, description="Search in title/description"
     ),
@@ -199,6 +365,7 @@ async def list_project_tasks(
         search=search,
         sort_by=sort_by,
         order=order,
+        parent_of=parent_of,
     )
 
 
@@ -211,8 +378,47 @@ async def create_task(
     project_id: int,
     data: TaskCreate,
     current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     task_service: TaskService = Depends(),
 ):
+    """Retries with the same Idempotency-Key return the first result."""
     return await task_service.create_task(
-        data=data, project_id=project_id, user_id=current_user.id
+        data=data,
+        project_id=project_id,
+        user_id=current_user.id,
+        idempotency_key=idempotency_key,
+    )
+
+
+@router.post(
+    "/{project_id}/tasks/bulk",
+    response_model=TaskBulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tasks_bulk(
+    project_id: int,
+    data: TaskBulkCreate,
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """Create many tasks at once. Invalid items are reported in 'errors'."""
+    return await task_service.create_tasks_bulk(
+        project_id=project_id, items=data.items, user_id=current_user.id
+    )
+
+
+@router.patch(
+    "/{project_id}/tasks/bulk",
+    response_model=TaskBulkUpdateResult,
+    status_code=status.HTTP_200_OK,
+)
+async def update_tasks_bulk(
+    project_id: int,
+    data: TaskBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """Apply the same changes to every task matched by ids and/or filters."""
+    return await task_service.update_tasks_bulk(
+        project_id=project_id, data=data, user_id=current_user.id
     )
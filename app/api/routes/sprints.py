@@ -1,12 +1,20 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Union
 
 from fastapi import APIRouter, Depends, Query, status
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_if_match
 from app.models.user import User
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.sprint import SprintRead, SprintUpdate
-from app.schemas.task import TaskRead
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage, PaginatedResponse
+from app.schemas.sprint import (
+    SprintBurndownRead,
+    SprintClose,
+    SprintCloseResult,
+    SprintRead,
+    SprintUpdate,
+)
+from app.schemas.task import SprintBoard, TaskRead
 from app.services.sprint_service import SprintService
 from app.services.task_service import TaskService
 
@@ -29,6 +37,50 @@ async def get_sprint_detail(
     )
 
 
+@router.get(
+    "/{sprint_id}/history",
+    response_model=CursorPage[HistoryRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_sprint_history(
+    sprint_id: int,
+    cursor: Optional[str] = Query(
+        default=None, description="'next_cursor' of the previous page"
+    ),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    changed_by: Optional[int] = Query(
+        default=None, description="Only changes made by this user"
+    ),
+    action: Optional[str] = Query(
+        default=None, description="Filter by action (create, update, delete, ...)"
+    ),
+    changed_from: Optional[datetime] = Query(
+        default=None, description="Only changes at or after this time"
+    ),
+    changed_to: Optional[datetime] = Query(
+        default=None, description="Only changes before this time"
+    ),
+    full: bool = Query(
+        default=False,
+        description="Complete before/after snapshots instead of the changed fields",
+    ),
+    current_user: User = Depends(get_current_user),
+    sprint_service: SprintService = Depends(),
+):
+    """List the history of a sprint, newest first, with keyset pagination."""
+    return await sprint_service.get_sprint_history(
+        sprint_id=sprint_id,
+        user_id=current_user.id,
+        page_size=page_size,
+        cursor=cursor,
+        changed_by=changed_by,
+        action=action,
+        changed_from=changed_from,
+        changed_to=changed_to,
+        full=full,
+    )
+
+
 @router.patch(
     "/{sprint_id}",
     response_model=SprintRead,
@@ -38,11 +90,15 @@ async def update_sprint(
     sprint_id: int,
     data: SprintUpdate,
     current_user: User = Depends(get_current_user),
+    expected_version: Optional[int] = Depends(get_if_match),
     sprint_service: SprintService = Depends(),
 ):
-    """Update an existing sprint."""
+    """Update an existing sprint. Send If-Match: <version> to reject stale edits (409)."""
     return await sprint_service.update_sprint(
-        sprint_id=sprint_id, data=data, user_id=current_user.id
+        sprint_id=sprint_id,
+        data=data,
+        user_id=current_user.id,
+        expected_version=expected_version,
     )
 
 
@@ -59,15 +115,41 @@ async def delete_sprint(
     await sprint_service.delete_sprint(sprint_id=sprint_id, user_id=current_user.id)
 
 
+@router.post(
+    "/{sprint_id}/close",
+    response_model=SprintCloseResult,
+    status_code=status.HTTP_200_OK,
+)
+async def close_sprint(
+    sprint_id: int,
+    data: SprintClose,
+    current_user: User = Depends(get_current_user),
+    expected_version: Optional[int] = Depends(get_if_match),
+    sprint_service: SprintService = Depends(),
+):
+    """Complete a sprint and move its unfinished tasks to another sprint."""
+    return await sprint_service.close_sprint(
+        sprint_id=sprint_id,
+        data=data,
+        user_id=current_user.id,
+        expected_version=expected_version,
+    )
+
+
 @router.get(
     "/{sprint_id}/tasks",
-    response_model=PaginatedResponse[TaskRead],
+    response_model=Union[PaginatedResponse[TaskRead], CursorPage[TaskRead]],
     status_code=status.HTTP_200_OK,
 )
 async def list_sprint_tasks(
     sprint_id: int,
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Keyset paging by creation time: 'next_cursor' of the "
+        "previous page, empty for the first one",
+    ),
     status: Optional[str] = Query(default=None, description="Filter by status"),
     priority: Optional[int] = Query(default=None, description="Filter by priority"),
     assigned_to: Optional[int] = Query(
@@ -83,17 +165,55 @@ async def list_sprint_tasks(
     current_user: User = Depends(get_current_user),
     task_service: TaskService = Depends(),
 ):
-    """List all tasks in a sprint with filtering and pagination."""
-    return await task_service.get_project_tasks(
-        project_id=0,
+    """
+    List all tasks in a sprint with filtering and pagination. Pages are
+    numbered unless a 'cursor' is given.
+    """
+    return await task_service.get_sprint_tasks(
+        sprint_id=sprint_id,
         user_id=current_user.id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
         status=status,
         priority=priority,
         assigned_to=assigned_to,
-        sprint_id=sprint_id,
         search=search,
         sort_by=sort_by,
         order=order,
     )
+
+
+@router.get(
+    "/{sprint_id}/board",
+    response_model=SprintBoard,
+    status_code=status.HTTP_200_OK,
+)
+async def get_sprint_board(
+    sprint_id: int,
+    per_status: int = Query(
+        default=20, ge=1, le=100, description="Tasks returned per status column"
+    ),
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """Sprint tasks grouped by status with the total count of every column."""
+    return await task_service.get_sprint_board(
+        sprint_id=sprint_id, user_id=current_user.id, per_status=per_status
+    )
+
+
+@router.get(
+    "/{sprint_id}/burndown",
+    response_model=SprintBurndownRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_sprint_burndown(
+    sprint_id: int,
+    current_user: User = Depends(get_current_user),
+    sprint_service: SprintService = Depends(),
+):
+    """Daily remaining/completed task counts of a sprint (burndown/burnup)."""
+    return await sprint_service.get_sprint_burndown(
+        sprint_id=sprint_id, user_id=current_user.id
+    )
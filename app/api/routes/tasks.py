@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Optional
 
-from app.api.deps import get_current_user
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.deps import get_current_user, get_if_match
 from app.models.user import User
-from app.schemas.task import TaskRead, TaskUpdate
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage
+from app.schemas.task import TaskRead, TaskTreeNode, TaskUpdate
 from app.services.task_service import TaskService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -22,6 +27,77 @@ async def get_task_detail(
     return await task_service.get_task_detail(task_id=task_id, user_id=current_user.id)
 
 
+@router.get(
+    "/{task_id}/tree",
+    response_model=TaskTreeNode,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_tree(
+    task_id: int,
+    max_depth: int = Query(
+        default=5, ge=1, le=20, description="Levels of subtasks to include"
+    ),
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """Get a task with its nested subtasks and done/total counts per node."""
+    return await task_service.get_task_tree(
+        task_id=task_id, user_id=current_user.id, max_depth=max_depth
+    )
+
+
+@router.get(
+    "/{task_id}/history",
+    response_model=CursorPage[HistoryRead],
+    status_code=status.HTTP_200_OK,
+)
+async def list_task_history(
+    task_id: int,
+    cursor: Optional[str] = Query(
+        default=None, description="'next_cursor' of the previous page"
+    ),
+    page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    changed_by: Optional[int] = Query(
+        default=None, description="Only changes made by this user"
+    ),
+    action: Optional[str] = Query(
+        default=None, description="Filter by action (create, update, delete, ...)"
+    ),
+    changed_from: Optional[datetime] = Query(
+        default=None, description="Only changes at or after this time"
+    ),
+    changed_to: Optional[datetime] = Query(
+        default=None, description="Only changes before this time"
+    ),
+    full: bool = Query(
+        default=False,
+        description="Complete before/after snapshots instead of the changed fields",
+    ),
+    field: Optional[str] = Query(
+        default=None, description="Only changes of this field (e.g. status)"
+    ),
+    to: Optional[str] = Query(
+        default=None, description="With 'field': only changes to this value"
+    ),
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(),
+):
+    """List the history of a task, newest first, with keyset pagination."""
+    return await task_service.get_task_history(
+        task_id=task_id,
+        user_id=current_user.id,
+        page_size=page_size,
+        cursor=cursor,
+        changed_by=changed_by,
+        action=action,
+        changed_from=changed_from,
+        changed_to=changed_to,
+        field=field,
+        to=to,
+        full=full,
+    )
+
+
 @router.patch(
     "/{task_id}",
     response_model=TaskRead,
@@ -31,11 +107,15 @@ async def update_task(
     task_id: int,
     data: TaskUpdate,
     current_user: User = Depends(get_current_user),
+    expected_version: Optional[int] = Depends(get_if_match),
     task_service: TaskService = Depends(),
 ):
-    """Update a task."""
+    """Update a task. Send If-Match: <version> to reject stale edits (409)."""
     return await task_service.update_task(
-        task_id=task_id, data=data, user_id=current_user.id
+        task_id=task_id,
+        data=data,
+        user_id=current_user.id,
+        expected_version=expected_version,
     )
 
 
@@ -0,0 +1,46 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small in-process cache of values grouped by scope (e.g. a project id) that
+    expire 'ttl' seconds after they are stored. Writers drop a whole scope with
+    invalidate(); other processes only see their change once the TTL passes,
+    so keep the TTL short. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float, max_scopes: int = 1024):
+        self.ttl = ttl
+        self.max_scopes = max_scopes
+        self._scopes: OrderedDict = OrderedDict()
+
+    def get(self, scope: Hashable, key: Hashable) -> Optional[Any]:
+        entry = self._scopes.get(scope, {}).get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._scopes[scope][key]
+            return None
+        return value
+
+    def set(self, scope: Hashable, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._scopes.setdefault(scope, {})[key] = (time.monotonic() + self.ttl, value)
+        self._scopes.move_to_end(scope)
+        # Drop the least recently written scopes beyond the limit
+        while len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
+
+    def invalidate(self, scope: Hashable) -> None:
+        self._scopes.pop(scope, None)
+
+
+# Project workload (GET /api/projects/{id}/workload) per project, dropped by
+# task writes of the project
+WORKLOAD_CACHE_TTL_SECONDS = float(os.getenv("WORKLOAD_CACHE_TTL_SECONDS", "0"))
+workload_cache = TTLCache(WORKLOAD_CACHE_TTL_SECONDS)
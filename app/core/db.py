@@ -28,4 +28,7 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Mappers with "eager_defaults": True (tasks, sprints, projects) fetch their
+# server generated columns (created_at/updated_at) with RETURNING on INSERT
+# and UPDATE, so services don't refresh them after a write
 Base = declarative_base()
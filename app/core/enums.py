@@ -53,6 +53,20 @@ class HistoryAction(str, Enum):
     ADJUST_MEMBER = "adjust_member"
 
 
+# History pipeline - how history rows reach the *_history tables
+class HistoryPipelineMode(str, Enum):
+    SYNC = "sync"  # written in the request transaction (default)
+    OUTBOX = "outbox"  # transactional outbox, relayed in batches
+    QUEUE = "queue"  # best-effort in-process queue, written in batches
+
+
+# Background archive of a deleted project's tasks
+class ArchiveJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+
+
 # Sprint
 class SprintStatus(str, Enum):
     NEW = "new"
@@ -1,4 +1,8 @@
+import base64
+import binascii
 import datetime
+import hashlib
+import json
 import math
 
 
@@ -10,3 +14,58 @@ def format_date_to_string(date):
 
 def get_total_pages(total, page_size):
     return math.ceil(total / page_size) if total > 0 else 0
+
+
+def diff_snapshots(before: dict, after: dict) -> dict:
+    """Keep only the fields that changed between two snapshots."""
+    changed = [key for key in after if before.get(key) != after[key]]
+    return {
+        "before": {key: before.get(key) for key in changed},
+        "after": {key: after[key] for key in changed},
+    }
+
+
+def reconstruct_history(current: dict, entries: list) -> list:
+    """
+    Rebuild full before/after views from diff-only history details.
+    'current' is the entity's current snapshot and 'entries' the details of its
+    history rows ordered newest first. Rows without a diff (create) give the
+    state they left behind as 'after'. Legacy full snapshots are handled the
+    same way.
+    """
+    state = dict(current)
+    views = []
+    for details in entries:
+        if not details or "before" not in details:
+            views.append({"before": None, "after": dict(state)})
+            continue
+
+        after = {**state, **details.get("after", {})}
+        before = {**after, **details["before"]}
+        views.append({"before": before, "after": after})
+        state = before
+    return views
+
+
+def hash_request(scope: str, payload: dict) -> str:
+    """Stable sha256 of an endpoint scope and its JSON payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{scope}:{body}".encode()).hexdigest()
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor from the sort key values of the last returned row."""
+    payload = json.dumps([format_date_to_string(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Values of a cursor made by encode_cursor. Raises ValueError if malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
@@ -99,8 +99,9 @@ def _make_sprint(i: int, project_id: int) -> dict:
     description = _FAKER.paragraph(nb_sentences=2) if _FAKER else None
     status = random.choice(list(SprintStatus)).value
 
-    start_date = date.today() + timedelta(days=random.randint(-90, 30))
-    end_date = start_date + timedelta(days=random.randint(7, 21))
+    # Back to back two-week sprints, valid with reject_sprint_overlaps on
+    start_date = date.today() + timedelta(days=14 * (i - 6))
+    end_date = start_date + timedelta(days=13)
 
     return {
         "project_id": project_id,
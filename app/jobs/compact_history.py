@@ -0,0 +1,124 @@
+"""
+Rewrite old history rows from full before/after snapshots into the diff format
+(only the keys that changed), in small keyset batches.
+
+Usage:
+    python -m app.jobs.compact_history [--table task_history] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.db import AsyncSessionLocal
+
+HISTORY_TABLES = ("task_history", "sprint_history", "project_history")
+
+# Next batch boundary: the id of the last row of the next 'batch_size' rows.
+NEXT_BATCH_END = """
+SELECT max(id) FROM (
+    SELECT id FROM {table}
+    WHERE id > :after_id
+    ORDER BY id
+    LIMIT :batch_size
+) AS batch
+"""
+
+# Keep only the keys whose value differs between 'before' and 'after'.
+COMPACT_BATCH = """
+UPDATE {table} AS h
+SET details = compacted.details
+FROM (
+    SELECT
+        id,
+        jsonb_build_object(
+            'before', (
+                SELECT coalesce(jsonb_object_agg(b.key, b.value), '{{}}'::jsonb)
+                FROM jsonb_each(src.details -> 'before') AS b
+                WHERE (src.details -> 'after' -> b.key) IS DISTINCT FROM b.value
+            ),
+            'after', (
+                SELECT coalesce(jsonb_object_agg(a.key, a.value), '{{}}'::jsonb)
+                FROM jsonb_each(src.details -> 'after') AS a
+                WHERE (src.details -> 'before' -> a.key) IS DISTINCT FROM a.value
+            )
+        ) AS details
+    FROM (
+        SELECT id, details
+        FROM {table}
+        WHERE id > :after_id AND id <= :batch_end
+    ) AS src
+    WHERE jsonb_typeof(src.details -> 'before') = 'object'
+      AND jsonb_typeof(src.details -> 'after') = 'object'
+) AS compacted
+WHERE h.id = compacted.id
+  AND h.details IS DISTINCT FROM compacted.details
+"""
+
+
+async def compact_table(table: str, batch_size: int, sleep_ms: int = 0) -> int:
+    """Compact one history table, committing after every batch."""
+    rewritten = 0
+    after_id = 0
+
+    async with AsyncSessionLocal() as db:
+        while True:
+            batch_end = await db.scalar(
+                text(NEXT_BATCH_END.format(table=table)),
+                {"after_id": after_id, "batch_size": batch_size},
+            )
+            if batch_end is None:
+                break
+
+            result = await db.execute(
+                text(COMPACT_BATCH.format(table=table)),
+                {"after_id": after_id, "batch_end": batch_end},
+            )
+            await db.commit()
+
+            rewritten += result.rowcount
+            after_id = batch_end
+            print(f"  {table}: up to id {after_id}, {rewritten} rows rewritten")
+
+            if sleep_ms:
+                await asyncio.sleep(sleep_ms / 1000)
+
+    return rewritten
+
+
+async def compact_history(tables, batch_size: int, sleep_ms: int = 0):
+    for table in tables:
+        print(f"Compacting {table}...")
+        rewritten = await compact_table(table, batch_size, sleep_ms)
+        print(f"Compacted {table}: {rewritten} rows rewritten")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rewrite history details into the diff-only format."
+    )
+    parser.add_argument(
+        "--table",
+        choices=HISTORY_TABLES,
+        action="append",
+        help="History table to compact (default: all)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Rows scanned per transaction"
+    )
+    parser.add_argument("--sleep-ms", type=int, default=0, help="Pause between batches")
+
+    args = parser.parse_args()
+
+    asyncio.run(
+        compact_history(
+            tables=args.table or HISTORY_TABLES,
+            batch_size=args.batch_size,
+            sleep_ms=args.sleep_ms,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
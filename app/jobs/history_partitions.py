@@ -0,0 +1,198 @@
+"""
+Maintain the monthly partitions of the history tables.
+
+- Pre-creates the partitions for the current month and the next
+  '--months-ahead' months, so new rows never land in the default partition.
+- Applies the retention policy: partitions entirely older than
+  '--retention-months' are detached and dropped (or only detached with
+  '--detach-only'), instead of running a bulk DELETE.
+
+Usage:
+    python -m app.jobs.history_partitions [--months-ahead 3] [--retention-months 12]
+"""
+
+import argparse
+import asyncio
+import os
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal
+
+HISTORY_TABLES = ("task_history", "sprint_history", "project_history")
+
+HISTORY_PARTITION_MONTHS_AHEAD = int(os.getenv("HISTORY_PARTITION_MONTHS_AHEAD", "3"))
+# 0 keeps history forever
+HISTORY_RETENTION_MONTHS = int(os.getenv("HISTORY_RETENTION_MONTHS", "0"))
+
+LIST_PARTITIONS = """
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = :table
+"""
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month 'months' after 'month' (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str):
+    """Month covered by a '<table>_YYYY_MM' partition, None for the others."""
+    match = re.fullmatch(rf"{table}_(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def list_partitions(db: AsyncSession, table: str) -> dict:
+    result = await db.execute(text(LIST_PARTITIONS), {"table": table})
+    partitions = {}
+    for name in result.scalars():
+        month = partition_month(table, name)
+        if month:
+            partitions[month] = name
+    return partitions
+
+
+async def create_partition(db: AsyncSession, table: str, month: date) -> None:
+    """
+    Create the partition of 'month'. Rows of that month that already landed in
+    the default partition are moved into it first, as PostgreSQL refuses to
+    create the partition while the default one holds matching rows.
+    """
+    name = partition_name(table, month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+
+    misplaced = await db.scalar(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {table}_default "
+            "WHERE changed_at >= :start AND changed_at < :end)"
+        ),
+        bounds,
+    )
+
+    if not misplaced:
+        await db.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+            )
+        )
+        return
+
+    await db.execute(
+        text(
+            f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table}_default "
+            "WHERE changed_at >= :start AND changed_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await db.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+        )
+    )
+
+
+async def maintain_table(
+    table: str,
+    months_ahead: int,
+    retention_months: int,
+    detach_only: bool = False,
+    today: date = None,
+) -> None:
+    current_month = (today or date.today()).replace(day=1)
+
+    async with AsyncSessionLocal() as db:
+        partitions = await list_partitions(db, table)
+
+        for offset in range(months_ahead + 1):
+            month = add_months(current_month, offset)
+            if month not in partitions:
+                await create_partition(db, table, month)
+                await db.commit()
+                print(f"  Created {partition_name(table, month)}")
+
+        if not retention_months:
+            return
+
+        oldest_kept = add_months(current_month, -retention_months)
+        for month, name in sorted(partitions.items()):
+            if month >= oldest_kept:
+                continue
+
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if not detach_only:
+                await db.execute(text(f"DROP TABLE {name}"))
+            await db.commit()
+            print(f"  {'Detached' if detach_only else 'Dropped'} {name}")
+
+
+async def maintain_partitions(
+    tables, months_ahead: int, retention_months: int, detach_only: bool = False
+):
+    for table in tables:
+        print(f"Maintaining {table} partitions...")
+        await maintain_table(table, months_ahead, retention_months, detach_only)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create upcoming and drop expired history partitions."
+    )
+    parser.add_argument(
+        "--table",
+        choices=HISTORY_TABLES,
+        action="append",
+        help="History table to maintain (default: all)",
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=HISTORY_PARTITION_MONTHS_AHEAD,
+        help="Future monthly partitions to pre-create",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=HISTORY_RETENTION_MONTHS,
+        help="Months of history to keep (0 keeps everything)",
+    )
+    parser.add_argument(
+        "--detach-only",
+        action="store_true",
+        help="Detach expired partitions without dropping them (e.g. to archive)",
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(
+        maintain_partitions(
+            tables=args.table or HISTORY_TABLES,
+            months_ahead=args.months_ahead,
+            retention_months=args.retention_months,
+            detach_only=args.detach_only,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Hard-delete projects, sprints and tasks soft-deleted more than --days ago,
+together with their history rows, in small keyset batches.
+
+Tasks are purged first (except parents of live subtasks), then sprints and
+projects that no task (or sprint) references anymore, so the ON DELETE SET
+NULL/CASCADE foreign keys never touch rows that are still kept. Every batch is its own short transaction:
+rows locked by a request are skipped (FOR UPDATE SKIP LOCKED) and a batch
+that waits longer than --lock-timeout-ms for another lock is retried later.
+With --archive the rows and their history are copied to purged_records first.
+
+Usage:
+    python -m app.jobs.purge_deleted [--days 90] [--batch-size 500] [--archive]
+        [--sleep-ms 100] [--max-seconds 600] [--every 3600]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.db import AsyncSessionLocal
+from app.core.enums import EntityEnum
+
+PURGE_DELETED_AFTER_DAYS = int(os.getenv("PURGE_DELETED_AFTER_DAYS", "90"))
+
+# Purge order (children first) -> (history table, history key, entity type,
+# extra conditions for a row to be purged)
+PURGE_TABLES = {
+    # tasks.parent_id is ON DELETE SET NULL: keep parents of live subtasks
+    "tasks": (
+        "task_history",
+        "task_id",
+        EntityEnum.TASK.value,
+        "AND NOT EXISTS (SELECT 1 FROM tasks AS c "
+        "WHERE c.parent_id = e.id AND c.deleted_at IS NULL)",
+    ),
+    "sprints": (
+        "sprint_history",
+        "sprint_id",
+        EntityEnum.SPRINT.value,
+        "AND NOT EXISTS (SELECT 1 FROM tasks WHERE tasks.sprint_id = e.id)",
+    ),
+    "projects": (
+        "project_history",
+        "project_id",
+        EntityEnum.PROJECT.value,
+        "AND NOT EXISTS (SELECT 1 FROM tasks WHERE tasks.project_id = e.id) "
+        "AND NOT EXISTS (SELECT 1 FROM sprints WHERE sprints.project_id = e.id)",
+    ),
+}
+
+# Next batch after the (deleted_at, id) keyset position, oldest first.
+# Rows with history events still waiting in the outbox are left for later.
+NEXT_BATCH = """
+SELECT e.id, e.deleted_at FROM {table} AS e
+WHERE e.deleted_at < now() - make_interval(days => :days)
+  AND (e.deleted_at, e.id) > (:after_deleted_at, :after_id)
+  AND NOT EXISTS (
+      SELECT 1 FROM history_outbox AS o
+      WHERE o.entity_type = :entity_type AND o.entity_id = e.id
+  )
+  {conditions}
+ORDER BY e.deleted_at, e.id
+LIMIT :batch_size
+FOR UPDATE OF e SKIP LOCKED
+"""
+
+ARCHIVE_BATCH = """
+INSERT INTO purged_records (entity_type, entity_id, deleted_at, data, history)
+SELECT :entity_type, e.id, e.deleted_at, to_jsonb(e), (
+    SELECT jsonb_agg(to_jsonb(h) ORDER BY h.changed_at, h.id)
+    FROM {history} AS h WHERE h.{key} = e.id
+)
+FROM {table} AS e
+WHERE e.id = ANY(:ids)
+"""
+
+DELETE_HISTORY = "DELETE FROM {history} WHERE {key} = ANY(:ids)"
+DELETE_ROWS = "DELETE FROM {table} WHERE id = ANY(:ids)"
+
+# Keyset start: before any deleted_at
+START = (datetime.min, 0)
+
+# lock_not_available (lock_timeout) and deadlock_detected: retry the batch
+RETRY_SQLSTATES = {"55P03", "40P01"}
+
+
+async def purge_batch(
+    db, table: str, after: tuple, days: int, batch_size: int, archive: bool
+) -> Optional[tuple]:
+    """
+    Purge the next batch of 'table' after the keyset position 'after'.
+    Returns None when nothing is left, else (last position, rows, history rows).
+    """
+    history, key, entity_type, conditions = PURGE_TABLES[table]
+
+    rows = (
+        await db.execute(
+            text(NEXT_BATCH.format(table=table, conditions=conditions)),
+            {
+                "days": days,
+                "after_deleted_at": after[0],
+                "after_id": after[1],
+                "entity_type": entity_type,
+                "batch_size": batch_size,
+            },
+        )
+    ).all()
+    if not rows:
+        return None
+
+    ids = [row.id for row in rows]
+    if archive:
+        await db.execute(
+            text(ARCHIVE_BATCH.format(table=table, history=history, key=key)),
+            {"entity_type": entity_type, "ids": ids},
+        )
+    history_result = await db.execute(
+        text(DELETE_HISTORY.format(history=history, key=key)), {"ids": ids}
+    )
+    result = await db.execute(text(DELETE_ROWS.format(table=table)), {"ids": ids})
+
+    last = rows[-1]
+    return (last.deleted_at, last.id), result.rowcount, history_result.rowcount
+
+
+async def purge_table(
+    table: str,
+    days: int,
+    batch_size: int,
+    archive: bool = False,
+    sleep_ms: int = 0,
+    lock_timeout_ms: int = 2000,
+    deadline: Optional[float] = None,
+) -> tuple:
+    """Purge one table batch by batch, returns (rows, history rows)."""
+    purged = history_purged = 0
+    after = START
+
+    async with AsyncSessionLocal() as db:
+        while deadline is None or time.monotonic() < deadline:
+            await db.execute(
+                text("SELECT set_config('lock_timeout', :timeout, true)"),
+                {"timeout": f"{lock_timeout_ms}ms"},
+            )
+            try:
+                batch = await purge_batch(db, table, after, days, batch_size, archive)
+                await db.commit()
+            except DBAPIError as exc:
+                await db.rollback()
+                if getattr(exc.orig, "sqlstate", None) not in RETRY_SQLSTATES:
+                    raise
+                print(f"  {table}: batch failed ({exc.orig}), retrying")
+                await asyncio.sleep(max(sleep_ms, lock_timeout_ms) / 1000)
+                continue
+
+            if batch is None:
+                break
+            after, rows, history_rows = batch
+            purged += rows
+            history_purged += history_rows
+
+            if sleep_ms:
+                await asyncio.sleep(sleep_ms / 1000)
+
+    return purged, history_purged
+
+
+async def purge_deleted(
+    days: int,
+    batch_size: int,
+    archive: bool = False,
+    sleep_ms: int = 0,
+    lock_timeout_ms: int = 2000,
+    max_seconds: Optional[float] = None,
+) -> dict:
+    start = time.monotonic()
+    deadline = start + max_seconds if max_seconds else None
+    report = {}
+
+    for table in PURGE_TABLES:
+        table_start = time.monotonic()
+        purged, history_purged = await purge_table(
+            table, days, batch_size, archive, sleep_ms, lock_timeout_ms, deadline
+        )
+        report[table] = purged
+        print(
+            f"  {table}: {purged} rows and {history_purged} history rows "
+            f"{'archived and ' if archive else ''}deleted "
+            f"in {time.monotonic() - table_start:.1f}s"
+        )
+
+    stopped = deadline is not None and time.monotonic() >= deadline
+    print(
+        f"✅ Purged rows deleted more than {days} days ago "
+        f"in {time.monotonic() - start:.1f}s"
+        + (" (stopped at --max-seconds)" if stopped else "")
+    )
+    return report
+
+
+async def run_purge(args) -> None:
+    while True:
+        await purge_deleted(
+            days=args.days,
+            batch_size=args.batch_size,
+            archive=args.archive,
+            sleep_ms=args.sleep_ms,
+            lock_timeout_ms=args.lock_timeout_ms,
+            max_seconds=args.max_seconds,
+        )
+        if args.every is None:
+            break
+        await asyncio.sleep(args.every)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hard-delete soft-deleted projects, sprints and tasks."
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=PURGE_DELETED_AFTER_DAYS,
+        help="Purge rows deleted more than DAYS days ago",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Rows deleted per transaction"
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Copy rows and their history to purged_records before deleting",
+    )
+    parser.add_argument(
+        "--sleep-ms", type=int, default=100, help="Pause between batches"
+    )
+    parser.add_argument(
+        "--lock-timeout-ms",
+        type=int,
+        default=2000,
+        help="Give up (and retry) a batch waiting longer than this for a lock",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Stop after this many seconds, the next run continues",
+    )
+    parser.add_argument(
+        "--every",
+        type=float,
+        default=None,
+        help="Keep running and purge again every EVERY seconds",
+    )
+
+    asyncio.run(run_purge(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Delete expired Idempotency-Key responses in small batches.
+
+Usage:
+    python -m app.jobs.purge_idempotency_keys [--batch-size 5000]
+"""
+
+import argparse
+import asyncio
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.base_service import IDEMPOTENCY_KEY_TTL
+
+
+async def purge_idempotency_keys(batch_size: int) -> int:
+    deleted = 0
+    async with AsyncSessionLocal() as db:
+        repository = IdempotencyRepository(db)
+        while True:
+            count = await repository.delete_expired(IDEMPOTENCY_KEY_TTL, batch_size)
+            await db.commit()
+            deleted += count
+            if count < batch_size:
+                break
+
+    print(f"Deleted {deleted} expired idempotency keys")
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired idempotency keys.")
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="Rows deleted per transaction"
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(purge_idempotency_keys(batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
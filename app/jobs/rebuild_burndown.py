@@ -0,0 +1,210 @@
+"""
+Rebuild the sprint_burndown deltas by replaying task history.
+
+Every task is walked back from its current state through its history rows
+(newest first, undoing each diff), which gives the sprint/status/priority it
+had after each change and so its burndown deltas per day. Unfinished tasks
+moved out of a sprint on the day it was closed (sprint_history update to
+"completed") stay in its burndown, as they do when close_sprint writes the
+deltas.
+
+Usage:
+    python -m app.jobs.rebuild_burndown [--sprint-id 12] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.core.db import AsyncSessionLocal
+from app.core.enums import HistoryAction, SprintStatus, TaskStatus
+from app.models.sprint import Sprint
+from app.models.sprint_history import SprintHistory
+from app.models.task import Task
+from app.models.task_history import TaskHistory
+from app.repositories.sprint_burndown_repository import (
+    BURNDOWN_FIELDS,
+    SprintBurndownRepository,
+    burndown_deltas,
+)
+
+
+def kept_by_close(
+    day: date, before: dict, after: dict, closed: Dict[int, Set[date]]
+) -> bool:
+    """Whether a change is an unfinished task leaving a sprint closed that day."""
+    sprint_id = before["sprint_id"]
+    return (
+        sprint_id is not None
+        and after["sprint_id"] != sprint_id
+        and before["status"] != TaskStatus.DONE.value
+        and day in closed.get(sprint_id, ())
+    )
+
+
+def replay_task(
+    task, history, closed: Optional[Dict[int, Set[date]]] = None
+) -> List[Tuple[date, Optional[dict], Optional[dict]]]:
+    """
+    (day, before, after) burndown states of a task from its current state and
+    its history ordered newest first. None means the task did not exist or
+    was deleted. 'closed' maps sprint ids to the days they were closed on; a
+    task leaving such a sprint then comes with before None, so it is never
+    taken out of that sprint's burndown.
+    """
+    closed = closed or {}
+    state = {field: getattr(task, field) for field in BURNDOWN_FIELDS}
+    live = task.deleted_at is None
+    changes = []
+
+    for entry in history:
+        day = entry.changed_at.date()
+        details = entry.details if isinstance(entry.details, dict) else {}
+        previous = details.get("before") if isinstance(details, dict) else None
+        before = {
+            **state,
+            **{
+                key: value
+                for key, value in (previous or {}).items()
+                if key in BURNDOWN_FIELDS
+            },
+        }
+
+        if entry.action == HistoryAction.CREATE.value:
+            changes.append((day, None, state if live else None))
+            return changes
+
+        if entry.action == HistoryAction.DELETE.value:
+            changes.append((day, before, None))
+            live = True
+        elif entry.action == HistoryAction.UPDATE.value and live:
+            if kept_by_close(day, before, state, closed):
+                changes.append((day, None, state))
+            else:
+                changes.append((day, before, state))
+
+        state = before
+
+    # No create row (e.g. seeded data): the task existed since created_at
+    changes.append((task.created_at.date(), None, state if live else None))
+    return changes
+
+
+def replay_deltas(
+    tasks, history: dict, closed: Dict[int, Set[date]], sprint_id: Optional[int]
+) -> dict:
+    """
+    Net {(sprint_id, day, priority): (remaining, completed)} of replaying
+    'tasks' with their history rows by task id, only for 'sprint_id' if given.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for task in tasks:
+        for day, before, after in replay_task(task, history[task.id], closed):
+            for (sprint, priority), (remaining, completed) in burndown_deltas(
+                [(before, after)]
+            ).items():
+                if sprint_id is not None and sprint != sprint_id:
+                    continue
+                deltas[(sprint, day, priority)][0] += remaining
+                deltas[(sprint, day, priority)][1] += completed
+
+    return {key: tuple(value) for key, value in deltas.items() if any(value)}
+
+
+async def close_days(db, project_id: Optional[int]) -> Dict[int, Set[date]]:
+    """Days each sprint (of 'project_id' if given) was closed on."""
+    query = select(SprintHistory.sprint_id, SprintHistory.changed_at).where(
+        SprintHistory.action == HistoryAction.UPDATE.value,
+        SprintHistory.details["after"]["status"].astext == SprintStatus.COMPLETED.value,
+    )
+    if project_id is not None:
+        query = query.where(
+            SprintHistory.sprint_id.in_(
+                select(Sprint.id).where(Sprint.project_id == project_id)
+            )
+        )
+
+    closed = defaultdict(set)
+    for sprint_id, changed_at in await db.execute(query):
+        closed[sprint_id].add(changed_at.date())
+    return closed
+
+
+async def rebuild_burndown(sprint_id: Optional[int], batch_size: int) -> None:
+    async with AsyncSessionLocal() as db:
+        repository = SprintBurndownRepository(db)
+        tasks_query = select(Task).order_by(Task.id)
+        project_id = None
+
+        if sprint_id is not None:
+            # Tasks can only be in sprints of their own project
+            project_id = await db.scalar(
+                select(Sprint.project_id).where(Sprint.id == sprint_id)
+            )
+            if project_id is None:
+                raise SystemExit(f"Sprint {sprint_id} not found")
+            tasks_query = tasks_query.where(Task.project_id == project_id)
+
+        closed = await close_days(db, project_id)
+        await repository.clear(sprint_id)
+
+        last_id = 0
+        replayed = 0
+        while True:
+            result = await db.execute(
+                tasks_query.where(Task.id > last_id).limit(batch_size)
+            )
+            tasks = result.scalars().all()
+            if not tasks:
+                break
+
+            result = await db.execute(
+                select(TaskHistory)
+                .where(TaskHistory.task_id.in_([task.id for task in tasks]))
+                .order_by(
+                    TaskHistory.task_id,
+                    TaskHistory.changed_at.desc(),
+                    TaskHistory.id.desc(),
+                )
+            )
+            history = defaultdict(list)
+            for entry in result.scalars():
+                history[entry.task_id].append(entry)
+
+            await repository.add_deltas(
+                replay_deltas(tasks, history, closed, sprint_id)
+            )
+
+            replayed += len(tasks)
+            last_id = tasks[-1].id
+            db.expunge_all()
+            print(f"  Replayed {replayed} tasks")
+
+        # One transaction: readers never see a half rebuilt burndown
+        await db.commit()
+
+    print("✅ Burndown rebuilt")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild sprint burndown data from task history."
+    )
+    parser.add_argument(
+        "--sprint-id", type=int, default=None, help="Only rebuild this sprint"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Tasks replayed per batch"
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(rebuild_burndown(sprint_id=args.sprint_id, batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
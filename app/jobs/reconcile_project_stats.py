@@ -0,0 +1,43 @@
+"""
+Rebuild the project_task_stats counters from tasks.
+
+Counters are kept up to date by task writes; run this after the migration
+that adds them, after bulk changes made outside the API, or to repair drift.
+
+Usage:
+    python -m app.jobs.reconcile_project_stats [--project-id 3]
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.project_stats_repository import ProjectStatsRepository
+
+
+async def reconcile_project_stats(project_id: Optional[int]) -> int:
+    async with AsyncSessionLocal() as db:
+        written = await ProjectStatsRepository(db).rebuild(project_id)
+        await db.commit()
+
+    scope = f"project {project_id}" if project_id is not None else "all projects"
+    print(f"✅ Rebuilt {written} task counters for {scope}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild project task counters from tasks."
+    )
+    parser.add_argument(
+        "--project-id", type=int, default=None, help="Only rebuild this project"
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(reconcile_project_stats(project_id=args.project_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Archive the tasks of deleted projects queued in archive_jobs.
+
+Each batch archives up to --batch-size tasks (UPDATE ... RETURNING with bulk
+history rows) and records the progress on the job in one transaction, so a
+stopped worker resumes where it left off.
+
+Usage:
+    python -m app.jobs.run_archive_jobs [--batch-size 2000] [--job-id 4] [--poll 30]
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from sqlalchemy import func
+
+from app.core.db import AsyncSessionLocal
+from app.core.enums import ArchiveJobStatus
+from app.repositories.archive_job_repository import ArchiveJobRepository
+from app.repositories.task_repository import TaskRepository
+
+
+async def run_batch(batch_size: int, job_id: Optional[int] = None) -> Optional[bool]:
+    """
+    Archive one batch of the oldest unfinished job (or 'job_id').
+    Returns None when there is no job to work on, else whether it finished.
+    """
+    async with AsyncSessionLocal() as db:
+        job = await ArchiveJobRepository(db).claim(job_id)
+        if job is None:
+            return None
+
+        task_ids = await TaskRepository(db).archive_tasks(
+            project_id=job.project_id,
+            changed_by=job.requested_by,
+            conditions=[],
+            limit=batch_size,
+        )
+
+        job.tasks_archived += len(task_ids)
+        finished = len(task_ids) < batch_size
+        if finished:
+            job.status = ArchiveJobStatus.DONE.value
+            job.finished_at = func.now()
+        else:
+            job.status = ArchiveJobStatus.RUNNING.value
+
+        print(
+            f"  Job {job.id} (project {job.project_id}): "
+            f"{job.tasks_archived}/{job.tasks_total} tasks archived"
+        )
+        await db.commit()
+        return finished
+
+
+async def run_archive_jobs(
+    batch_size: int, job_id: Optional[int] = None, poll: Optional[float] = None
+) -> None:
+    while True:
+        finished = await run_batch(batch_size, job_id)
+
+        if finished is None or (finished and job_id is not None):
+            if poll is None or job_id is not None:
+                break
+            await asyncio.sleep(poll)
+
+    print("✅ No archive jobs left")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive the tasks of deleted projects in batches."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=2000, help="Tasks archived per transaction"
+    )
+    parser.add_argument(
+        "--job-id", type=int, default=None, help="Only run this archive job"
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=None,
+        help="Keep running and check for new jobs every POLL seconds",
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_archive_jobs(batch_size=args.batch_size, job_id=args.job_id, poll=args.poll)
+    )
+
+
+if __name__ == "__main__":
+    main()
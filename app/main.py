@@ -1,4 +1,5 @@
 import time
+from contextlib import asynccontextmanager
 from contextvars import ContextVar
 
 from fastapi import APIRouter, FastAPI, Request
@@ -6,9 +7,19 @@ from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
 import app.models
-from app.api.routes import auth, projects, sprints, tasks
+from app.api.routes import auth, me, projects, sprints, tasks
+from app.services.history_pipeline import history_writer
 
-app = FastAPI(title="Task Manager API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background history writer (no-op when HISTORY_PIPELINE_MODE=sync)
+    await history_writer.start()
+    yield
+    await history_writer.stop()
+
+
+app = FastAPI(title="Task Manager API", lifespan=lifespan)
 
 api_router = APIRouter(prefix="/api")
 
@@ -16,6 +27,7 @@ api_router.include_router(tasks.router)
 api_router.include_router(auth.router)
 api_router.include_router(projects.router)
 api_router.include_router(sprints.router)
+api_router.include_router(me.router)
 
 app.include_router(api_router)
 
@@ -1,7 +1,13 @@
+from .archive_job import ArchiveJob as ArchiveJob
+from .history_outbox import HistoryOutbox as HistoryOutbox
+from .idempotency_key import IdempotencyKey as IdempotencyKey
 from .project import Project as Project
 from .project_history import ProjectHistory as ProjectHistory
 from .project_member import ProjectMember as ProjectMember
+from .project_task_stat import ProjectTaskStat as ProjectTaskStat
+from .purged_record import PurgedRecord as PurgedRecord
 from .sprint import Sprint as Sprint
+from .sprint_burndown import SprintBurndown as SprintBurndown
 from .sprint_history import SprintHistory as SprintHistory
 from .task import Task as Task
 from .task_history import TaskHistory as TaskHistory
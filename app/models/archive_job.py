@@ -0,0 +1,40 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    func,
+)
+
+from app.core.db import Base
+from app.core.enums import ArchiveJobStatus
+
+
+class ArchiveJob(Base):
+    """
+    Archive of the tasks of a deleted project too large to archive in the
+    delete request; run in batches by app.jobs.run_archive_jobs.
+    """
+
+    __tablename__ = "archive_jobs"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(
+        String(20), nullable=False, default=ArchiveJobStatus.PENDING.value, index=True
+    )
+    tasks_total = Column(Integer, nullable=False, default=0)
+    tasks_archived = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,29 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.db import Base
+
+
+class HistoryOutbox(Base):
+    """
+    Transactional outbox for history events.
+    Rows are written in the request transaction and moved to the
+    task/sprint/project history tables in batches by the history writer.
+    """
+
+    __tablename__ = "history_outbox"
+
+    id = Column(BigInteger, primary_key=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    changed_by = Column(Integer, nullable=False)
+    changed_at = Column(DateTime, nullable=False, server_default=func.now())
+    action = Column(String(20), nullable=False)
+    details = Column(JSONB, nullable=True)
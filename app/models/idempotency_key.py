@@ -0,0 +1,30 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.db import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Result of a POST made with an Idempotency-Key header.
+    Replays with the same key return 'response' without running the write again.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key = Column(String(255), primary_key=True)
+    # sha256 of the endpoint and payload, a reused key with another request is a 422
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
@@ -1,10 +1,13 @@
 from sqlalchemy import (
+    Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -14,12 +17,25 @@ from app.core.enums import ProjectStatus
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Purge job: keyset batches of soft-deleted projects, oldest first
+        Index(
+            "ix_projects_deleted_purge",
+            "deleted_at",
+            "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(String, nullable=True)
     status = Column(String(50), nullable=False, default=ProjectStatus.PLANNED.value)
     managed_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Active sprints of the project can't overlap (checked by SprintService)
+    reject_sprint_overlaps = Column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
 
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(
@@ -27,8 +43,11 @@ class Project(Base):
     )
 
     deleted_at = Column(DateTime, nullable=True, index=True)
+    version = Column(Integer, nullable=False, server_default="1")
 
     sprints = relationship("Sprint", back_populates="project")
     tasks = relationship("Task", back_populates="project")
     histories = relationship("ProjectHistory", back_populates="project")
     project_members = relationship("ProjectMember", back_populates="project")
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
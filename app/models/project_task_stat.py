@@ -0,0 +1,25 @@
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+)
+
+from app.core.db import Base
+
+
+class ProjectTaskStat(Base):
+    """
+    Live task count of a project for one (dimension, key) pair, e.g.
+    ("status", "todo"), ("priority", "1"), ("assignee", "7" or "none") or
+    ("open_due", "2025-12-11"): unfinished tasks due on that day.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,30 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.db import Base
+
+
+class PurgedRecord(Base):
+    """
+    Copy of a soft-deleted project, sprint or task (and its history rows) kept
+    when app.jobs.purge_deleted runs with --archive before the hard delete.
+    """
+
+    __tablename__ = "purged_records"
+    __table_args__ = (Index("ix_purged_records_entity", "entity_type", "entity_id"),)
+
+    id = Column(BigInteger, primary_key=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
+    purged_at = Column(DateTime, nullable=False, server_default=func.now())
+    data = Column(JSONB, nullable=False)
+    history = Column(JSONB, nullable=True)
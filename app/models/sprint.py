@@ -1,5 +1,6 @@
 from sqlalchemy import (
     Column,
+    Computed,
     Date,
     DateTime,
     ForeignKey,
@@ -7,7 +8,9 @@ from sqlalchemy import (
     Integer,
     String,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import DATERANGE
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -31,12 +34,17 @@ class Sprint(Base):
 
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
+    # Inclusive [start_date, end_date] range for "active on" and overlap queries
+    period = Column(
+        DATERANGE, Computed("daterange(start_date, end_date, '[]')", persisted=True)
+    )
 
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(
         DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
     )
     deleted_at = Column(DateTime, nullable=True, index=True)
+    version = Column(Integer, nullable=False, server_default="1")
 
     project = relationship("Project", back_populates="sprints")
     tasks = relationship("Task", back_populates="sprint")
@@ -50,4 +58,29 @@ class Sprint(Base):
             "start_date",
             "end_date",
         ),
+        # Project detail: live sprints of a project, most recent first
+        Index(
+            "ix_sprints_project_recent_live",
+            "project_id",
+            "start_date",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Purge job: keyset batches of soft-deleted sprints, oldest first
+        Index(
+            "ix_sprints_deleted_purge",
+            "deleted_at",
+            "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        # GiST (btree_gist for project_id): sprints of a project by date range
+        Index(
+            "ix_sprints_project_period",
+            "project_id",
+            "period",
+            postgresql_using="gist",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
     )
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
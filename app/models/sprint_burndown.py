@@ -0,0 +1,25 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    ForeignKey,
+    Integer,
+)
+
+from app.core.db import Base
+
+
+class SprintBurndown(Base):
+    """
+    Daily change of a sprint's remaining/completed task counts per priority.
+    The burndown series is the running sum of these deltas.
+    """
+
+    __tablename__ = "sprint_burndown"
+
+    sprint_id = Column(
+        Integer, ForeignKey("sprints.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    priority = Column(Integer, primary_key=True)
+    remaining_delta = Column(Integer, nullable=False, default=0)
+    completed_delta = Column(Integer, nullable=False, default=0)
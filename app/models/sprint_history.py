@@ -2,7 +2,9 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     func,
 )
@@ -14,13 +16,26 @@ from app.core.db import Base
 
 class SprintHistory(Base):
     __tablename__ = "sprint_history"
+    # Monthly range partitions on changed_at (see migration 0003 and
+    # app.jobs.history_partitions); the partition key must be part of the PK
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "changed_at"),
+        # History listing of one entity: keyset pages on (changed_at, id)
+        Index("ix_sprint_history_sprint_id_changed", "sprint_id", "changed_at", "id"),
+        # Time range scans; rows are appended in changed_at order
+        Index("ix_sprint_history_changed_at", "changed_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
 
-    id = Column(Integer, primary_key=True)
-    sprint_id = Column(Integer, ForeignKey("sprints.id"), nullable=False, index=True)
+    id = Column(Integer, autoincrement=True)
+    sprint_id = Column(Integer, ForeignKey("sprints.id"), nullable=False)
     changed_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     changed_at = Column(DateTime, nullable=False, server_default=func.now())
     action = Column(String(20), nullable=False)
 
     details = Column(JSONB, nullable=True)
 
+    # ids are unique (single sequence), so the ORM identity stays on id alone
+    __mapper_args__ = {"primary_key": [id]}
+
     sprint = relationship("Sprint", back_populates="histories")
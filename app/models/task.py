@@ -2,18 +2,82 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.types import UserDefinedType
 
 from app.core.db import Base
 from app.core.enums import TaskPriority, TaskStatus
 
+# Raised by the tasks_set_path trigger when a task would become its own ancestor
+TASK_PARENT_CYCLE_CONSTRAINT = "ck_tasks_parent_not_descendant"
+
+
+class Ltree(UserDefinedType):
+    """PostgreSQL ltree (extension), e.g. '12.40.41'; read and written as text."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "LTREE"
+
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Sprint board: live tasks of a sprint per status column
+        Index(
+            "ix_tasks_sprint_status_live",
+            "sprint_id",
+            "status",
+            "priority",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Sprint task listing: keyset pages of live tasks by (created_at, id)
+        Index(
+            "ix_tasks_sprint_created_live",
+            "sprint_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Workload: live task counts per assignee/status/priority of a project
+        # or sprint, read with an index-only scan
+        Index(
+            "ix_tasks_project_workload_live",
+            "project_id",
+            "sprint_id",
+            "assigned_to",
+            "status",
+            "priority",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # "My tasks" inbox: keyset pages of a user's live tasks by (due, id);
+        # the included columns let status/priority filters skip heap fetches
+        Index(
+            "ix_tasks_assignee_due_live",
+            "assigned_to",
+            text("coalesce(due_date, 'infinity'::timestamp)"),
+            "id",
+            postgresql_include=["status", "priority", "project_id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Subtree queries: path <@ '12.40' (descendants of task 40)
+        Index("ix_tasks_path", "path", postgresql_using="gist"),
+        # Purge job: keyset batches of soft-deleted tasks, oldest first
+        Index(
+            "ix_tasks_deleted_purge",
+            "deleted_at",
+            "id",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -32,6 +96,9 @@ class Task(Base):
     parent_id = Column(
         Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True, index=True
     )
+    # Materialised ids from the root task down to this one ('12.40.41'),
+    # maintained from parent_id by triggers (migration 0014); never set here
+    path = deferred(Column(Ltree, nullable=True))
     assigned_to = Column(
         Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -52,6 +119,7 @@ class Task(Base):
         DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
     )
     deleted_at = Column(DateTime, nullable=True, index=True)
+    version = Column(Integer, nullable=False, server_default="1")
 
     project = relationship("Project", back_populates="tasks")
     sprint = relationship("Sprint", back_populates="tasks")
@@ -60,3 +128,5 @@ class Task(Base):
         "User", foreign_keys=[assigned_to], back_populates="tasks"
     )
     histories = relationship("TaskHistory", back_populates="task")
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
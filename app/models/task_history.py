@@ -1,12 +1,14 @@
 from sqlalchemy import (
-    JSON,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -14,12 +16,31 @@ from app.core.db import Base
 
 class TaskHistory(Base):
     __tablename__ = "task_history"
-
-    id = Column(Integer, primary_key=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False, index=True)
+    # Monthly range partitions on changed_at (see migration 0003 and
+    # app.jobs.history_partitions); the partition key must be part of the PK
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "changed_at"),
+        # History listing of one entity: keyset pages on (changed_at, id)
+        Index("ix_task_history_task_id_changed", "task_id", "changed_at", "id"),
+        # Time range scans; rows are appended in changed_at order
+        Index("ix_task_history_changed_at", "changed_at", postgresql_using="brin"),
+        # Field change queries: details @> '{"after": {"status": "done"}}'
+        Index(
+            "ix_task_history_details",
+            "details",
+            postgresql_using="gin",
+            postgresql_ops={"details": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+    id = Column(Integer, autoincrement=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     changed_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     changed_at = Column(DateTime, nullable=False, server_default=func.now())
     action = Column(String(20), nullable=False)
-    details = Column(JSON, nullable=True)
+    details = Column(JSONB, nullable=True)
+
+    # ids are unique (single sequence), so the ORM identity stays on id alone
+    __mapper_args__ = {"primary_key": [id]}
 
     task = relationship("Task", back_populates="histories")
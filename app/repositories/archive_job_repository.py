@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import ArchiveJobStatus
+from app.models.archive_job import ArchiveJob
+from app.repositories.base_repository import BaseRepository
+
+
+class ArchiveJobRepository(BaseRepository[ArchiveJob]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ArchiveJob, db)
+
+    async def claim(self, job_id: Optional[int] = None) -> Optional[ArchiveJob]:
+        """
+        Lock the oldest unfinished job (or 'job_id') for this transaction.
+        Jobs locked by another worker are skipped, so workers never run the
+        same batch twice.
+        """
+        query = select(ArchiveJob).where(
+            ArchiveJob.status != ArchiveJobStatus.DONE.value
+        )
+        if job_id is not None:
+            query = query.where(ArchiveJob.id == job_id)
+
+        query = query.order_by(ArchiveJob.id).limit(1).with_for_update(skip_locked=True)
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def get_project_job(
+        self, project_id: int, job_id: int
+    ) -> Optional[ArchiveJob]:
+        query = select(ArchiveJob).where(
+            ArchiveJob.id == job_id, ArchiveJob.project_id == project_id
+        )
+        result = await self.db.execute(query)
+        return result.scalars().first()
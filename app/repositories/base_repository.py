@@ -1,6 +1,6 @@
-from typing import Generic, List, Optional, Tuple, Type, TypeVar
+from typing import Callable, Generic, List, Optional, Tuple, Type, TypeVar
 
-from sqlalchemy import asc, desc, func, or_, select
+from sqlalchemy import asc, desc, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
@@ -27,11 +27,17 @@ class BaseRepository(Generic[ModelType]):
         return result.scalars().first()
 
     async def get_paginated(
-        self, query: Select, page: int = 1, page_size: int = 20
+        self,
+        query: Select,
+        page: int = 1,
+        page_size: int = 20,
+        with_columns: Optional[Callable[[Select], Select]] = None,
     ) -> Tuple[List[ModelType], int]:
         """
         Execute paginated query and return items + total count.
         Note: 'query' argument must be a SQLAlchemy 'select' object.
+        'with_columns' adds columns (and their joins) to the page query only,
+        not to the count; items are then rows of (model, *columns).
         """
 
         count_query = select(func.count()).select_from(query.subquery())
@@ -39,6 +45,10 @@ class BaseRepository(Generic[ModelType]):
 
         query = query.offset((page - 1) * page_size).limit(page_size)
 
+        if with_columns:
+            result = await self.db.execute(with_columns(query))
+            return result.all(), total
+
         result = await self.db.execute(query)
         items = result.scalars().all()
 
@@ -87,6 +97,23 @@ class BaseRepository(Generic[ModelType]):
         self.db.add(instance)
         return instance
 
+    async def bulk_create(self, rows: List[dict]) -> List[ModelType]:
+        """
+        Create many records with a multi-row INSERT ... RETURNING.
+        Returned instances are in the same order as 'rows'.
+        """
+        if not rows:
+            return []
+
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.db.scalars(query, rows)
+        return result.all()
+
+    async def bulk_insert(self, rows: List[dict]) -> None:
+        """Insert many records in a single statement without loading them back."""
+        if rows:
+            await self.db.execute(insert(self.model).values(rows))
+
     async def update(self, instance: ModelType, data: dict) -> ModelType:
         """Update an existing record."""
         for field, value in data.items():
@@ -100,10 +127,15 @@ class BaseRepository(Generic[ModelType]):
         await self.db.delete(instance)
         await self.db.flush()
 
-    async def soft_delete(self, instance: ModelType) -> None:
-        """Soft delete a record (if model has deleted_at)."""
+    async def soft_delete(self, instance: ModelType, **values) -> None:
+        """
+        Soft delete a record (if model has deleted_at).
+        Extra 'values' (e.g. an archived status) are written in the same UPDATE.
+        """
         if hasattr(instance, "deleted_at"):
             instance.deleted_at = func.now()
+            for field, value in values.items():
+                setattr(instance, field, value)
             await self.db.flush()
         else:
             raise AttributeError(f"{self.model.__name__} does not support soft delete")
@@ -0,0 +1,32 @@
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.history_outbox import HistoryOutbox
+from app.repositories.base_repository import BaseRepository
+
+
+class HistoryOutboxRepository(BaseRepository[HistoryOutbox]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(HistoryOutbox, db)
+
+    async def claim_batch(self, limit: int) -> List[HistoryOutbox]:
+        """
+        Delete and return the oldest 'limit' outbox rows.
+        SKIP LOCKED lets several writers drain the outbox without blocking.
+        """
+        batch = (
+            select(HistoryOutbox.id)
+            .order_by(HistoryOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            delete(HistoryOutbox)
+            .where(HistoryOutbox.id.in_(batch.scalar_subquery()))
+            .returning(HistoryOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.scalars(query)
+        return result.all()
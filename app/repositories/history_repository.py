@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import literal, select, tuple_
+
+from app.repositories.base_repository import BaseRepository, ModelType
+
+
+class HistoryRepository(BaseRepository[ModelType]):
+    """Reads shared by the *_history tables, keyed by 'entity_key'."""
+
+    entity_key: str
+
+    async def get_entity_history(
+        self,
+        entity_id: int,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        changed_by: Optional[int] = None,
+        action: Optional[str] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        conditions: Sequence = (),
+    ) -> List[ModelType]:
+        """
+        One keyset page of an entity's history, newest first, starting after
+        the (changed_at, id) key 'after'. Served by ix_<table>_<key>_changed;
+        a changed_at range also prunes the monthly partitions. 'conditions'
+        are extra WHERE clauses, e.g. TaskHistoryRepository.field_changed().
+        """
+        model = self.model
+        query = select(model).where(getattr(model, self.entity_key) == entity_id)
+        query = self.apply_filtering(
+            query, {"changed_by": changed_by, "action": action}
+        ).where(*conditions)
+
+        if changed_from is not None:
+            query = query.where(model.changed_at >= changed_from)
+        if changed_to is not None:
+            query = query.where(model.changed_at < changed_to)
+
+        if after is not None:
+            after_key = tuple_(*[literal(value) for value in after])
+            query = query.where(tuple_(model.changed_at, model.id) < after_key)
+
+        query = query.order_by(model.changed_at.desc(), model.id.desc()).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_details_since(self, entity_id: int, since: tuple) -> List:
+        """
+        (id, details) of every history row of an entity from the (changed_at,
+        id) key 'since' up to now, newest first, regardless of any page filter.
+        """
+        model = self.model
+        since_key = tuple_(*[literal(value) for value in since])
+        query = (
+            select(model.id, model.details)
+            .where(
+                getattr(model, self.entity_key) == entity_id,
+                tuple_(model.changed_at, model.id) >= since_key,
+            )
+            .order_by(model.changed_at.desc(), model.id.desc())
+        )
+        result = await self.db.execute(query)
+        return result.all()
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.base_repository import BaseRepository
+
+
+class IdempotencyRepository(BaseRepository[IdempotencyKey]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(IdempotencyKey, db)
+
+    async def lock(self, user_id: int, key: str) -> None:
+        """
+        Serialise requests carrying the same key with a transaction-level
+        advisory lock; a concurrent duplicate waits here until the first
+        request commits (and then sees its stored response).
+        """
+        await self.db.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    func.hashtextextended(f"idempotency:{user_id}:{key}", 0)
+                )
+            )
+        )
+
+    async def get_live(
+        self, user_id: int, key: str, ttl: timedelta
+    ) -> Optional[IdempotencyKey]:
+        """Stored result for the key, unless it is older than 'ttl'."""
+        query = select(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at > func.now() - ttl,
+        )
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def save(
+        self,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        status_code: int,
+        response: dict,
+    ) -> None:
+        """Store the response, replacing an expired entry for the same key."""
+        values = {
+            "request_hash": request_hash,
+            "status_code": status_code,
+            "response": response,
+            "created_at": func.now(),
+        }
+        query = (
+            insert(IdempotencyKey)
+            .values(user_id=user_id, key=key, **values)
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+                set_=values,
+            )
+        )
+        await self.db.execute(query)
+
+    async def delete_expired(self, ttl: timedelta, limit: int) -> int:
+        """Delete up to 'limit' expired keys, returns the number deleted."""
+        batch = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.created_at < func.now() - ttl)
+            .limit(limit)
+        )
+        query = delete(IdempotencyKey).where(
+            tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(batch)
+        )
+        result = await self.db.execute(query)
+        return result.rowcount
@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.project_history import ProjectHistory
-from app.repositories.base_repository import BaseRepository
+from app.repositories.history_repository import HistoryRepository
 
 
-class ProjectHistoryRepository(BaseRepository[ProjectHistory]):
+class ProjectHistoryRepository(HistoryRepository[ProjectHistory]):
+    entity_key = "project_id"
+
     def __init__(self, db: AsyncSession):
         super().__init__(ProjectHistory, db)
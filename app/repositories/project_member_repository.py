@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, List, Set
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
@@ -26,12 +26,44 @@ class ProjectMemberRepository(BaseRepository[ProjectMember]):
         self, project_id: int, user_id: int, required_roles: list[str]
     ):
         member = await self.get_member_project(project_id, user_id)
-        if not member or member.role not in required_roles:
+        self.ensure_role(member.role if member else None, required_roles)
+
+    @staticmethod
+    def ensure_role(role: str | None, required_roles: list[str]):
+        """Raise 403 unless role (None for non-members) is one of required_roles."""
+        if role is None or role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not allowed to perform action",
             )
 
+    @staticmethod
+    def role_subquery(project_id, user_id: int):
+        """Scalar subquery with the role of user_id in project_id (NULL if none)."""
+        return (
+            select(ProjectMember.role)
+            .where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == user_id,
+            )
+            .scalar_subquery()
+        )
+
+    async def get_member_user_ids(
+        self, project_id: int, user_ids: Iterable[int]
+    ) -> Set[int]:
+        """Return the subset of user_ids that are members of the project."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+
+        query = select(ProjectMember.user_id).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id.in_(user_ids),
+        )
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
     async def list_by_project(self, project_id: int) -> List[ProjectMember]:
         query = select(ProjectMember).where(ProjectMember.project_id == project_id)
         result = await self.db.execute(query)
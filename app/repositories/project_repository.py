@@ -1,13 +1,16 @@
 from typing import List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import case, func, select, true, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
-from app.core.enums import ProjectStatus
+from app.core.enums import ProjectStatus, SprintStatus, TaskStatus
 from app.models.project import Project
 from app.models.project_member import ProjectMember
+from app.models.project_task_stat import ProjectTaskStat
+from app.models.sprint import Sprint
 from app.repositories.base_repository import BaseRepository
+from app.repositories.project_stats_repository import STATUS
 
 
 class ProjectRepository(BaseRepository[Project]):
@@ -23,8 +26,13 @@ class ProjectRepository(BaseRepository[Project]):
         search: Optional[str] = None,
         sort_by: str = "created_at",
         order: str = "asc",
+        include_counts: bool = False,
     ) -> Tuple[List[Project], int]:
-        """Get paginated, filtered, and sorted projects for a user."""
+        """
+        Get paginated, filtered, and sorted projects for a user.
+        With 'include_counts' items are (Project, tasks_total, tasks_open,
+        members, active_sprint_id, active_sprint_title) rows.
+        """
 
         query = (
             select(Project)
@@ -44,18 +52,98 @@ class ProjectRepository(BaseRepository[Project]):
 
         query = self.apply_sorting(query, sort_by, order)
 
-        return await self.get_paginated(query, page, page_size)
+        return await self.get_paginated(
+            query,
+            page,
+            page_size,
+            with_columns=self.with_counts if include_counts else None,
+        )
+
+    @staticmethod
+    def with_counts(query):
+        """
+        Add per-project counts to a page of projects in the same statement:
+        task totals from the project_task_stats counters, member count, and the
+        current active sprint through a LEFT JOIN LATERAL ... LIMIT 1.
+        """
+        members = aliased(ProjectMember)
+
+        def task_count(*conditions):
+            return (
+                select(func.coalesce(func.sum(ProjectTaskStat.count), 0))
+                .where(
+                    ProjectTaskStat.project_id == Project.id,
+                    ProjectTaskStat.dimension == STATUS,
+                    *conditions,
+                )
+                .scalar_subquery()
+            )
+
+        member_count = (
+            select(func.count())
+            .select_from(members)
+            .where(members.project_id == Project.id)
+            .scalar_subquery()
+        )
+        active_sprint = (
+            select(Sprint.id, Sprint.title)
+            .where(
+                Sprint.project_id == Project.id,
+                Sprint.status == SprintStatus.ACTIVE.value,
+                Sprint.deleted_at.is_(None),
+            )
+            .order_by(Sprint.start_date.desc())
+            .limit(1)
+            .lateral("active_sprint")
+        )
+
+        return query.outerjoin(active_sprint, true()).add_columns(
+            task_count().label("tasks_total"),
+            task_count(ProjectTaskStat.key != TaskStatus.DONE.value).label(
+                "tasks_open"
+            ),
+            member_count.label("members"),
+            active_sprint.c.id.label("active_sprint_id"),
+            active_sprint.c.title.label("active_sprint_title"),
+        )
 
     async def get_project_detail(self, project_id: int) -> Project | None:
+        query = select(Project).where(
+            Project.id == project_id, Project.deleted_at.is_(None)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def get_recent_sprints(self, project_id: int, limit: int):
+        """
+        Active sprints first, then the most recent live sprints of a project,
+        at most 'limit'. Both candidate lists are read in index order with
+        their own LIMIT, so only up to 2 * 'limit' rows are sorted; the number
+        of live sprints is a separate scalar subquery.
+        Returns (Sprint, total) rows.
+        """
+        live = (Sprint.project_id == project_id, Sprint.deleted_at.is_(None))
+        most_recent = (Sprint.start_date.desc(), Sprint.id.desc())
+
+        active = (
+            select(Sprint.id)
+            .where(*live, Sprint.status == SprintStatus.ACTIVE.value)
+            .order_by(*most_recent)
+            .limit(limit)
+        )
+        recent = select(Sprint.id).where(*live).order_by(*most_recent).limit(limit)
+        picked = union_all(active, recent).subquery("picked")
+        total = select(func.count()).where(*live).scalar_subquery()
+
+        active_first = case((Sprint.status == SprintStatus.ACTIVE.value, 0), else_=1)
         query = (
-            select(Project)
-            .options(joinedload(Project.sprints))  # Eager load sprints
-            .where(Project.id == project_id, Project.deleted_at.is_(None))
+            select(Sprint, total.label("total"))
+            .where(Sprint.id.in_(select(picked.c.id)))
+            .order_by(active_first, *most_recent)
+            .limit(limit)
         )
         result = await self.db.execute(query)
-        return result.unique().scalars().first()
+        return result.all()
 
     async def delete_project(self, project: Project) -> None:
-        await self.soft_delete(project)
-        project.status = ProjectStatus.ARCHIVED.value
-        await self.db.flush()
+        await self.soft_delete(project, status=ProjectStatus.ARCHIVED.value)
@@ -0,0 +1,188 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import String, delete, func, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import TaskStatus
+from app.models.project_task_stat import ProjectTaskStat
+from app.repositories.base_repository import BaseRepository
+from app.repositories.sprint_burndown_repository import TaskChange
+
+# Task fields that decide where a task is counted in the project stats
+STATS_FIELDS = ("project_id", "status", "priority", "assigned_to", "due_date")
+
+STATUS = "status"
+PRIORITY = "priority"
+ASSIGNEE = "assignee"
+OPEN_DUE = "open_due"
+UNASSIGNED = "none"
+
+RECONCILE_SQL = """
+INSERT INTO project_task_stats (project_id, dimension, key, count)
+SELECT project_id,
+       CASE WHEN GROUPING(status) = 0 THEN 'status'
+            WHEN GROUPING(priority) = 0 THEN 'priority'
+            WHEN GROUPING(assigned_to) = 0 THEN 'assignee'
+            ELSE 'open_due' END,
+       CASE WHEN GROUPING(status) = 0 THEN status
+            WHEN GROUPING(priority) = 0 THEN priority::text
+            WHEN GROUPING(assigned_to) = 0 THEN coalesce(assigned_to::text, 'none')
+            ELSE open_due::text END,
+       count(*)
+FROM (
+    SELECT project_id, status, priority, assigned_to,
+           CASE WHEN status <> 'done' THEN due_date::date END AS open_due
+    FROM tasks
+    WHERE deleted_at IS NULL {project_filter}
+) t
+GROUP BY GROUPING SETS (
+    (project_id, status),
+    (project_id, priority),
+    (project_id, assigned_to),
+    (project_id, open_due)
+)
+HAVING GROUPING(open_due) = 1 OR open_due IS NOT NULL
+"""
+
+
+def stats_keys(state: dict) -> List[tuple]:
+    """(project_id, dimension, key) counters a live task adds one to."""
+    project_id = state["project_id"]
+    assigned_to = state["assigned_to"]
+    keys = [
+        (project_id, STATUS, state["status"]),
+        (project_id, PRIORITY, str(state["priority"])),
+        (project_id, ASSIGNEE, UNASSIGNED if assigned_to is None else str(assigned_to)),
+    ]
+
+    due_date = state["due_date"]
+    if due_date is not None and state["status"] != TaskStatus.DONE.value:
+        if isinstance(due_date, datetime):
+            due_date = due_date.date()
+        keys.append((project_id, OPEN_DUE, due_date.isoformat()))
+    return keys
+
+
+def stats_deltas(changes: Iterable[TaskChange]) -> dict:
+    """Net count change per (project_id, dimension, key) of task changes."""
+    deltas = Counter()
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state:
+                for key in stats_keys(state):
+                    deltas[key] += sign
+
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def stats_rows(changes: Iterable[TaskChange]) -> List[dict]:
+    """
+    Upsert rows applying the counter effect of task changes, in primary key
+    order (the same order as TaskRepository.bulk_update) so that concurrent
+    writers lock the counters in the same order instead of deadlocking.
+    """
+    return [
+        {
+            "project_id": project_id,
+            "dimension": dimension,
+            "key": key,
+            "count": delta,
+        }
+        for (project_id, dimension, key), delta in sorted(stats_deltas(changes).items())
+    ]
+
+
+class ProjectStatsRepository(BaseRepository[ProjectTaskStat]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ProjectTaskStat, db)
+
+    @staticmethod
+    def upsert(rows):
+        """
+        INSERT ... ON CONFLICT that adds to the existing counts.
+        'rows' is a list of dicts or a select of (project_id, dimension, key, count).
+        """
+        if isinstance(rows, list):
+            query = insert(ProjectTaskStat).values(rows)
+        else:
+            query = insert(ProjectTaskStat).from_select(
+                ["project_id", "dimension", "key", "count"], rows
+            )
+
+        return query.on_conflict_do_update(
+            index_elements=[
+                ProjectTaskStat.project_id,
+                ProjectTaskStat.dimension,
+                ProjectTaskStat.key,
+            ],
+            set_={"count": ProjectTaskStat.count + query.excluded["count"]},
+        )
+
+    async def record_changes(self, changes: Iterable[TaskChange]) -> None:
+        """Apply the counter effect of task changes in one statement."""
+        rows = stats_rows(changes)
+        if rows:
+            await self.db.execute(self.upsert(rows))
+
+    async def count_tasks(self, project_id: int) -> int:
+        """Live tasks of a project, from its status counters."""
+        query = select(func.coalesce(func.sum(ProjectTaskStat.count), 0)).where(
+            ProjectTaskStat.project_id == project_id,
+            ProjectTaskStat.dimension == STATUS,
+        )
+        return await self.db.scalar(query)
+
+    async def get_counts(self, project_id: int, today: date) -> List:
+        """
+        Non-zero (dimension, key, count) counters of a project, with the open
+        tasks due before 'today' folded into a single ("overdue", "") row.
+        """
+        counters = select(
+            ProjectTaskStat.dimension, ProjectTaskStat.key, ProjectTaskStat.count
+        ).where(
+            ProjectTaskStat.project_id == project_id,
+            ProjectTaskStat.dimension != OPEN_DUE,
+            ProjectTaskStat.count != 0,
+        )
+        overdue = select(
+            literal("overdue", String),
+            literal("", String),
+            func.coalesce(func.sum(ProjectTaskStat.count), 0),
+        ).where(
+            ProjectTaskStat.project_id == project_id,
+            ProjectTaskStat.dimension == OPEN_DUE,
+            ProjectTaskStat.key < today.isoformat(),
+        )
+
+        result = await self.db.execute(union_all(counters, overdue))
+        return result.all()
+
+    async def clear(self, project_id: Optional[int] = None) -> None:
+        query = delete(ProjectTaskStat)
+        if project_id is not None:
+            query = query.where(ProjectTaskStat.project_id == project_id)
+        await self.db.execute(query)
+
+    async def rebuild(self, project_id: Optional[int] = None) -> int:
+        """
+        Recompute the counters of one or all projects from tasks with a single
+        GROUP BY GROUPING SETS pass. Task writes that upsert counters wait for
+        the table lock, so their deltas land on top of the rebuilt counts.
+        Returns the number of counter rows written.
+        """
+        await self.db.execute(
+            text("LOCK TABLE project_task_stats IN SHARE ROW EXCLUSIVE MODE")
+        )
+        await self.clear(project_id)
+
+        if project_id is None:
+            query, params = RECONCILE_SQL.format(project_filter=""), {}
+        else:
+            query = RECONCILE_SQL.format(project_filter="AND project_id = :project_id")
+            params = {"project_id": project_id}
+
+        result = await self.db.execute(text(query), params)
+        return result.rowcount
@@ -0,0 +1,144 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import TaskStatus
+from app.models.sprint_burndown import SprintBurndown
+from app.repositories.base_repository import BaseRepository
+
+# Task fields that decide where a task counts in a burndown
+BURNDOWN_FIELDS = ("sprint_id", "status", "priority")
+
+# (before, after) task states ({sprint_id, status, priority}); None when the
+# task does not exist (yet) or is deleted
+TaskChange = Tuple[Optional[dict], Optional[dict]]
+
+
+def burndown_deltas(changes: Iterable[TaskChange]) -> dict:
+    """
+    Net (remaining, completed) change per (sprint_id, priority) of task changes.
+    Keys whose changes cancel out are dropped.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if not state or not state.get("sprint_id"):
+                continue
+            done = state["status"] == TaskStatus.DONE.value
+            deltas[(state["sprint_id"], state["priority"])][int(done)] += sign
+
+    return {key: tuple(value) for key, value in deltas.items() if any(value)}
+
+
+def delta_rows(deltas: dict) -> List[dict]:
+    """
+    Upsert rows of {(sprint_id, day, priority): (remaining, completed)}, in
+    primary key order so that concurrent writers lock the rows in the same
+    order instead of deadlocking.
+    """
+    return [
+        {
+            "sprint_id": sprint_id,
+            "day": day or func.current_date(),
+            "priority": priority,
+            "remaining_delta": remaining,
+            "completed_delta": completed,
+        }
+        for (sprint_id, day, priority), (remaining, completed) in sorted(deltas.items())
+    ]
+
+
+def burndown_rows(
+    changes: Iterable[TaskChange], day: Optional[date] = None
+) -> List[dict]:
+    """Upsert rows adding the burndown effect of task changes to 'day' (default: today)."""
+    return delta_rows(
+        {
+            (sprint_id, day, priority): delta
+            for (sprint_id, priority), delta in burndown_deltas(changes).items()
+        }
+    )
+
+
+class SprintBurndownRepository(BaseRepository[SprintBurndown]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(SprintBurndown, db)
+
+    @staticmethod
+    def upsert(rows):
+        """
+        INSERT ... ON CONFLICT that adds the deltas to existing rows.
+        'rows' is a list of dicts or a select of
+        (sprint_id, day, priority, remaining_delta, completed_delta).
+        """
+        if isinstance(rows, list):
+            query = insert(SprintBurndown).values(rows)
+        else:
+            query = insert(SprintBurndown).from_select(
+                ["sprint_id", "day", "priority", "remaining_delta", "completed_delta"],
+                rows,
+            )
+
+        return query.on_conflict_do_update(
+            index_elements=[
+                SprintBurndown.sprint_id,
+                SprintBurndown.day,
+                SprintBurndown.priority,
+            ],
+            set_={
+                "remaining_delta": SprintBurndown.remaining_delta
+                + query.excluded.remaining_delta,
+                "completed_delta": SprintBurndown.completed_delta
+                + query.excluded.completed_delta,
+            },
+        )
+
+    async def record_changes(
+        self, changes: Iterable[TaskChange], day: Optional[date] = None
+    ) -> None:
+        """Add the burndown effect of task changes to 'day' (default: today)."""
+        rows = burndown_rows(changes, day)
+        if rows:
+            await self.db.execute(self.upsert(rows))
+
+    async def add_deltas(self, deltas: dict) -> None:
+        """Upsert {(sprint_id, day, priority): (remaining, completed)} in one statement."""
+        rows = delta_rows(deltas)
+        if rows:
+            await self.db.execute(self.upsert(rows))
+
+    async def get_series(self, sprint_id: int) -> List:
+        """
+        Running remaining/completed counts per priority on every day with a
+        change. Returns (day, priority, remaining, completed) rows by day.
+        """
+        window = {
+            "partition_by": SprintBurndown.priority,
+            "order_by": SprintBurndown.day,
+        }
+        query = (
+            select(
+                SprintBurndown.day,
+                SprintBurndown.priority,
+                func.sum(SprintBurndown.remaining_delta)
+                .over(**window)
+                .label("remaining"),
+                func.sum(SprintBurndown.completed_delta)
+                .over(**window)
+                .label("completed"),
+            )
+            .where(SprintBurndown.sprint_id == sprint_id)
+            .order_by(SprintBurndown.day, SprintBurndown.priority)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def clear(self, sprint_id: Optional[int] = None) -> None:
+        query = delete(SprintBurndown)
+        if sprint_id is not None:
+            query = query.where(SprintBurndown.sprint_id == sprint_id)
+        await self.db.execute(query)
@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.sprint_history import SprintHistory
-from app.repositories.base_repository import BaseRepository
+from app.repositories.history_repository import HistoryRepository
 
 
-class SprintHistoryRepository(BaseRepository[SprintHistory]):
+class SprintHistoryRepository(HistoryRepository[SprintHistory]):
+    entity_key = "sprint_id"
+
     def __init__(self, db: AsyncSession):
         super().__init__(SprintHistory, db)
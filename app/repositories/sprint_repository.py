@@ -1,11 +1,25 @@
-from typing import Optional
+from datetime import date
+from typing import Iterable, List, Optional, Set
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    String,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import DATERANGE, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.enums import SprintStatus
+from app.core.enums import HistoryAction, SprintStatus
+from app.models.project import Project
 from app.models.sprint import Sprint
+from app.models.sprint_history import SprintHistory
 from app.repositories.base_repository import BaseRepository
+from app.repositories.project_member_repository import ProjectMemberRepository
 
 
 class SprintRepository(BaseRepository[Sprint]):
@@ -19,8 +33,11 @@ class SprintRepository(BaseRepository[Sprint]):
         page_size: int = 20,
         status: Optional[str] = None,
         search: Optional[str] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        active_on: Optional[date] = None,
+        overlaps_from: Optional[date] = None,
+        overlaps_to: Optional[date] = None,
         sort_by: str = "created_at",
         order: str = "asc",
     ):
@@ -44,14 +61,107 @@ class SprintRepository(BaseRepository[Sprint]):
         if end_date:
             query = query.where(Sprint.end_date <= end_date)
 
+        # Range operators below are served by the GiST index on (project_id, period)
+        if active_on:
+            query = query.where(Sprint.period.contains(active_on))
+
+        if overlaps_from or overlaps_to:
+            # A missing bound leaves that side of the window open
+            window = func.daterange(overlaps_from, overlaps_to, "[]", type_=DATERANGE)
+            query = query.where(Sprint.period.overlaps(window))
+
         query = self.apply_sorting(query, sort_by, order)
 
         return await self.get_paginated(query, page, page_size)
 
+    async def rejects_active_overlap(
+        self,
+        project_id: int,
+        start_date: date,
+        end_date: date,
+        exclude_id: Optional[int] = None,
+    ) -> bool:
+        """
+        Whether an active sprint over [start_date, end_date] must be rejected:
+        the project rejects overlapping active sprints and a live active one
+        (other than 'exclude_id') overlaps the range.
+
+        The project row stays locked until the end of the transaction, so
+        concurrent checks of one project run one after the other. The overlap
+        query is a separate statement to see the sprints they committed.
+        """
+        rejects = await self.db.scalar(
+            select(Project.reject_sprint_overlaps)
+            .where(Project.id == project_id)
+            .with_for_update()
+        )
+        if not rejects:
+            return False
+
+        period = func.daterange(start_date, end_date, "[]", type_=DATERANGE)
+        overlapping = exists().where(
+            Sprint.project_id == project_id,
+            Sprint.status == SprintStatus.ACTIVE.value,
+            Sprint.deleted_at.is_(None),
+            Sprint.period.overlaps(period),
+        )
+        if exclude_id is not None:
+            overlapping = overlapping.where(Sprint.id != exclude_id)
+        return await self.db.scalar(select(overlapping))
+
     async def delete_sprint(self, sprint: Sprint) -> None:
-        await self.soft_delete(sprint)
-        sprint.status = SprintStatus.ARCHIVED.value
-        await self.db.flush()
+        await self.soft_delete(sprint, status=SprintStatus.ARCHIVED.value)
+
+    async def archive_sprints(self, changed_by: int, conditions: list) -> List[int]:
+        """
+        Set-based delete_sprint for all live sprints matching 'conditions':
+        one UPDATE ... RETURNING feeding an INSERT ... SELECT of their history
+        rows. Returns the archived sprint ids.
+        """
+        old = (
+            select(Sprint.id, Sprint.status)
+            .where(Sprint.deleted_at.is_(None), *conditions)
+            .with_for_update()
+            .cte("old")
+        )
+        updated = (
+            update(Sprint)
+            .where(Sprint.id == old.c.id)
+            .values(
+                deleted_at=func.now(),
+                status=SprintStatus.ARCHIVED.value,
+                version=Sprint.version + 1,
+            )
+            .returning(Sprint.id, old.c.status.label("old_status"), Sprint.status)
+            .cte("updated")
+        )
+
+        def status_of(column):
+            return func.jsonb_build_object(literal("status", String), column)
+
+        details = func.jsonb_build_object(
+            literal("before", String),
+            status_of(updated.c.old_status),
+            literal("after", String),
+            status_of(updated.c.status),
+            type_=JSONB,
+        )
+        query = (
+            insert(SprintHistory)
+            .from_select(
+                ["sprint_id", "changed_by", "action", "details"],
+                select(
+                    updated.c.id,
+                    literal(changed_by, Integer),
+                    literal(HistoryAction.DELETE.value, String),
+                    details,
+                ),
+            )
+            .returning(SprintHistory.sprint_id)
+        )
+
+        result = await self.db.execute(query)
+        return result.scalars().all()
 
     async def get_sprint_by_id_and_project_id(
         self, sprint_id: int, project_id: int
@@ -63,3 +173,33 @@ class SprintRepository(BaseRepository[Sprint]):
         )
         result = await self.db.execute(query)
         return result.scalars().first()
+
+    async def get_project_sprint_ids(
+        self, project_id: int, sprint_ids: Iterable[int]
+    ) -> Set[int]:
+        """Return the subset of sprint_ids that are live sprints of the project."""
+        sprint_ids = set(sprint_ids)
+        if not sprint_ids:
+            return set()
+
+        query = select(Sprint.id).where(
+            Sprint.id.in_(sprint_ids),
+            Sprint.project_id == project_id,
+            Sprint.deleted_at.is_(None),
+        )
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
+    async def get_access(self, sprint_id: int, user_id: int):
+        """
+        Project of a live sprint and the user's role in it, in one query.
+        Returns a row with (project_id, role) or None if the sprint is missing.
+        """
+        query = select(
+            Sprint.project_id,
+            ProjectMemberRepository.role_subquery(Sprint.project_id, user_id).label(
+                "role"
+            ),
+        ).where(Sprint.id == sprint_id, Sprint.deleted_at.is_(None))
+        result = await self.db.execute(query)
+        return result.first()
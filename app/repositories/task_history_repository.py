@@ -1,9 +1,61 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import cast, literal, select
+from sqlalchemy.dialects.postgresql import JSONPATH
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.task_history import TaskHistory
-from app.repositories.base_repository import BaseRepository
+from app.repositories.history_repository import HistoryRepository
+
+# 'to' of field_changed() when any new value matches
+ANY_VALUE = object()
 
 
-class TaskHistoryRepository(BaseRepository[TaskHistory]):
+class TaskHistoryRepository(HistoryRepository[TaskHistory]):
+    entity_key = "task_id"
+
     def __init__(self, db: AsyncSession):
         super().__init__(TaskHistory, db)
+
+    @staticmethod
+    def field_changed(field: str, to: Any = ANY_VALUE):
+        """
+        Condition on history rows whose diff changed 'field' (to the value
+        'to'). A value match is a containment query (details @> ...) answered
+        by the GIN index ix_task_history_details; jsonb_path_ops can't index
+        key existence, so without 'to' narrow the rows by task or time range.
+        'field' must be one of TASK_HISTORY_FIELDS.
+        """
+        if to is ANY_VALUE:
+            return TaskHistory.details.op("@?")(
+                cast(literal(f"$.after.{field}"), JSONPATH)
+            )
+        return TaskHistory.details.contains({"after": {field: to}})
+
+    async def get_field_changes(
+        self,
+        field: str,
+        to: Any = ANY_VALUE,
+        changed_by: Optional[int] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[TaskHistory]:
+        """
+        Changes of 'field' across all tasks, newest first, e.g. every
+        reassignment to a user: get_field_changes("assigned_to", to=user_id).
+        """
+        query = select(TaskHistory).where(self.field_changed(field, to))
+        query = self.apply_filtering(query, {"changed_by": changed_by})
+
+        if changed_from is not None:
+            query = query.where(TaskHistory.changed_at >= changed_from)
+        if changed_to is not None:
+            query = query.where(TaskHistory.changed_at < changed_to)
+
+        query = query.order_by(
+            TaskHistory.changed_at.desc(), TaskHistory.id.desc()
+        ).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
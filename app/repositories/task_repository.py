@@ -1,11 +1,73 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Date,
+    Integer,
+    String,
+    all_,
+    and_,
+    any_,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.core.enums import TaskStatus
+from app.core.enums import HistoryAction, TaskStatus
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
 from app.models.task import Task
+from app.models.task_history import TaskHistory
 from app.repositories.base_repository import BaseRepository
+from app.repositories.project_member_repository import ProjectMemberRepository
+from app.repositories.project_stats_repository import (
+    ASSIGNEE,
+    OPEN_DUE,
+    PRIORITY,
+    STATS_FIELDS,
+    STATUS,
+    UNASSIGNED,
+    ProjectStatsRepository,
+    stats_rows,
+)
+from app.repositories.sprint_burndown_repository import (
+    BURNDOWN_FIELDS,
+    SprintBurndownRepository,
+    TaskChange,
+    burndown_rows,
+)
+
+# Fields captured in the before/after details of bulk update history rows.
+TASK_HISTORY_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "assigned_to",
+    "sprint_id",
+    "parent_id",
+    "due_date",
+)
+
+# Sort key of the "my tasks" inbox: soonest due first, tasks without a due
+# date last. Must match the expression of ix_tasks_assignee_due_live.
+NO_DUE_DATE = literal_column("'infinity'::timestamp")
+DUE_KEY = func.coalesce(Task.due_date, NO_DUE_DATE)
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -25,11 +87,15 @@ class TaskRepository(BaseRepository[Task]):
         search: Optional[str] = None,
         sort_by: str = "created_at",
         order: str = "asc",
+        parent_of: Optional[int] = None,
     ):
         query = select(Task).where(
             Task.project_id == project_id, Task.deleted_at.is_(None)
         )
 
+        if parent_of:
+            query = query.where(*self.subtasks_of(parent_of))
+
         if status:
             query = self.apply_filtering(query, {"status": status})
 
@@ -53,14 +119,627 @@ class TaskRepository(BaseRepository[Task]):
 
         return await self.get_paginated(query, page, page_size)
 
-    async def get_sprint_tasks(self, sprint_id: int) -> List[Task]:
+    @staticmethod
+    def subtasks_of(task_id: int) -> list:
+        """
+        Conditions matching every task below 'task_id' at any depth, through
+        the GiST index on the materialised path: path <@ <path of task_id>.
+        """
+        parent = aliased(Task)
+        parent_path = select(parent.path).where(parent.id == task_id)
+        return [
+            Task.path.op("<@", is_comparison=True)(parent_path.scalar_subquery()),
+            Task.id != task_id,
+        ]
+
+    async def get_create_context(
+        self,
+        project_id: int,
+        user_id: int,
+        assigned_to: Optional[int] = None,
+        sprint_id: Optional[int] = None,
+        parent_id: Optional[int] = None,
+    ):
+        """
+        Collect everything needed to validate a task insert in one round trip:
+        the acting user's role, project liveness, assignee membership and
+        sprint and parent task ownership.
+        """
+        query = select(
+            ProjectMemberRepository.role_subquery(project_id, user_id).label("role"),
+            exists()
+            .where(Project.id == project_id, Project.deleted_at.is_(None))
+            .label("project_ok"),
+            self._assignee_ok(project_id, assigned_to),
+            self._sprint_ok(project_id, sprint_id),
+            self._parent_ok(project_id, parent_id),
+        )
+        result = await self.db.execute(query)
+        return result.one()
+
+    async def get_project_task_ids(
+        self, project_id: int, task_ids: Iterable[int]
+    ) -> Set[int]:
+        """Return the subset of task_ids that are live tasks of the project."""
+        task_ids = set(task_ids)
+        if not task_ids:
+            return set()
+
+        query = select(Task.id).where(
+            Task.id.in_(task_ids),
+            Task.project_id == project_id,
+            Task.deleted_at.is_(None),
+        )
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
+    async def count_live_tasks(self, project_id: int, limit: int) -> int:
+        """
+        Live tasks of a project, counted up to 'limit': the scan stops after
+        'limit' index entries however large the project is.
+        """
+        bounded = (
+            select(literal(1))
+            .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+            .limit(limit)
+            .subquery("live")
+        )
+        return await self.db.scalar(select(func.count()).select_from(bounded))
+
+    async def get_for_write(
+        self,
+        task_id: int,
+        user_id: int,
+        assigned_to: Optional[int] = None,
+        sprint_id: Optional[int] = None,
+        parent_id: Optional[int] = None,
+    ):
+        """
+        Load a task and validate a write against it in one round trip.
+        No row lock is taken: the write itself is a compare-and-swap on
+        Task.version. Returns a row with (Task, role, assignee_ok, sprint_ok,
+        parent_ok) or None.
+        """
+        query = select(
+            Task,
+            ProjectMemberRepository.role_subquery(Task.project_id, user_id).label(
+                "role"
+            ),
+            self._assignee_ok(Task.project_id, assigned_to),
+            self._sprint_ok(Task.project_id, sprint_id),
+            self._parent_ok(Task.project_id, parent_id, subtree=Task.path),
+        ).where(Task.id == task_id)
+        result = await self.db.execute(query)
+        return result.first()
+
+    @staticmethod
+    def _assignee_ok(project_id, assigned_to: Optional[int]):
+        if assigned_to is None:
+            return true().label("assignee_ok")
+        return (
+            exists()
+            .where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == assigned_to,
+            )
+            .label("assignee_ok")
+        )
+
+    @staticmethod
+    def _sprint_ok(project_id, sprint_id: Optional[int]):
+        if sprint_id is None:
+            return true().label("sprint_ok")
+        return (
+            exists()
+            .where(
+                Sprint.id == sprint_id,
+                Sprint.project_id == project_id,
+                Sprint.deleted_at.is_(None),
+            )
+            .label("sprint_ok")
+        )
+
+    @staticmethod
+    def _parent_ok(project_id, parent_id: Optional[int], subtree=None):
+        """
+        The parent task is a live task of the project and, when re-parenting
+        a task, not inside its own 'subtree' (that would be a cycle).
+        """
+        if parent_id is None:
+            return true().label("parent_ok")
+        parent = aliased(Task)
+        conditions = [
+            parent.id == parent_id,
+            parent.project_id == project_id,
+            parent.deleted_at.is_(None),
+        ]
+        if subtree is not None:
+            conditions.append(~parent.path.op("<@", is_comparison=True)(subtree))
+        return exists().where(*conditions).label("parent_ok")
+
+    async def get_sprint_tasks(
+        self,
+        sprint_id: int,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        order: str = "asc",
+        status: Optional[str] = None,
+        priority: Optional[int] = None,
+        assigned_to: Optional[int] = None,
+        search: Optional[str] = None,
+    ) -> List[Task]:
+        """
+        One keyset page of a sprint's live tasks ordered by (created_at, id),
+        starting after the (created_at, id) key 'after'. Served by the partial
+        index ix_tasks_sprint_created_live without an OFFSET scan or a count.
+        """
         query = select(Task).where(
             Task.sprint_id == sprint_id, Task.deleted_at.is_(None)
         )
+        query = self.apply_filtering(
+            query,
+            {"status": status, "priority": priority, "assigned_to": assigned_to},
+        )
+
+        if search:
+            query = self.apply_searching(
+                query,
+                search_fields=["title", "description"],
+                search_term=search,
+            )
+
+        key = tuple_(Task.created_at, Task.id)
+        if after is not None:
+            after_key = tuple_(*[literal(value) for value in after])
+            query = query.where(key > after_key if order == "asc" else key < after_key)
+
+        if order == "asc":
+            query = query.order_by(Task.created_at.asc(), Task.id.asc())
+        else:
+            query = query.order_by(Task.created_at.desc(), Task.id.desc())
+
+        result = await self.db.execute(query.limit(limit))
+        return result.scalars().all()
+
+    async def get_assigned_tasks(
+        self,
+        user_id: int,
+        limit: int = 20,
+        after: Optional[tuple] = None,
+        status: Optional[str] = None,
+        priority: Optional[int] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None,
+    ) -> List[Task]:
+        """
+        One keyset page of the live tasks assigned to a user in the live
+        projects they are still a member of, ordered by (due date, id) and
+        starting after the key 'after' (a None due date sorts last).
+        Served by the covering partial index ix_tasks_assignee_due_live.
+        """
+        query = select(Task).where(
+            Task.assigned_to == user_id,
+            Task.deleted_at.is_(None),
+            exists().where(
+                ProjectMember.project_id == Task.project_id,
+                ProjectMember.user_id == user_id,
+                Project.id == ProjectMember.project_id,
+                Project.deleted_at.is_(None),
+            ),
+        )
+        query = self.apply_filtering(query, {"status": status, "priority": priority})
+
+        if due_from is not None:
+            query = query.where(Task.due_date >= due_from)
+        if due_to is not None:
+            query = query.where(Task.due_date < due_to)
+
+        if after is not None:
+            due, task_id = after
+            after_due = NO_DUE_DATE if due is None else literal(due)
+            query = query.where(
+                tuple_(DUE_KEY, Task.id) > tuple_(after_due, literal(task_id))
+            )
+
+        query = query.order_by(DUE_KEY, Task.id).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_workload(self, project_id: int, sprint_id: Optional[int] = None):
+        """
+        Live task counts of a project (or one of its sprints) per assignee,
+        status and priority with one GROUP BY, answered from the partial index
+        ix_tasks_project_workload_live. Returns (assigned_to, status, priority,
+        count) rows.
+        """
+        query = (
+            select(Task.assigned_to, Task.status, Task.priority, func.count())
+            .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+            .group_by(Task.assigned_to, Task.status, Task.priority)
+        )
+        if sprint_id is not None:
+            query = query.where(Task.sprint_id == sprint_id)
+
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_sprint_board(self, sprint_id: int, per_status: int):
+        """
+        Top 'per_status' live tasks of every status column of a sprint plus the
+        column totals, in one query:
+        row_number() OVER (PARTITION BY status) picks the top tasks and
+        count(*) OVER (PARTITION BY status) gives the total of each column.
+        Returns (Task, status_total) rows ordered by status then rank.
+        """
+        ranked = (
+            select(
+                Task,
+                func.row_number()
+                .over(
+                    partition_by=Task.status,
+                    order_by=(Task.priority, Task.id),
+                )
+                .label("rank"),
+                func.count().over(partition_by=Task.status).label("status_total"),
+            )
+            .where(Task.sprint_id == sprint_id, Task.deleted_at.is_(None))
+            .subquery("ranked")
+        )
+        task = aliased(Task, ranked)
+
+        query = (
+            select(task, ranked.c.status_total)
+            .where(ranked.c.rank <= per_status)
+            .order_by(ranked.c.status, ranked.c.rank)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_task_tree(self, task_id: int, max_depth: int):
+        """
+        A live task and its live subtasks down to 'max_depth' levels, in one
+        recursive CTE. Each row carries the ids on its path from the root, so a
+        parent_id cycle stops at the first repeated task. The done/total counts
+        of every node's subtasks (within 'max_depth') are rolled up in SQL by
+        unnesting those paths.
+        Returns (Task, depth, subtasks_total, subtasks_done, truncated) rows
+        ordered by depth then id; 'truncated' marks nodes at 'max_depth' that
+        have subtasks which were not loaded.
+        """
+        tree = (
+            select(
+                Task.id,
+                Task.status,
+                literal(0).label("depth"),
+                array([Task.id]).label("path"),
+            )
+            .where(Task.id == task_id, Task.deleted_at.is_(None))
+            .cte("tree", recursive=True)
+        )
+        child = aliased(Task)
+        tree = tree.union_all(
+            select(
+                child.id,
+                child.status,
+                tree.c.depth + 1,
+                tree.c.path.op("||")(child.id),
+            )
+            .join_from(child, tree, child.parent_id == tree.c.id)
+            .where(
+                child.deleted_at.is_(None),
+                tree.c.depth < max_depth,
+                child.id != all_(tree.c.path),
+            )
+        )
+
+        ancestors = select(
+            tree.c.id,
+            tree.c.status,
+            func.unnest(tree.c.path).label("ancestor_id"),
+        ).subquery("ancestors")
+        is_subtask = ancestors.c.id != ancestors.c.ancestor_id
+        rollup = (
+            select(
+                ancestors.c.ancestor_id,
+                func.count().filter(is_subtask).label("subtasks_total"),
+                func.count()
+                .filter(is_subtask, ancestors.c.status == TaskStatus.DONE.value)
+                .label("subtasks_done"),
+            )
+            .group_by(ancestors.c.ancestor_id)
+            .subquery("rollup")
+        )
+
+        grandchild = aliased(Task)
+        truncated = and_(
+            tree.c.depth >= max_depth,
+            exists().where(
+                grandchild.parent_id == Task.id, grandchild.deleted_at.is_(None)
+            ),
+        )
+        query = (
+            select(
+                Task,
+                tree.c.depth,
+                rollup.c.subtasks_total,
+                rollup.c.subtasks_done,
+                truncated.label("truncated"),
+            )
+            .join(tree, tree.c.id == Task.id)
+            .join(rollup, rollup.c.ancestor_id == Task.id)
+            .order_by(tree.c.depth, Task.id)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    @staticmethod
+    def _counter_upserts(changes: List[TaskChange]) -> list:
+        """Burndown and project stats upserts of task changes, as CTEs."""
+        upserts = []
+        rows = burndown_rows(changes)
+        if rows:
+            upserts.append(SprintBurndownRepository.upsert(rows).cte("burndown"))
+        rows = stats_rows(changes)
+        if rows:
+            upserts.append(ProjectStatsRepository.upsert(rows).cte("stats"))
+        return upserts
+
+    async def create_task(self, values: dict, counters: dict) -> Task:
+        """
+        INSERT ... RETURNING a task, with the burndown and project stats upserts
+        of its counter state 'counters' as CTEs of the same statement.
+        """
+        query = (
+            insert(Task)
+            .values(**values)
+            .returning(Task)
+            .add_cte(*self._counter_upserts([(None, counters)]))
+        )
+        result = await self.db.scalars(query)
+        return result.one()
+
+    async def update_task(self, task: Task, values: dict, change: TaskChange) -> Task:
+        """
+        Compare-and-swap UPDATE ... RETURNING of a task (WHERE id = ? AND
+        version = ?), with the counter upserts of 'change' as CTEs of the same
+        statement. The loaded instance is refreshed from the returned row.
+
+        Like a versioned flush, losing the race raises StaleDataError; the
+        upserts run regardless, so the caller must roll back.
+        """
+        query = (
+            update(Task)
+            .where(Task.id == task.id, Task.version == task.version)
+            .values(**values, version=Task.version + 1)
+            .returning(Task)
+            .add_cte(*self._counter_upserts([change]))
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.scalars(query)
+        updated = result.one_or_none()
+        if updated is None:
+            raise StaleDataError(f"Task {task.id} version {task.version} is stale")
+        return updated
+
+    async def delete_task(self, task: Task, counters: dict) -> Task:
+        """Soft delete a task, taking it out of its counters in the same statement."""
+        return await self.update_task(
+            task,
+            {"deleted_at": func.now(), "status": TaskStatus.ACHIEVED.value},
+            (counters, None),
+        )
+
+    async def archive_tasks(
+        self,
+        project_id: int,
+        changed_by: int,
+        conditions: list,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Set-based delete_task: soft delete the live tasks of a project matching
+        'conditions' (at most 'limit') with their history rows, burndown and
+        stats deltas in one statement. Returns the archived task ids.
+        """
+        return await self.bulk_update(
+            project_id=project_id,
+            values={"deleted_at": func.now(), "status": TaskStatus.ACHIEVED.value},
+            changed_by=changed_by,
+            action=HistoryAction.DELETE.value,
+            conditions=conditions,
+            limit=limit,
+        )
+
+    def ids_condition(self, ids: List[int]):
+        """Match tasks by id with a single array parameter instead of a long IN list."""
+        return Task.id == any_(literal(ids, ARRAY(Integer)))
+
+    async def bulk_update(
+        self,
+        project_id: int,
+        values: dict,
+        changed_by: int,
+        action: str,
+        conditions: list,
+        limit: Optional[int] = None,
+        keep_burndown_of: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Update all live tasks of a project matching 'conditions' in one statement,
+        or only the first 'limit' of them by id. Tasks leaving the sprint
+        'keep_burndown_of' stay in its burndown (closing a sprint keeps its
+        unfinished work on record).
+
+        Matching rows are locked, updated with UPDATE ... RETURNING and a history
+        row with the old and new values of the fields that actually changed is
+        written for each of them by an INSERT ... SELECT over the returned rows.
+        Returns the updated task ids.
+        """
+        fields = [field for field in TASK_HISTORY_FIELDS if field in values]
+        # Also needed to move the tasks between burndown buckets and counters
+        returned = list(
+            dict.fromkeys([*fields, *BURNDOWN_FIELDS, *STATS_FIELDS, "deleted_at"])
+        )
+
+        old = (
+            select(Task.id, *[getattr(Task, field) for field in returned])
+            .where(Task.project_id == project_id, Task.deleted_at.is_(None))
+            .where(*conditions)
+            .with_for_update()
+        )
+        if limit is not None:
+            old = old.order_by(Task.id).limit(limit)
+        old = old.cte("old")
+
+        updated = (
+            update(Task)
+            .where(Task.id == old.c.id)
+            .values(**values, version=Task.version + 1)
+            .returning(
+                Task.id,
+                *[getattr(Task, field).label(f"new_{field}") for field in returned],
+                *[old.c[field].label(f"old_{field}") for field in returned],
+            )
+            .cte("updated")
+        )
+
+        burndown = SprintBurndownRepository.upsert(
+            self._burndown_deltas(updated, keep_burndown_of)
+        ).cte("burndown")
+        stats = ProjectStatsRepository.upsert(self._stats_deltas(updated)).cte("stats")
+
+        details = func.jsonb_build_object(
+            literal("before", String),
+            self._json_diff(updated, fields, "old", "new"),
+            literal("after", String),
+            self._json_diff(updated, fields, "new", "old"),
+        )
+
+        query = (
+            insert(TaskHistory)
+            .from_select(
+                ["task_id", "changed_by", "action", "details"],
+                select(
+                    updated.c.id,
+                    literal(changed_by, Integer),
+                    literal(action, String),
+                    details,
+                ),
+            )
+            .returning(TaskHistory.task_id)
+            .add_cte(updated, burndown, stats)
+        )
+
         result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def delete_task(self, task: Task) -> None:
-        await self.soft_delete(task)
-        task.status = TaskStatus.ACHIEVED.value
-        await self.db.flush()
+    @staticmethod
+    def _burndown_deltas(updated, keep_sprint_id: Optional[int] = None):
+        """
+        Per (sprint, priority) burndown deltas of an UPDATE ... RETURNING with
+        old_*/new_* columns: each task leaves its old bucket and joins the new
+        one, unless the update deleted it. Tasks never leave the buckets of
+        'keep_sprint_id'. Rows come in primary key order, like delta_rows.
+        """
+
+        def side(prefix: str, sign: int):
+            done = updated.c[f"{prefix}_status"] == TaskStatus.DONE.value
+            sprint_id = updated.c[f"{prefix}_sprint_id"]
+            query = select(
+                sprint_id.label("sprint_id"),
+                updated.c[f"{prefix}_priority"].label("priority"),
+                case((done, 0), else_=sign).label("remaining_delta"),
+                case((done, sign), else_=0).label("completed_delta"),
+            ).where(
+                sprint_id.is_not(None),
+                updated.c[f"{prefix}_deleted_at"].is_(None),
+            )
+            if keep_sprint_id is not None and sign < 0:
+                query = query.where(sprint_id != keep_sprint_id)
+            return query
+
+        changes = union_all(side("old", -1), side("new", 1)).subquery("changes")
+        remaining = func.sum(changes.c.remaining_delta)
+        completed = func.sum(changes.c.completed_delta)
+
+        return (
+            select(
+                changes.c.sprint_id,
+                func.current_date(),
+                changes.c.priority,
+                remaining,
+                completed,
+            )
+            .group_by(changes.c.sprint_id, changes.c.priority)
+            .having(or_(remaining != 0, completed != 0))
+            .order_by(changes.c.sprint_id, changes.c.priority)
+        )
+
+    @staticmethod
+    def _stats_deltas(updated):
+        """
+        Per (project, dimension, key) counter deltas of an UPDATE ... RETURNING
+        with old_*/new_* columns, e.g. ("status", "todo") -1, ("status", "done") +1.
+        Rows come in primary key order, byte-wise like the sort of stats_rows.
+        """
+
+        def side(prefix: str, sign: int):
+            def column(field):
+                return updated.c[f"{prefix}_{field}"]
+
+            def counter(dimension: str, key, *conditions):
+                return select(
+                    column("project_id").label("project_id"),
+                    literal(dimension, String).label("dimension"),
+                    key.label("key"),
+                    literal(sign, Integer).label("delta"),
+                ).where(column("deleted_at").is_(None), *conditions)
+
+            return [
+                counter(STATUS, column("status")),
+                counter(PRIORITY, cast(column("priority"), String)),
+                counter(
+                    ASSIGNEE,
+                    func.coalesce(cast(column("assigned_to"), String), UNASSIGNED),
+                ),
+                counter(
+                    OPEN_DUE,
+                    cast(cast(column("due_date"), Date), String),
+                    column("due_date").is_not(None),
+                    column("status") != TaskStatus.DONE.value,
+                ),
+            ]
+
+        changes = union_all(*side("old", -1), *side("new", 1)).subquery("counters")
+        delta = func.sum(changes.c.delta)
+
+        return (
+            select(changes.c.project_id, changes.c.dimension, changes.c.key, delta)
+            .group_by(changes.c.project_id, changes.c.dimension, changes.c.key)
+            .having(delta != 0)
+            .order_by(
+                changes.c.project_id,
+                changes.c.dimension.collate("C"),
+                changes.c.key.collate("C"),
+            )
+        )
+
+    @staticmethod
+    def _json_diff(rows, fields: List[str], side: str, other: str):
+        """
+        jsonb object with the '<side>_<field>' value of every field whose value
+        differs from '<other>_<field>', e.g. {"status": "todo"}.
+        """
+        diff = literal_column("'{}'::jsonb", JSONB)
+        for field in fields:
+            value, other_value = rows.c[f"{side}_{field}"], rows.c[f"{other}_{field}"]
+            diff = diff.op("||", return_type=JSONB)(
+                case(
+                    (
+                        value.is_distinct_from(other_value),
+                        func.jsonb_build_object(literal(field, String), value),
+                    ),
+                    else_=literal_column("'{}'::jsonb", JSONB),
+                )
+            )
+        return diff
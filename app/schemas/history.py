@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class HistoryRead(BaseModel):
+    """One history row of a task, sprint or project."""
+
+    id: int
+    changed_by: int
+    changed_at: datetime
+    action: str
+    # {"before": {...}, "after": {...}} with the fields that changed
+    details: Any = None
+
+    model_config = ConfigDict(from_attributes=True)
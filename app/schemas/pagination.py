@@ -38,3 +38,16 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset paginated response: pass 'next_cursor' back as 'cursor' to get the
+    next page, None means this is the last one.
+    """
+
+    items: List[T]
+    page_size: int
+    next_cursor: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
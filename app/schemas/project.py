@@ -1,9 +1,9 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.core.enums import ProjectStatus
+from app.core.enums import ArchiveJobStatus, ProjectStatus
 from app.schemas.sprint import SprintRead
 
 
@@ -12,6 +12,8 @@ class ProjectBase(BaseModel):
     title: str = Field(..., max_length=255)
     description: str | None = None
     status: ProjectStatus | None = ProjectStatus.PLANNED.value
+    # Reject active sprints overlapping another active sprint of the project
+    reject_sprint_overlaps: bool = False
 
 
 class ProjectCreate(ProjectBase):
@@ -27,16 +29,64 @@ class ProjectRead(ProjectBase):
     managed_by: int
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectCounts(BaseModel):
+    tasks_total: int
+    tasks_open: int
+    members: int
+    active_sprint_id: Optional[int] = None
+    active_sprint_title: Optional[str] = None
+
+
+class ProjectListItem(ProjectRead):
+    # Only filled with ?include=counts
+    counts: Optional[ProjectCounts] = None
+
+
 class ProjectDetailRead(ProjectRead):
+    # Active, then most recent live sprints; the rest is paginated at sprints_url
     sprints: List[SprintRead] = []
+    sprints_total: int
+    sprints_url: str
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class AssigneeCount(BaseModel):
+    user_id: Optional[int]
+    count: int
+
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int
+    overdue: int
+    by_status: Dict[str, int]
+    by_priority: Dict[int, int]
+    by_assignee: List[AssigneeCount]
+
+
+class AssigneeWorkload(BaseModel):
+    user_id: Optional[int]
+    # Tasks not done yet and their priority-weighted sum
+    open: int
+    load: int
+    by_status: Dict[str, int]
+    # Open tasks only
+    by_priority: Dict[int, int]
+
+
+class ProjectWorkload(BaseModel):
+    project_id: int
+    sprint_id: Optional[int] = None
+    generated_at: datetime
+    assignees: List[AssigneeWorkload]
+
+
 # ---- ProjectMember ----
 class ProjectMemberBase(BaseModel):
     project_id: int
@@ -53,3 +103,23 @@ class ProjectMemberRead(ProjectMemberBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ---- ArchiveJob ----
+class ArchiveJobQueued(BaseModel):
+    # Tasks are archived in the background; progress is at status_url
+    job_id: int
+    status_url: str
+
+
+class ArchiveJobRead(BaseModel):
+    id: int
+    project_id: int
+    status: ArchiveJobStatus
+    tasks_total: int
+    tasks_archived: int
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
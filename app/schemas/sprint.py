@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from typing import List
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.core.enums import SprintStatus
 
@@ -14,7 +15,12 @@ class SprintBase(BaseModel):
 
 
 class SprintCreate(SprintBase):
-    pass
+    @model_validator(mode="after")
+    def check_dates(self):
+        # daterange(start_date, end_date) rejects reversed bounds
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
 
 
 class SprintUpdate(BaseModel):
@@ -24,11 +30,50 @@ class SprintUpdate(BaseModel):
     start_date: date | None = None
     end_date: date | None = None
 
+    @model_validator(mode="after")
+    def check_dates(self):
+        # Updates changing one date only are checked against the stored sprint
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
 
 class SprintRead(SprintBase):
     id: int
     project_id: int
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SprintClose(BaseModel):
+    # Sprint that receives the unfinished tasks, None moves them to the backlog
+    target_sprint_id: int | None = None
+
+
+class SprintCloseResult(BaseModel):
+    sprint: SprintRead
+    target_sprint_id: int | None
+    moved: int
+
+
+class BurndownPriority(BaseModel):
+    priority: int
+    remaining: int
+    completed: int
+
+
+class BurndownDay(BaseModel):
+    day: date
+    remaining: int
+    completed: int
+    by_priority: List[BurndownPriority]
+
+
+class SprintBurndownRead(BaseModel):
+    sprint_id: int
+    start_date: date
+    end_date: date
+    days: List[BurndownDay]
@@ -1,9 +1,13 @@
 from datetime import datetime
+from typing import List
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.core.enums import TaskPriority, TaskStatus
 
+MAX_BULK_TASKS = 500
+MAX_BULK_UPDATE_IDS = 10000
+
 
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=3, max_length=255)
@@ -26,6 +30,8 @@ class TaskUpdate(BaseModel):
     priority: TaskPriority | None = None
     assigned_to: int | None = None
     sprint_id: int | None = None
+    # Moves the task with all of its subtasks; null makes it a root task
+    parent_id: int | None = None
     due_date: datetime | None = None
 
 
@@ -36,5 +42,68 @@ class TaskRead(TaskBase):
     parent_id: int | None
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskTreeNode(TaskRead):
+    depth: int
+    # Done/total of all subtasks below this node, within the requested depth
+    subtasks_total: int
+    subtasks_done: int
+    # True when the node has subtasks below the requested depth
+    truncated: bool = False
+    children: List["TaskTreeNode"] = []
+
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class TaskBulkCreateResult(BaseModel):
+    created: List[TaskRead]
+    errors: List[TaskBulkError]
+
+
+class TaskBulkFilter(BaseModel):
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+    assigned_to: int | None = None
+    sprint_id: int | None = None
+
+
+class TaskBulkUpdate(BaseModel):
+    ids: List[int] | None = Field(None, min_length=1, max_length=MAX_BULK_UPDATE_IDS)
+    filters: TaskBulkFilter | None = None
+    changes: TaskUpdate
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        has_filters = self.filters is not None and self.filters.model_dump(
+            exclude_none=True
+        )
+        if not self.ids and not has_filters:
+            raise ValueError("Either 'ids' or at least one filter is required")
+        return self
+
+
+class TaskBulkUpdateResult(BaseModel):
+    updated: int
+    task_ids: List[int]
+
+
+class TaskBoardColumn(BaseModel):
+    status: str
+    total: int
+    tasks: List[TaskRead]
+
+
+class SprintBoard(BaseModel):
+    sprint_id: int
+    columns: List[TaskBoardColumn]
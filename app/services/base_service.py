@@ -1,14 +1,27 @@
-from typing import Generic, TypeVar
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Generic, Optional, Sequence, TypeVar
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.core.enums import EntityEnum
+from app.core.helpers import decode_cursor, encode_cursor, reconstruct_history
 from app.repositories.base_repository import BaseRepository
+from app.repositories.history_repository import HistoryRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage
+from app.services.history_pipeline import HistoryRecorder
 
 RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
 
+# How long a stored Idempotency-Key response is replayed
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24")))
+
 
 class BaseService(Generic[RepositoryType]):
     """
@@ -18,6 +31,7 @@ class BaseService(Generic[RepositoryType]):
     def __init__(self, db: AsyncSession, repository: RepositoryType):
         self.db = db
         self.repository = repository
+        self.history = HistoryRecorder(db)
 
     async def get_by_id_or_404(
         self,
@@ -27,7 +41,11 @@ class BaseService(Generic[RepositoryType]):
     ):
         """Get entity by ID or raise 404."""
         entity = await self.repository.get_by_id(entity_id, for_update)
+        return self.ensure_exists(entity, entity_name)
 
+    @staticmethod
+    def ensure_exists(entity, entity_name: str = EntityEnum.Entity.value):
+        """Return entity or raise 404 if it is missing or soft deleted."""
         if not entity or getattr(entity, "deleted_at", None) is not None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -35,29 +53,172 @@ class BaseService(Generic[RepositoryType]):
             )
         return entity
 
+    @staticmethod
+    def version_conflict(entity_name: str = EntityEnum.Entity.value):
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{entity_name} was modified by another request, reload and retry",
+        )
+
+    def check_version(
+        self,
+        entity,
+        expected_version: Optional[int],
+        entity_name: str = EntityEnum.Entity.value,
+    ):
+        """Raise 409 if the client's version (If-Match) is not the current one."""
+        if expected_version is not None and entity.version != expected_version:
+            raise self.version_conflict(entity_name)
+
+    @asynccontextmanager
+    async def versioned_write(self, entity_name: str = EntityEnum.Entity.value):
+        """
+        Tasks, sprints and projects map 'version' as the mapper's
+        version_id_col: every UPDATE bumps it and is a compare-and-swap
+        (WHERE id = ? AND version = ?), and If-Match is checked against it.
+        A flush inside this block that loses the race is a 409.
+        """
+        try:
+            yield
+        except StaleDataError:
+            await self.db.rollback()
+            self.history.discard()
+            raise self.version_conflict(entity_name)
+
+    async def history_page(
+        self,
+        repository: HistoryRepository,
+        entity_id: int,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        changed_by: Optional[int] = None,
+        action: Optional[str] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        conditions: Sequence = (),
+        current: Optional[dict] = None,
+    ) -> CursorPage[HistoryRead]:
+        """
+        Keyset paginated history of an entity, newest first. With the entity's
+        'current' snapshot the diff-only details are replaced by full
+        before/after snapshots, rebuilt by folding the diffs of every newer
+        row back from the current state.
+        """
+        # One extra row tells whether there is a next page
+        rows = await repository.get_entity_history(
+            entity_id=entity_id,
+            limit=page_size + 1,
+            after=self._decode_history_cursor(cursor) if cursor else None,
+            changed_by=changed_by,
+            action=action,
+            changed_from=changed_from,
+            changed_to=changed_to,
+            conditions=conditions,
+        )
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].changed_at, rows[-1].id)
+
+        items = [HistoryRead.model_validate(row) for row in rows]
+        if current is not None and items:
+            newer = await repository.get_details_since(
+                entity_id, (rows[-1].changed_at, rows[-1].id)
+            )
+            views = dict(
+                zip(
+                    [row.id for row in newer],
+                    reconstruct_history(current, [row.details for row in newer]),
+                )
+            )
+            items = [
+                item.model_copy(update={"details": views[item.id]}) for item in items
+            ]
+
+        return CursorPage(items=items, page_size=page_size, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_history_cursor(cursor: str) -> tuple:
+        """(changed_at, id) key of a history listing cursor, 400 if malformed."""
+        try:
+            changed_at, history_id = decode_cursor(cursor)
+            return datetime.fromisoformat(changed_at), int(history_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    async def replay_idempotent(
+        self, user_id: int, key: str, request_hash: str
+    ) -> Optional[dict]:
+        """
+        Lock the Idempotency-Key for this transaction and return the response
+        stored by an earlier request with it, if any. Reusing a key with a
+        different request is a 422.
+        """
+        repository = IdempotencyRepository(self.db)
+        await repository.lock(user_id, key)
+
+        stored = await repository.get_live(user_id, key, IDEMPOTENCY_KEY_TTL)
+        if stored is None:
+            return None
+
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        return stored.response
+
+    async def remember_idempotent(
+        self,
+        user_id: int,
+        key: str,
+        request_hash: str,
+        response: dict,
+        status_code: int = status.HTTP_201_CREATED,
+    ):
+        """Store the response in the same transaction as the write."""
+        await IdempotencyRepository(self.db).save(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response=response,
+        )
+
     async def commit_or_rollback(self):
         """Commit transaction or rollback on error."""
         try:
             await self.db.commit()
+        except StaleDataError:
+            await self.db.rollback()
+            self.history.discard()
+            raise self.version_conflict()
         except SQLAlchemyError as e:
             await self.db.rollback()
+            self.history.discard()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(e)}",
             )
 
+        # Queued history events are only handed over once the change is durable
+        await self.history.publish()
+
     async def flush_or_rollback(self):
         """Flush changes or rollback on error."""
         try:
             await self.db.flush()
+        except StaleDataError:
+            await self.db.rollback()
+            self.history.discard()
+            raise self.version_conflict()
         except SQLAlchemyError as e:
             await self.db.rollback()
+            self.history.discard()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(e)}",
             )
-
-    async def refresh(self, entity):
-        """Refresh entity from database."""
-        await self.db.refresh(entity)
-        return entity
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal
+from app.core.enums import EntityEnum, HistoryAction, HistoryPipelineMode
+from app.repositories.history_outbox_repository import HistoryOutboxRepository
+from app.repositories.project_history_repository import ProjectHistoryRepository
+from app.repositories.sprint_history_repository import SprintHistoryRepository
+from app.repositories.task_history_repository import TaskHistoryRepository
+
+logger = logging.getLogger(__name__)
+
+HISTORY_PIPELINE_MODE = HistoryPipelineMode(
+    os.getenv("HISTORY_PIPELINE_MODE", HistoryPipelineMode.SYNC.value)
+)
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "500"))
+HISTORY_FLUSH_INTERVAL_MS = int(os.getenv("HISTORY_FLUSH_INTERVAL_MS", "200"))
+HISTORY_QUEUE_MAXSIZE = int(os.getenv("HISTORY_QUEUE_MAXSIZE", "10000"))
+HISTORY_ENQUEUE_TIMEOUT_MS = int(os.getenv("HISTORY_ENQUEUE_TIMEOUT_MS", "1000"))
+
+# Entity type -> (history repository class, foreign key column)
+HISTORY_TARGETS = {
+    EntityEnum.TASK.value: (TaskHistoryRepository, "task_id"),
+    EntityEnum.SPRINT.value: (SprintHistoryRepository, "sprint_id"),
+    EntityEnum.PROJECT.value: (ProjectHistoryRepository, "project_id"),
+}
+
+
+def _utcnow() -> datetime:
+    # History columns are naive timestamps filled by now() on a UTC server
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class HistoryEvent:
+    """One history row, independent of the table it ends up in."""
+
+    entity_type: str
+    entity_id: int
+    changed_by: int
+    action: str
+    details: Optional[dict] = None
+    changed_at: Optional[datetime] = field(default=None)
+
+    def to_history_row(self) -> dict:
+        _, key = HISTORY_TARGETS[self.entity_type]
+        row = {
+            key: self.entity_id,
+            "changed_by": self.changed_by,
+            "action": self.action,
+            "details": self.details,
+        }
+        if self.changed_at is not None:
+            row["changed_at"] = self.changed_at
+        return row
+
+    def to_outbox_row(self) -> dict:
+        return {
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "changed_by": self.changed_by,
+            "action": self.action,
+            "details": self.details,
+        }
+
+
+async def write_history_events(db: AsyncSession, events: Iterable[HistoryEvent]):
+    """Insert events into their history tables, one multi-row INSERT per table."""
+    rows_by_type = {}
+    for event in events:
+        rows_by_type.setdefault(event.entity_type, []).append(event.to_history_row())
+
+    for entity_type, rows in rows_by_type.items():
+        repository_class, _ = HISTORY_TARGETS[entity_type]
+        await repository_class(db).bulk_insert(rows)
+
+
+class HistoryRecorder:
+    """
+    Per-session entry point used by services to record history.
+
+    - sync: rows are added to the request session, as before.
+    - outbox: rows go to history_outbox in the request transaction.
+    - queue: events are buffered and handed to the history writer after commit.
+    """
+
+    def __init__(self, db: AsyncSession, mode: HistoryPipelineMode = None):
+        self.db = db
+        self.mode = mode or HISTORY_PIPELINE_MODE
+        self.pending: List[HistoryEvent] = []
+
+    def record(
+        self,
+        entity: EntityEnum,
+        entity_id: int,
+        changed_by: int,
+        action: HistoryAction,
+        details: Optional[dict] = None,
+    ) -> None:
+        event = HistoryEvent(
+            entity_type=entity.value,
+            entity_id=entity_id,
+            changed_by=changed_by,
+            action=action.value,
+            details=details,
+        )
+
+        if self.mode == HistoryPipelineMode.QUEUE:
+            event.changed_at = _utcnow()
+            self.pending.append(event)
+        elif self.mode == HistoryPipelineMode.OUTBOX:
+            HistoryOutboxRepository(self.db).create(**event.to_outbox_row())
+        else:
+            repository_class, _ = HISTORY_TARGETS[event.entity_type]
+            repository_class(self.db).create(**event.to_history_row())
+
+    async def record_many(self, events: List[HistoryEvent]) -> None:
+        """Record many events with (at most) one INSERT per target table."""
+        if not events:
+            return
+
+        if self.mode == HistoryPipelineMode.QUEUE:
+            now = _utcnow()
+            for event in events:
+                event.changed_at = event.changed_at or now
+            self.pending.extend(events)
+        elif self.mode == HistoryPipelineMode.OUTBOX:
+            await HistoryOutboxRepository(self.db).bulk_insert(
+                [event.to_outbox_row() for event in events]
+            )
+        else:
+            await write_history_events(self.db, events)
+
+    async def publish(self) -> None:
+        """Hand buffered events to the writer. Call after a successful commit."""
+        if self.pending:
+            events, self.pending = self.pending, []
+            await history_writer.enqueue(events)
+
+    def discard(self) -> None:
+        """Drop buffered events. Call after a rollback."""
+        self.pending = []
+
+
+class HistoryWriter:
+    """
+    Background writer that moves history events to the history tables in
+    multi-row batches every 'flush_interval_ms' or 'batch_size' events.
+
+    In queue mode producers are slowed down when the bounded queue is full
+    (backpressure): they wait up to 'enqueue_timeout_ms' and then write their
+    events themselves. In outbox mode the writer drains history_outbox.
+    stop() drains everything that is left before returning.
+    """
+
+    def __init__(
+        self,
+        mode: HistoryPipelineMode = HISTORY_PIPELINE_MODE,
+        batch_size: int = HISTORY_BATCH_SIZE,
+        flush_interval_ms: int = HISTORY_FLUSH_INTERVAL_MS,
+        max_queue_size: int = HISTORY_QUEUE_MAXSIZE,
+        enqueue_timeout_ms: int = HISTORY_ENQUEUE_TIMEOUT_MS,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping.is_set()
+
+    async def start(self) -> None:
+        if self.mode == HistoryPipelineMode.SYNC or self._task is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = asyncio.Event()
+        if self.mode == HistoryPipelineMode.QUEUE:
+            self._task = asyncio.create_task(self._run_queue())
+        else:
+            self._task = asyncio.create_task(self._run_outbox())
+
+    async def stop(self) -> None:
+        """Stop accepting work and drain what is left."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def enqueue(self, events: List[HistoryEvent]) -> None:
+        if not self.running:
+            await self._write(events)
+            return
+
+        for index, event in enumerate(events):
+            try:
+                await asyncio.wait_for(self._queue.put(event), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "History queue full, writing %d events inline",
+                    len(events) - index,
+                )
+                await self._write(events[index:])
+                return
+
+    async def _run_queue(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                await self._write_safely(batch)
+
+    async def _next_batch(self) -> List[HistoryEvent]:
+        """Wait for the first event, then collect more until the batch is full
+        or the flush interval has passed."""
+        batch = []
+        try:
+            batch.append(await asyncio.wait_for(self._queue.get(), self.flush_interval))
+        except asyncio.TimeoutError:
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._stopping.is_set() and self._queue.empty():
+                break
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_outbox(self) -> None:
+        while True:
+            try:
+                moved = await self._relay_outbox()
+            except Exception:
+                logger.exception("Failed to relay history outbox")
+                moved = 0
+
+            if moved >= self.batch_size:
+                continue
+            if self._stopping.is_set():
+                break
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _relay_outbox(self) -> int:
+        """Move one batch from history_outbox to the history tables."""
+        async with self.session_factory() as db:
+            rows = await HistoryOutboxRepository(db).claim_batch(self.batch_size)
+            events = [
+                HistoryEvent(
+                    entity_type=row.entity_type,
+                    entity_id=row.entity_id,
+                    changed_by=row.changed_by,
+                    action=row.action,
+                    details=row.details,
+                    changed_at=row.changed_at,
+                )
+                for row in rows
+            ]
+            await write_history_events(db, events)
+            await db.commit()
+            return len(rows)
+
+    async def _write(self, events: List[HistoryEvent]) -> None:
+        async with self.session_factory() as db:
+            await write_history_events(db, events)
+            await db.commit()
+
+    async def _write_safely(self, events: List[HistoryEvent]) -> None:
+        try:
+            await self._write(events)
+        except Exception:
+            # Best-effort mode: a failed batch is logged and dropped
+            logger.exception("Failed to write %d history events", len(events))
+
+
+history_writer = HistoryWriter()
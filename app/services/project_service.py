@@ -1,25 +1,86 @@
+import os
+from datetime import date, datetime
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
-from app.core.enums import EntityEnum, HistoryAction, UserRole
-from app.core.helpers import get_total_pages
+from app.core.cache import workload_cache
+from app.core.enums import (
+    EntityEnum,
+    HistoryAction,
+    TaskPriority,
+    TaskStatus,
+    UserRole,
+)
+from app.core.helpers import diff_snapshots, get_total_pages, hash_request
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.repositories.archive_job_repository import ArchiveJobRepository
 from app.repositories.project_history_repository import ProjectHistoryRepository
 from app.repositories.project_member_repository import ProjectMemberRepository
 from app.repositories.project_repository import ProjectRepository
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.repositories.project_stats_repository import (
+    ASSIGNEE,
+    PRIORITY,
+    STATUS,
+    UNASSIGNED,
+    ProjectStatsRepository,
+)
+from app.repositories.sprint_repository import SprintRepository
+from app.repositories.task_repository import TaskRepository
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage, PaginatedResponse
+from app.schemas.project import (
+    ArchiveJobQueued,
+    ArchiveJobRead,
+    AssigneeCount,
+    AssigneeWorkload,
+    ProjectCounts,
+    ProjectCreate,
+    ProjectDetailRead,
+    ProjectListItem,
+    ProjectRead,
+    ProjectStats,
+    ProjectUpdate,
+    ProjectWorkload,
+)
 from app.services.base_service import BaseService
 
+# Deleting a project with more live tasks than this archives them in the
+# background (app.jobs.run_archive_jobs) instead of in the request
+PROJECT_ARCHIVE_INLINE_TASKS = int(os.getenv("PROJECT_ARCHIVE_INLINE_TASKS", "5000"))
+
+# Weight of an open task in an assignee's workload, by priority
+PRIORITY_WEIGHTS = {
+    TaskPriority.CRITICAL.value: 8,
+    TaskPriority.HIGH.value: 4,
+    TaskPriority.MEDIUM.value: 2,
+    TaskPriority.LOW.value: 1,
+}
+
 
 class ProjectService(BaseService[ProjectRepository]):
     def __init__(self, db: AsyncSession = Depends(get_db)):
         project_repo = ProjectRepository(db)
         super().__init__(db, project_repo)
         self.member_repo = ProjectMemberRepository(db)
-        self.project_history_repo = ProjectHistoryRepository(db)
+        self.stats_repo = ProjectStatsRepository(db)
+        self.sprint_repo = SprintRepository(db)
+        self.task_repo = TaskRepository(db)
+        self.archive_job_repo = ArchiveJobRepository(db)
+        self.history_repo = ProjectHistoryRepository(db)
+
+    @staticmethod
+    def _snapshot(project: Project) -> dict:
+        """Tracked project fields as stored in history details."""
+        return {
+            "title": project.title,
+            "description": project.description,
+            "status": project.status,
+            "reject_sprint_overlaps": project.reject_sprint_overlaps,
+        }
 
     async def get_user_projects(
         self,
@@ -30,8 +91,13 @@ class ProjectService(BaseService[ProjectRepository]):
         search: Optional[str] = None,
         sort_by: str = "created_at",
         order: str = "asc",
+        include_counts: bool = False,
     ) -> PaginatedResponse:
-        """Get paginated, filtered, and sorted projects."""
+        """
+        Get paginated, filtered, and sorted projects.
+        'include_counts' adds task/member counts and the active sprint to each
+        item, computed in the same statement as the page.
+        """
 
         items, total = await self.repository.get_user_projects(
             user_id=user_id,
@@ -41,7 +107,16 @@ class ProjectService(BaseService[ProjectRepository]):
             search=search,
             sort_by=sort_by,
             order=order,
+            include_counts=include_counts,
         )
+        if include_counts:
+            items = [
+                ProjectListItem(
+                    **ProjectRead.model_validate(row.Project).model_dump(),
+                    counts=ProjectCounts.model_validate(row, from_attributes=True),
+                )
+                for row in items
+            ]
 
         total_pages = get_total_pages(total, page_size)
 
@@ -53,7 +128,9 @@ class ProjectService(BaseService[ProjectRepository]):
             total_pages=total_pages,
         )
 
-    async def get_project_detail(self, project_id: int, user_id: int):
+    async def get_project_detail(
+        self, project_id: int, user_id: int, sprints_limit: int = 10
+    ) -> ProjectDetailRead:
         member = await self.member_repo.get_member_project(project_id, user_id)
         if not member:
             raise HTTPException(
@@ -67,12 +144,164 @@ class ProjectService(BaseService[ProjectRepository]):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found",
             )
-        return detail_project
 
-    async def create_project(self, data: ProjectCreate, owner_id: int):
+        rows = await self.repository.get_recent_sprints(project_id, sprints_limit)
+
+        return ProjectDetailRead(
+            **ProjectRead.model_validate(detail_project).model_dump(),
+            sprints=[sprint for sprint, _ in rows],
+            sprints_total=rows[0].total if rows else 0,
+            sprints_url=f"/api/projects/{project_id}/sprints",
+        )
+
+    async def get_project_history(
+        self,
+        project_id: int,
+        user_id: int,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        changed_by: Optional[int] = None,
+        action: Optional[str] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        full: bool = False,
+    ) -> CursorPage[HistoryRead]:
+        """
+        Keyset paginated history of a project, newest first. 'full' returns
+        complete before/after snapshots instead of the changed fields.
+        """
+        member = await self.member_repo.get_member_project(project_id, user_id)
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this project",
+            )
+        project = await self.get_by_id_or_404(
+            entity_id=project_id, entity_name=EntityEnum.PROJECT.value
+        )
+
+        return await self.history_page(
+            self.history_repo,
+            project_id,
+            page_size=page_size,
+            cursor=cursor,
+            changed_by=changed_by,
+            action=action,
+            changed_from=changed_from,
+            changed_to=changed_to,
+            current=self._snapshot(project) if full else None,
+        )
+
+    async def get_project_stats(self, project_id: int, user_id: int) -> ProjectStats:
+        """
+        Task counts by status, priority and assignee plus overdue tasks, read
+        from the counters maintained by task writes instead of the tasks.
+        """
+        member = await self.member_repo.get_member_project(project_id, user_id)
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this project",
+            )
+
+        stats = ProjectStats(
+            project_id=project_id,
+            total=0,
+            overdue=0,
+            by_status={},
+            by_priority={},
+            by_assignee=[],
+        )
+        for dimension, key, count in await self.stats_repo.get_counts(
+            project_id, date.today()
+        ):
+            if dimension == STATUS:
+                stats.by_status[key] = count
+                stats.total += count
+            elif dimension == PRIORITY:
+                stats.by_priority[int(key)] = count
+            elif dimension == ASSIGNEE:
+                user = None if key == UNASSIGNED else int(key)
+                stats.by_assignee.append(AssigneeCount(user_id=user, count=count))
+            else:
+                stats.overdue = count
+
+        return stats
+
+    async def get_project_workload(
+        self, project_id: int, user_id: int, sprint_id: Optional[int] = None
+    ) -> ProjectWorkload:
+        """
+        Open tasks and priority-weighted load per assignee of a project or one
+        of its sprints, from one GROUP BY over the live tasks. Served from
+        workload_cache when WORKLOAD_CACHE_TTL_SECONDS is set; task writes of
+        the project drop the cached entries.
+        """
+        member = await self.member_repo.get_member_project(project_id, user_id)
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this project",
+            )
+
+        cached = workload_cache.get(project_id, sprint_id)
+        if cached is not None:
+            return cached
+
+        assignees = {}
+        for (
+            assigned_to,
+            task_status,
+            priority,
+            count,
+        ) in await self.task_repo.get_workload(project_id, sprint_id):
+            workload = assignees.setdefault(
+                assigned_to,
+                AssigneeWorkload(
+                    user_id=assigned_to, open=0, load=0, by_status={}, by_priority={}
+                ),
+            )
+            workload.by_status[task_status] = (
+                workload.by_status.get(task_status, 0) + count
+            )
+            if task_status != TaskStatus.DONE.value:
+                workload.open += count
+                workload.load += count * PRIORITY_WEIGHTS.get(priority, 1)
+                workload.by_priority[priority] = (
+                    workload.by_priority.get(priority, 0) + count
+                )
+
+        workload = ProjectWorkload(
+            project_id=project_id,
+            sprint_id=sprint_id,
+            generated_at=datetime.now(),
+            # Busiest first, unassigned tasks last
+            assignees=sorted(
+                assignees.values(),
+                key=lambda a: (a.user_id is None, -a.load, a.user_id or 0),
+            ),
+        )
+        workload_cache.set(project_id, sprint_id, workload)
+        return workload
+
+    async def create_project(
+        self,
+        data: ProjectCreate,
+        owner_id: int,
+        idempotency_key: Optional[str] = None,
+    ):
+        if idempotency_key:
+            request_hash = hash_request("create_project", data.model_dump(mode="json"))
+            replay = await self.replay_idempotent(
+                owner_id, idempotency_key, request_hash
+            )
+            if replay is not None:
+                return ProjectRead.model_validate(replay)
+
         project = self.repository.create(
             title=data.title,
             description=data.description,
+            reject_sprint_overlaps=data.reject_sprint_overlaps,
             managed_by=owner_id,
         )
 
@@ -84,66 +313,138 @@ class ProjectService(BaseService[ProjectRepository]):
             role=UserRole.OWNER.value,
         )
 
-        self.project_history_repo.create(
-            project_id=project.id,
+        self.history.record(
+            entity=EntityEnum.PROJECT,
+            entity_id=project.id,
             changed_by=owner_id,
-            action=HistoryAction.CREATE.value,
+            action=HistoryAction.CREATE,
             details=None,
         )
 
+        if idempotency_key:
+            await self.remember_idempotent(
+                owner_id,
+                idempotency_key,
+                request_hash,
+                ProjectRead.model_validate(project).model_dump(mode="json"),
+            )
+
         await self.commit_or_rollback()
-        return await self.refresh(project)
+        return project
 
-    async def update_project(self, project_id: int, data: ProjectUpdate, user_id: int):
+    async def update_project(
+        self,
+        project_id: int,
+        data: ProjectUpdate,
+        user_id: int,
+        expected_version: Optional[int] = None,
+    ):
         await self.member_repo.check_permissions(
             project_id, user_id, [UserRole.OWNER.value, UserRole.MAINTAINER.value]
         )
 
         project = await self.get_by_id_or_404(
-            entity_id=project_id, for_update=True, entity_name=EntityEnum.PROJECT.value
+            entity_id=project_id, entity_name=EntityEnum.PROJECT.value
         )
 
+        self.check_version(project, expected_version, EntityEnum.PROJECT.value)
+
         update_data = data.model_dump(exclude_unset=True)
-        before = {
-            "title": project.title,
-            "description": project.description,
-            "status": project.status,
-        }
+        before = self._snapshot(project)
 
-        project = await self.repository.update(project, update_data)
+        async with self.versioned_write(EntityEnum.PROJECT.value):
+            project = await self.repository.update(project, update_data)
 
-        after = {
-            "title": project.title,
-            "description": project.description,
-            "status": project.status,
-        }
-
-        self.project_history_repo.create(
-            project_id=project.id,
+        self.history.record(
+            entity=EntityEnum.PROJECT,
+            entity_id=project.id,
             changed_by=user_id,
-            action=HistoryAction.UPDATE.value,
-            details={"before": before, "after": after},
+            action=HistoryAction.UPDATE,
+            details=diff_snapshots(before, self._snapshot(project)),
         )
 
         await self.commit_or_rollback()
-        return await self.refresh(project)
+        return project
 
-    async def delete_project(self, project_id: int, user_id: int):
+    async def delete_project(
+        self, project_id: int, user_id: int
+    ) -> Optional[ArchiveJobQueued]:
+        """
+        Soft delete a project and archive its sprints and tasks. Returns the
+        archive job the tasks were left to, or None when they were archived
+        in this request.
+        """
         await self.member_repo.check_permissions(
             project_id, user_id, [UserRole.OWNER.value]
         )
 
         project = await self.get_by_id_or_404(
-            entity_id=project_id, for_update=True, entity_name=EntityEnum.PROJECT.value
+            entity_id=project_id, entity_name=EntityEnum.PROJECT.value
         )
 
-        self.project_history_repo.create(
-            project_id=project.id,
+        self.history.record(
+            entity=EntityEnum.PROJECT,
+            entity_id=project.id,
             changed_by=user_id,
-            action=HistoryAction.DELETE.value,
+            action=HistoryAction.DELETE,
             details=None,
         )
 
-        # AWAIT HERE
-        await self.repository.delete_project(project)
+        async with self.versioned_write(EntityEnum.PROJECT.value):
+            await self.repository.delete_project(project)
+
+        # Children are archived set-based in this transaction; the tasks of
+        # large projects are left to a background job
+        await self.sprint_repo.archive_sprints(
+            changed_by=user_id, conditions=[Sprint.project_id == project.id]
+        )
+        # Counting stops one past the limit, so large projects are not scanned
+        live_tasks = await self.task_repo.count_live_tasks(
+            project.id, limit=PROJECT_ARCHIVE_INLINE_TASKS + 1
+        )
+        job = None
+        if live_tasks > PROJECT_ARCHIVE_INLINE_TASKS:
+            # The status counters only size the progress report
+            tasks_total = await self.stats_repo.count_tasks(project.id)
+            job = self.archive_job_repo.create(
+                project_id=project.id,
+                requested_by=user_id,
+                tasks_total=max(tasks_total, live_tasks),
+            )
+        else:
+            await self.task_repo.archive_tasks(
+                project_id=project.id, changed_by=user_id, conditions=[]
+            )
+
         await self.commit_or_rollback()
+        workload_cache.invalidate(project.id)
+
+        if job is None:
+            return None
+        return ArchiveJobQueued(
+            job_id=job.id,
+            status_url=f"/api/projects/{project.id}/archive-jobs/{job.id}",
+        )
+
+    async def get_archive_job(
+        self, project_id: int, job_id: int, user_id: int
+    ) -> ArchiveJobRead:
+        """Progress of the archive job of a deleted project, for its members."""
+        await self.member_repo.check_permissions(
+            project_id,
+            user_id,
+            [
+                UserRole.OWNER.value,
+                UserRole.MAINTAINER.value,
+                UserRole.MEMBER.value,
+                UserRole.VIEWER.value,
+            ],
+        )
+
+        job = await self.archive_job_repo.get_project_job(project_id, job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Archive job not found",
+            )
+        return ArchiveJobRead.model_validate(job)
@@ -1,27 +1,69 @@
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
-from app.core.enums import EntityEnum, HistoryAction, UserRole
-from app.core.helpers import format_date_to_string, get_total_pages
+from app.core.cache import workload_cache
+from app.core.enums import (
+    EntityEnum,
+    HistoryAction,
+    SprintStatus,
+    TaskStatus,
+    UserRole,
+)
+from app.core.helpers import diff_snapshots, format_date_to_string, get_total_pages
+from app.models.sprint import Sprint
+from app.models.task import Task
 from app.repositories.project_member_repository import ProjectMemberRepository
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.sprint_burndown_repository import SprintBurndownRepository
 from app.repositories.sprint_history_repository import SprintHistoryRepository
 from app.repositories.sprint_repository import SprintRepository
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.sprint import SprintCreate, SprintUpdate
+from app.repositories.task_repository import TaskRepository
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage, PaginatedResponse
+from app.schemas.sprint import (
+    BurndownDay,
+    BurndownPriority,
+    SprintBurndownRead,
+    SprintClose,
+    SprintCloseResult,
+    SprintCreate,
+    SprintRead,
+    SprintUpdate,
+)
 from app.services.base_service import BaseService
 
+# Sprints that can't be closed again or receive tasks
+CLOSED_SPRINT_STATUSES = (
+    SprintStatus.COMPLETED.value,
+    SprintStatus.CANCELLED.value,
+    SprintStatus.ARCHIVED.value,
+)
+
 
 class SprintService(BaseService[SprintRepository]):
     def __init__(self, db: AsyncSession = Depends(get_db)):
         sprint_repo = SprintRepository(db)
         super().__init__(db, sprint_repo)
         self.member_repo = ProjectMemberRepository(db)
-        self.sprint_history_repo = SprintHistoryRepository(db)
         self.project_repo = ProjectRepository(db)
+        self.burndown_repo = SprintBurndownRepository(db)
+        self.task_repo = TaskRepository(db)
+        self.history_repo = SprintHistoryRepository(db)
+
+    @staticmethod
+    def _snapshot(sprint: Sprint) -> dict:
+        """Tracked sprint fields as stored in history details."""
+        return {
+            "title": sprint.title,
+            "description": sprint.description,
+            "status": sprint.status,
+            "start_date": format_date_to_string(sprint.start_date),
+            "end_date": format_date_to_string(sprint.end_date),
+        }
 
     async def get_sprint_detail(self, sprint_id: int, user_id: int):
         sprint = await self.get_by_id_or_404(
@@ -41,6 +83,60 @@ class SprintService(BaseService[SprintRepository]):
 
         return sprint
 
+    async def get_sprint_history(
+        self,
+        sprint_id: int,
+        user_id: int,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        changed_by: Optional[int] = None,
+        action: Optional[str] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        full: bool = False,
+    ) -> CursorPage[HistoryRead]:
+        """
+        Keyset paginated history of a sprint, newest first. 'full' returns
+        complete before/after snapshots instead of the changed fields.
+        """
+        sprint = await self.get_sprint_detail(sprint_id=sprint_id, user_id=user_id)
+
+        return await self.history_page(
+            self.history_repo,
+            sprint_id,
+            page_size=page_size,
+            cursor=cursor,
+            changed_by=changed_by,
+            action=action,
+            changed_from=changed_from,
+            changed_to=changed_to,
+            current=self._snapshot(sprint) if full else None,
+        )
+
+    async def overlap_guard(
+        self,
+        project_id: int,
+        values: dict,
+        sprint_id: Optional[int] = None,
+    ) -> None:
+        """
+        An active sprint overlapping another active one of its project is a
+        409, for projects with reject_sprint_overlaps on.
+        """
+        if values["status"] != SprintStatus.ACTIVE.value:
+            return
+
+        if await self.repository.rejects_active_overlap(
+            project_id,
+            values["start_date"],
+            values["end_date"],
+            exclude_id=sprint_id,
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Sprint dates overlap another active sprint of the project",
+            )
+
     async def get_project_sprints(
         self,
         project_id: int,
@@ -48,8 +144,11 @@ class SprintService(BaseService[SprintRepository]):
         page_size: int = 20,
         status: Optional[str] = None,
         search: Optional[str] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        active_on: Optional[date] = None,
+        overlaps_from: Optional[date] = None,
+        overlaps_to: Optional[date] = None,
         sort_by: str = "created_at",
         order: str = "asc",
         user_id: int = None,
@@ -73,6 +172,9 @@ class SprintService(BaseService[SprintRepository]):
             search=search,
             start_date=start_date,
             end_date=end_date,
+            active_on=active_on,
+            overlaps_from=overlaps_from,
+            overlaps_to=overlaps_to,
             sort_by=sort_by,
             order=order,
         )
@@ -103,24 +205,31 @@ class SprintService(BaseService[SprintRepository]):
 
         sprint_data = data.model_dump()
         sprint_data["project_id"] = project_id
+        await self.overlap_guard(project_id, sprint_data)
 
         sprint = self.repository.create(**sprint_data)
-
         await self.db.flush()
 
-        self.sprint_history_repo.create(
-            sprint_id=sprint.id,
+        self.history.record(
+            entity=EntityEnum.SPRINT,
+            entity_id=sprint.id,
             changed_by=user_id,
-            action=HistoryAction.CREATE.value,
+            action=HistoryAction.CREATE,
             details=None,
         )
 
         await self.commit_or_rollback()
-        return await self.refresh(sprint)
+        return sprint
 
-    async def update_sprint(self, sprint_id: int, data: SprintUpdate, user_id: int):
+    async def update_sprint(
+        self,
+        sprint_id: int,
+        data: SprintUpdate,
+        user_id: int,
+        expected_version: Optional[int] = None,
+    ):
         sprint = await self.get_by_id_or_404(
-            entity_id=sprint_id, for_update=True, entity_name=EntityEnum.SPRINT.value
+            entity_id=sprint_id, entity_name=EntityEnum.SPRINT.value
         )
 
         await self.member_repo.check_permissions(
@@ -129,39 +238,47 @@ class SprintService(BaseService[SprintRepository]):
             required_roles=[UserRole.OWNER.value, UserRole.MAINTAINER.value],
         )
 
+        self.check_version(sprint, expected_version, EntityEnum.SPRINT.value)
+
         update_data = data.model_dump(exclude_unset=True)
 
-        before = {
-            "title": sprint.title,
-            "description": sprint.description,
-            "status": sprint.status,
-            "start_date": format_date_to_string(sprint.start_date),
-            "end_date": format_date_to_string(sprint.end_date),
-        }
+        start_date = update_data.get("start_date") or sprint.start_date
+        end_date = update_data.get("end_date") or sprint.end_date
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must not be before start_date",
+            )
 
-        sprint = await self.repository.update(sprint, update_data)
+        await self.overlap_guard(
+            sprint.project_id,
+            {
+                "status": update_data.get("status", sprint.status),
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+            sprint_id=sprint.id,
+        )
 
-        after = {
-            "title": sprint.title,
-            "description": sprint.description,
-            "status": sprint.status,
-            "start_date": format_date_to_string(sprint.start_date),
-            "end_date": format_date_to_string(sprint.end_date),
-        }
+        before = self._snapshot(sprint)
 
-        self.sprint_history_repo.create(
-            sprint_id=sprint.id,
+        async with self.versioned_write(EntityEnum.SPRINT.value):
+            sprint = await self.repository.update(sprint, update_data)
+
+        self.history.record(
+            entity=EntityEnum.SPRINT,
+            entity_id=sprint.id,
             changed_by=user_id,
-            action=HistoryAction.UPDATE.value,
-            details={"before": before, "after": after},
+            action=HistoryAction.UPDATE,
+            details=diff_snapshots(before, self._snapshot(sprint)),
         )
 
         await self.commit_or_rollback()
-        return await self.refresh(sprint)
+        return sprint
 
     async def delete_sprint(self, sprint_id: int, user_id: int):
         sprint = await self.get_by_id_or_404(
-            entity_id=sprint_id, for_update=True, entity_name=EntityEnum.SPRINT.value
+            entity_id=sprint_id, entity_name=EntityEnum.SPRINT.value
         )
 
         await self.member_repo.check_permissions(
@@ -170,12 +287,171 @@ class SprintService(BaseService[SprintRepository]):
             required_roles=[UserRole.OWNER.value, UserRole.MAINTAINER.value],
         )
 
-        self.sprint_history_repo.create(
-            sprint_id=sprint.id,
+        self.history.record(
+            entity=EntityEnum.SPRINT,
+            entity_id=sprint.id,
             changed_by=user_id,
-            action=HistoryAction.DELETE.value,
+            action=HistoryAction.DELETE,
             details=None,
         )
 
-        await self.repository.delete_sprint(sprint)
+        async with self.versioned_write(EntityEnum.SPRINT.value):
+            await self.repository.delete_sprint(sprint)
+
+        # Archive the sprint's tasks with one set-based UPDATE
+        await self.task_repo.archive_tasks(
+            project_id=sprint.project_id,
+            changed_by=user_id,
+            conditions=[Task.sprint_id == sprint.id],
+        )
         await self.commit_or_rollback()
+        workload_cache.invalidate(sprint.project_id)
+
+    async def get_sprint_burndown(
+        self, sprint_id: int, user_id: int
+    ) -> SprintBurndownRead:
+        """
+        Daily remaining/completed task counts (total and per priority) from the
+        sprint start to its end or today, from the precomputed deltas.
+        """
+        sprint = await self.get_by_id_or_404(
+            entity_id=sprint_id, entity_name=EntityEnum.SPRINT.value
+        )
+
+        await self.member_repo.check_permissions(
+            project_id=sprint.project_id,
+            user_id=user_id,
+            required_roles=[
+                UserRole.OWNER.value,
+                UserRole.MAINTAINER.value,
+                UserRole.MEMBER.value,
+                UserRole.VIEWER.value,
+            ],
+        )
+
+        rows = await self.burndown_repo.get_series(sprint_id)
+        last_day = max(sprint.start_date, min(sprint.end_date, date.today()))
+
+        return SprintBurndownRead(
+            sprint_id=sprint.id,
+            start_date=sprint.start_date,
+            end_date=sprint.end_date,
+            days=self._fill_burndown_days(rows, sprint.start_date, last_day),
+        )
+
+    @staticmethod
+    def _fill_burndown_days(rows, first_day: date, last_day: date):
+        """
+        One point per day: counts carry over days without changes and changes
+        made before the sprint started are part of the first day.
+        """
+        current = {}
+        days = []
+        index = 0
+        day = first_day
+        while day <= last_day:
+            while index < len(rows) and rows[index].day <= day:
+                row = rows[index]
+                current[row.priority] = (row.remaining, row.completed)
+                index += 1
+
+            by_priority = [
+                BurndownPriority(
+                    priority=priority, remaining=remaining, completed=completed
+                )
+                for priority, (remaining, completed) in sorted(current.items())
+            ]
+            days.append(
+                BurndownDay(
+                    day=day,
+                    remaining=sum(item.remaining for item in by_priority),
+                    completed=sum(item.completed for item in by_priority),
+                    by_priority=by_priority,
+                )
+            )
+            day += timedelta(days=1)
+        return days
+
+    async def close_sprint(
+        self,
+        sprint_id: int,
+        data: SprintClose,
+        user_id: int,
+        expected_version: Optional[int] = None,
+    ) -> SprintCloseResult:
+        """
+        Complete a sprint and move its unfinished tasks to 'target_sprint_id'
+        (or the backlog) in one transaction: a single UPDATE moves the tasks
+        and writes their history rows and burndown deltas.
+        """
+        sprint = await self.get_by_id_or_404(
+            entity_id=sprint_id, entity_name=EntityEnum.SPRINT.value
+        )
+
+        await self.member_repo.check_permissions(
+            project_id=sprint.project_id,
+            user_id=user_id,
+            required_roles=[UserRole.OWNER.value, UserRole.MAINTAINER.value],
+        )
+
+        self.check_version(sprint, expected_version, EntityEnum.SPRINT.value)
+
+        if sprint.status in CLOSED_SPRINT_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Sprint is already closed",
+            )
+
+        target_sprint_id = data.target_sprint_id
+        if target_sprint_id is not None:
+            target = None
+            if target_sprint_id != sprint.id:
+                target = await self.repository.get_sprint_by_id_and_project_id(
+                    sprint_id=target_sprint_id, project_id=sprint.project_id
+                )
+            if not target or target.status in CLOSED_SPRINT_STATUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Target sprint must be another open sprint of the project",
+                )
+
+        previous_status = sprint.status
+
+        # Bump the sprint version first: a concurrent close fails before
+        # any task is touched
+        async with self.versioned_write(EntityEnum.SPRINT.value):
+            sprint = await self.repository.update(
+                sprint, {"status": SprintStatus.COMPLETED.value}
+            )
+
+        task_ids = await self.task_repo.bulk_update(
+            project_id=sprint.project_id,
+            values={"sprint_id": target_sprint_id},
+            changed_by=user_id,
+            action=HistoryAction.UPDATE.value,
+            conditions=[
+                Task.sprint_id == sprint.id,
+                Task.status != TaskStatus.DONE.value,
+            ],
+            # The closed sprint's burndown keeps the unfinished tasks
+            keep_burndown_of=sprint.id,
+        )
+
+        self.history.record(
+            entity=EntityEnum.SPRINT,
+            entity_id=sprint.id,
+            changed_by=user_id,
+            action=HistoryAction.UPDATE,
+            details=diff_snapshots(
+                {"status": previous_status}, {"status": sprint.status}
+            ),
+        )
+
+        await self.commit_or_rollback()
+        workload_cache.invalidate(sprint.project_id)
+
+        return SprintCloseResult(
+            sprint=SprintRead.model_validate(sprint),
+            target_sprint_id=target_sprint_id,
+            moved=len(task_ids),
+        )
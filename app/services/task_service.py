@@ -1,19 +1,77 @@
-from typing import Optional
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional, Union
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
-from app.core.enums import EntityEnum, HistoryAction, UserRole
-from app.core.helpers import format_date_to_string, get_total_pages
+from app.core.cache import workload_cache
+from app.core.enums import EntityEnum, HistoryAction, TaskStatus, UserRole
+from app.core.helpers import (
+    decode_cursor,
+    diff_snapshots,
+    encode_cursor,
+    format_date_to_string,
+    get_total_pages,
+    hash_request,
+)
+from app.models.task import TASK_PARENT_CYCLE_CONSTRAINT, Task
 from app.repositories.project_member_repository import ProjectMemberRepository
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.project_stats_repository import (
+    STATS_FIELDS,
+    ProjectStatsRepository,
+)
+from app.repositories.sprint_burndown_repository import (
+    BURNDOWN_FIELDS,
+    SprintBurndownRepository,
+)
 from app.repositories.sprint_repository import SprintRepository
-from app.repositories.task_history_repository import TaskHistoryRepository
-from app.repositories.task_repository import TaskRepository
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.repositories.task_history_repository import (
+    ANY_VALUE,
+    TaskHistoryRepository,
+)
+from app.repositories.task_repository import TASK_HISTORY_FIELDS, TaskRepository
+from app.schemas.history import HistoryRead
+from app.schemas.pagination import CursorPage, PaginatedResponse
+from app.schemas.task import (
+    SprintBoard,
+    TaskBoardColumn,
+    TaskBulkCreateResult,
+    TaskBulkError,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskCreate,
+    TaskRead,
+    TaskTreeNode,
+    TaskUpdate,
+)
 from app.services.base_service import BaseService
+from app.services.history_pipeline import HistoryEvent
+
+# Task fields tracked by the burndown and project stats counters
+COUNTER_FIELDS = tuple(dict.fromkeys([*BURNDOWN_FIELDS, *STATS_FIELDS]))
+
+READ_ROLES = [
+    UserRole.OWNER.value,
+    UserRole.MAINTAINER.value,
+    UserRole.MEMBER.value,
+    UserRole.VIEWER.value,
+]
+WRITE_ROLES = [
+    UserRole.OWNER.value,
+    UserRole.MAINTAINER.value,
+    UserRole.MEMBER.value,
+]
+
+# Board columns, in workflow order (achieved tasks are deleted ones)
+BOARD_STATUSES = [
+    status.value for status in TaskStatus if status != TaskStatus.ACHIEVED
+]
 
 
 class TaskService(BaseService[TaskRepository]):
@@ -21,32 +79,119 @@ class TaskService(BaseService[TaskRepository]):
         task_repo = TaskRepository(db)
         super().__init__(db, task_repo)
         self.member_repo = ProjectMemberRepository(db)
-        self.task_history_repo = TaskHistoryRepository(db)
         self.project_repo = ProjectRepository(db)
         self.sprint_repo = SprintRepository(db)
+        self.burndown_repo = SprintBurndownRepository(db)
+        self.stats_repo = ProjectStatsRepository(db)
+        self.history_repo = TaskHistoryRepository(db)
 
-    async def _validate_assigned_user(self, project_id: int, assigned_to: int | None):
-        """Ensure assigned user is a project member."""
-        if assigned_to is None:
-            return
-
-        is_member = await self.member_repo.get_member_project(project_id, assigned_to)
-        if not is_member:
+    def _check_assignment(
+        self, assignee_ok: bool, sprint_ok: bool, parent_ok: bool = True
+    ):
+        """
+        Ensure assigned user is a project member and sprint and parent task
+        belong to it.
+        """
+        if not assignee_ok:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot assign task to user who is not a project member",
             )
 
-    async def _validate_assigned_sprint(self, project_id: int, sprint_id: int):
-        """Ensure assigned sprint belongs to the project."""
-        sprint = await self.sprint_repo.get_sprint_by_id_and_project_id(
-            sprint_id, project_id
+        if not sprint_ok:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Assigned sprint does not belong to the project",
+            )
+
+        if not parent_ok:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent task does not belong to the project or is a subtask",
+            )
+
+    def _check_create_context(self, context):
+        """Validate the row returned by TaskRepository.get_create_context."""
+        self.member_repo.ensure_role(context.role, WRITE_ROLES)
+
+        if not context.project_ok:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found or has been deleted",
+            )
+
+        self._check_assignment(
+            context.assignee_ok, context.sprint_ok, context.parent_ok
+        )
+
+    @staticmethod
+    def _snapshot(task: Task) -> dict:
+        """Tracked task fields as stored in history details."""
+        return {
+            field: format_date_to_string(getattr(task, field))
+            for field in TASK_HISTORY_FIELDS
+        }
+
+    @staticmethod
+    def _counter_state(task) -> dict:
+        """
+        Fields that place a task in sprint burndown buckets and project stats,
+        from a Task or a dict of task values. Enum members are kept by value.
+        """
+        if isinstance(task, Task):
+            task = {field: getattr(task, field) for field in COUNTER_FIELDS}
+        return {
+            field: task[field].value if isinstance(task[field], Enum) else task[field]
+            for field in COUNTER_FIELDS
+        }
+
+    async def _record_counters(self, changes) -> None:
+        """Apply (before, after) task changes to the burndown and project stats."""
+        await self.burndown_repo.record_changes(changes)
+        await self.stats_repo.record_changes(changes)
+
+    async def _get_for_write(
+        self,
+        task_id: int,
+        user_id: int,
+        assigned_to: int | None = None,
+        sprint_id: int | None = None,
+        parent_id: int | None = None,
+    ):
+        """
+        Load a live task and validate the write in a single query: the task must
+        exist, the user must have a write role, and the new assignee/sprint/
+        parent (if any) must belong to the task's project.
+        """
+        row = await self.repository.get_for_write(
+            task_id=task_id,
+            user_id=user_id,
+            assigned_to=assigned_to,
+            sprint_id=sprint_id,
+            parent_id=parent_id,
         )
 
-        if not sprint:
+        task = self.ensure_exists(
+            row.Task if row else None, entity_name=EntityEnum.TASK.value
+        )
+        self.member_repo.ensure_role(row.role, WRITE_ROLES)
+        self._check_assignment(row.assignee_ok, row.sprint_ok, row.parent_ok)
+
+        return task
+
+    @asynccontextmanager
+    async def parent_guard(self):
+        """Moving tasks under their own subtasks (rejected by trigger) is a 400."""
+        try:
+            yield
+        except IntegrityError as e:
+            if TASK_PARENT_CYCLE_CONSTRAINT not in str(e.orig):
+                raise
+            await self.db.rollback()
+            self.history.discard()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Assigned sprint does not belong to the project",
+                detail="A task can't be moved under one of its own subtasks",
             )
 
     async def get_task_detail(self, task_id: int, user_id: int):
@@ -68,6 +213,92 @@ class TaskService(BaseService[TaskRepository]):
 
         return task
 
+    async def get_task_tree(
+        self, task_id: int, user_id: int, max_depth: int = 5
+    ) -> TaskTreeNode:
+        """
+        A task with its nested subtasks down to 'max_depth' levels, fetched
+        with one recursive query, with done/total subtask counts per node.
+        """
+        await self.get_task_detail(task_id=task_id, user_id=user_id)
+
+        rows = await self.repository.get_task_tree(task_id, max_depth)
+        self.ensure_exists(rows, EntityEnum.TASK.value)
+
+        # Rows come ordered by depth, so every parent is built before its children
+        nodes = {}
+        for task, depth, subtasks_total, subtasks_done, truncated in rows:
+            node = TaskTreeNode(
+                **TaskRead.model_validate(task).model_dump(),
+                depth=depth,
+                subtasks_total=subtasks_total,
+                subtasks_done=subtasks_done,
+                truncated=truncated,
+            )
+            nodes[task.id] = node
+            if depth > 0:
+                nodes[task.parent_id].children.append(node)
+
+        return nodes[task_id]
+
+    async def get_task_history(
+        self,
+        task_id: int,
+        user_id: int,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        changed_by: Optional[int] = None,
+        action: Optional[str] = None,
+        changed_from: Optional[datetime] = None,
+        changed_to: Optional[datetime] = None,
+        field: Optional[str] = None,
+        to: Optional[str] = None,
+        full: bool = False,
+    ) -> CursorPage[HistoryRead]:
+        """
+        Keyset paginated history of a task, newest first. 'field' keeps the
+        changes of one tracked field, 'to' only those to that new value (a
+        JSON value such as 3 or null, anything else is taken as a string).
+        'full' returns complete before/after snapshots instead of the changed
+        fields.
+        """
+        task = await self.get_task_detail(task_id=task_id, user_id=user_id)
+
+        conditions = []
+        if field is not None:
+            if field not in TASK_HISTORY_FIELDS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Unknown history field",
+                )
+            conditions.append(
+                self.history_repo.field_changed(
+                    field,
+                    self._parse_history_value(to) if to is not None else ANY_VALUE,
+                )
+            )
+
+        return await self.history_page(
+            self.history_repo,
+            task_id,
+            page_size=page_size,
+            cursor=cursor,
+            changed_by=changed_by,
+            action=action,
+            changed_from=changed_from,
+            changed_to=changed_to,
+            conditions=conditions,
+            current=self._snapshot(task) if full else None,
+        )
+
+    @staticmethod
+    def _parse_history_value(value: str):
+        """'3' -> 3, 'null' -> None, 'done' -> 'done' (as stored in details)."""
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
     async def get_project_tasks(
         self,
         project_id: int,
@@ -81,16 +312,16 @@ class TaskService(BaseService[TaskRepository]):
         search: Optional[str] = None,
         sort_by: str = "created_at",
         order: str = "asc",
+        parent_of: Optional[int] = None,
     ):
-        """Get paginated, filtered, and sorted tasks."""
+        """
+        Get paginated, filtered, and sorted tasks.
+        'parent_of' keeps only the subtasks (at any depth) of that task.
+        """
         await self.member_repo.check_permissions(
             project_id=project_id,
             user_id=user_id,
-            required_roles=[
-                UserRole.OWNER.value,
-                UserRole.MAINTAINER.value,
-                UserRole.MEMBER.value,
-            ],
+            required_roles=READ_ROLES,
         )
 
         items, total = await self.repository.get_project_tasks(
@@ -105,6 +336,7 @@ class TaskService(BaseService[TaskRepository]):
             search=search,
             sort_by=sort_by,
             order=order,
+            parent_of=parent_of,
         )
 
         total_pages = get_total_pages(total, page_size)
@@ -117,124 +349,408 @@ class TaskService(BaseService[TaskRepository]):
             total_pages=total_pages,
         )
 
-    async def create_task(self, project_id: int, data: TaskCreate, user_id: int):
-        """Create a new task."""
-        await self.member_repo.check_permissions(
-            project_id=project_id,
+    async def get_sprint_tasks(
+        self,
+        sprint_id: int,
+        user_id: int,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[int] = None,
+        assigned_to: Optional[int] = None,
+        search: Optional[str] = None,
+        sort_by: str = "created_at",
+        order: str = "asc",
+    ) -> Union[PaginatedResponse[TaskRead], CursorPage[TaskRead]]:
+        """
+        Live tasks of a sprint, offset paginated and sorted by 'sort_by', or
+        keyset paginated by creation time when a 'cursor' is given (empty for
+        the first page). The sprint's project and the user's role are
+        resolved in one query.
+        """
+        access = await self.sprint_repo.get_access(sprint_id, user_id)
+        self.ensure_exists(
+            access.project_id if access else None, EntityEnum.SPRINT.value
+        )
+        self.member_repo.ensure_role(access.role, READ_ROLES)
+
+        if cursor is None:
+            items, total = await self.repository.get_project_tasks(
+                project_id=access.project_id,
+                user_id=user_id,
+                page=page,
+                page_size=page_size,
+                status=status,
+                priority=priority,
+                assigned_to=assigned_to,
+                sprint_id=sprint_id,
+                search=search,
+                sort_by=sort_by,
+                order=order,
+            )
+            return PaginatedResponse(
+                items=items,
+                total=total,
+                page=page,
+                page_size=page_size,
+                total_pages=get_total_pages(total, page_size),
+            )
+
+        # One extra row tells whether there is a next page
+        tasks = await self.repository.get_sprint_tasks(
+            sprint_id=sprint_id,
+            limit=page_size + 1,
+            after=self._decode_task_cursor(cursor) if cursor else None,
+            order=order,
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to,
+            search=search,
+        )
+
+        next_cursor = None
+        if len(tasks) > page_size:
+            tasks = tasks[:page_size]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+
+        return CursorPage(items=tasks, page_size=page_size, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_task_cursor(cursor: str) -> tuple:
+        """(created_at, id) key of a sprint task listing cursor, 400 if malformed."""
+        try:
+            created_at, task_id = decode_cursor(cursor)
+            return datetime.fromisoformat(created_at), int(task_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    async def get_my_tasks(
+        self,
+        user_id: int,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[int] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None,
+    ) -> CursorPage[TaskRead]:
+        """
+        Keyset paginated live tasks assigned to the user across the projects
+        they are a member of, soonest due first (no due date last).
+        """
+        tasks = await self.repository.get_assigned_tasks(
             user_id=user_id,
-            required_roles=[
-                UserRole.OWNER.value,
-                UserRole.MAINTAINER.value,
-                UserRole.MEMBER.value,
-            ],
+            limit=page_size + 1,
+            after=self._decode_due_cursor(cursor) if cursor else None,
+            status=status,
+            priority=priority,
+            due_from=due_from,
+            due_to=due_to,
         )
 
-        project = await self.project_repo.get_by_id(id=project_id)
-        if not project or getattr(project, "deleted_at", None) is not None:
+        next_cursor = None
+        if len(tasks) > page_size:
+            tasks = tasks[:page_size]
+            next_cursor = encode_cursor(tasks[-1].due_date, tasks[-1].id)
+
+        return CursorPage(items=tasks, page_size=page_size, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_due_cursor(cursor: str) -> tuple:
+        """(due_date or None, id) key of a "my tasks" cursor, 400 if malformed."""
+        try:
+            due_date, task_id = decode_cursor(cursor)
+            return (
+                datetime.fromisoformat(due_date) if due_date is not None else None,
+                int(task_id),
+            )
+        except (ValueError, TypeError):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found or has been deleted",
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+
+    async def get_sprint_board(
+        self, sprint_id: int, user_id: int, per_status: int = 20
+    ) -> SprintBoard:
+        """
+        Sprint tasks grouped by status: the top 'per_status' tasks of every
+        column and the column totals, with one access check and one query.
+        """
+        access = await self.sprint_repo.get_access(sprint_id, user_id)
+        self.ensure_exists(
+            access.project_id if access else None, EntityEnum.SPRINT.value
+        )
+        self.member_repo.ensure_role(access.role, READ_ROLES)
+
+        rows = await self.repository.get_sprint_board(sprint_id, per_status)
+
+        columns = {
+            status: TaskBoardColumn(status=status, total=0, tasks=[])
+            for status in BOARD_STATUSES
+        }
+        for task, status_total in rows:
+            column = columns.setdefault(
+                task.status, TaskBoardColumn(status=task.status, total=0, tasks=[])
+            )
+            column.total = status_total
+            column.tasks.append(TaskRead.model_validate(task))
+
+        return SprintBoard(sprint_id=sprint_id, columns=list(columns.values()))
+
+    async def create_task(
+        self,
+        project_id: int,
+        data: TaskCreate,
+        user_id: int,
+        idempotency_key: Optional[str] = None,
+    ):
+        """
+        Create a new task.
+        With an 'idempotency_key' a retried request returns the stored task
+        instead of creating a duplicate.
+        """
+        if idempotency_key:
+            request_hash = hash_request(
+                f"create_task:{project_id}", data.model_dump(mode="json")
+            )
+            replay = await self.replay_idempotent(
+                user_id, idempotency_key, request_hash
             )
+            if replay is not None:
+                return TaskRead.model_validate(replay)
 
-        if data.assigned_to:
-            await self._validate_assigned_user(project_id, data.assigned_to)
+        context = await self.repository.get_create_context(
+            project_id=project_id,
+            user_id=user_id,
+            assigned_to=data.assigned_to,
+            sprint_id=data.sprint_id,
+            parent_id=data.parent_id,
+        )
 
-        if data.sprint_id:
-            await self._validate_assigned_sprint(project_id, data.sprint_id)
+        self._check_create_context(context)
 
         task_data = data.model_dump()
         task_data["project_id"] = project_id
 
-        task = self.repository.create(**task_data)
-
-        await self.db.flush()
+        # INSERT ... RETURNING id and server defaults, counters in the same statement
+        task = await self.repository.create_task(
+            task_data, self._counter_state(task_data)
+        )
 
-        self.task_history_repo.create(
-            task_id=task.id,
+        self.history.record(
+            entity=EntityEnum.TASK,
+            entity_id=task.id,
             changed_by=user_id,
-            action=HistoryAction.CREATE.value,
+            action=HistoryAction.CREATE,
             details=None,
         )
 
+        if idempotency_key:
+            await self.remember_idempotent(
+                user_id,
+                idempotency_key,
+                request_hash,
+                TaskRead.model_validate(task).model_dump(mode="json"),
+            )
+
         await self.commit_or_rollback()
-        return await self.refresh(task)
+        workload_cache.invalidate(project_id)
+        return task
 
-    async def update_task(self, task_id: int, data: TaskUpdate, user_id: int):
-        """Update an existing task."""
-        task = await self.get_by_id_or_404(
-            entity_id=task_id, for_update=True, entity_name=EntityEnum.TASK.value
+    async def create_tasks_bulk(
+        self, project_id: int, items: List[TaskCreate], user_id: int
+    ) -> TaskBulkCreateResult:
+        """
+        Create many tasks in one transaction.
+        Assignees, sprints and parent tasks are validated with one query each,
+        valid items are inserted with a single multi-row INSERT and invalid ones
+        are reported back by their index in the request.
+        """
+        context = await self.repository.get_create_context(
+            project_id=project_id, user_id=user_id
         )
+        self._check_create_context(context)
 
-        await self.member_repo.check_permissions(
-            project_id=task.project_id,
-            user_id=user_id,
-            required_roles=[
-                UserRole.OWNER.value,
-                UserRole.MAINTAINER.value,
-                UserRole.MEMBER.value,
-            ],
+        member_ids = await self.member_repo.get_member_user_ids(
+            project_id, {item.assigned_to for item in items if item.assigned_to}
+        )
+        sprint_ids = await self.sprint_repo.get_project_sprint_ids(
+            project_id, {item.sprint_id for item in items if item.sprint_id}
+        )
+        parent_ids = await self.repository.get_project_task_ids(
+            project_id, {item.parent_id for item in items if item.parent_id}
         )
 
+        rows = []
+        errors = []
+        for index, item in enumerate(items):
+            if item.assigned_to and item.assigned_to not in member_ids:
+                errors.append(
+                    TaskBulkError(
+                        index=index,
+                        detail="Cannot assign task to user who is not a project member",
+                    )
+                )
+                continue
+
+            if item.sprint_id and item.sprint_id not in sprint_ids:
+                errors.append(
+                    TaskBulkError(
+                        index=index,
+                        detail="Assigned sprint does not belong to the project",
+                    )
+                )
+                continue
+
+            if item.parent_id and item.parent_id not in parent_ids:
+                errors.append(
+                    TaskBulkError(
+                        index=index,
+                        detail="Parent task does not belong to the project",
+                    )
+                )
+                continue
+
+            task_data = item.model_dump()
+            task_data["project_id"] = project_id
+            rows.append(task_data)
+
+        tasks = await self.repository.bulk_create(rows)
+
+        await self._record_counters(
+            [(None, self._counter_state(task)) for task in tasks]
+        )
+
+        await self.history.record_many(
+            [
+                HistoryEvent(
+                    entity_type=EntityEnum.TASK.value,
+                    entity_id=task.id,
+                    changed_by=user_id,
+                    action=HistoryAction.CREATE.value,
+                )
+                for task in tasks
+            ]
+        )
+
+        await self.commit_or_rollback()
+        workload_cache.invalidate(project_id)
+
+        return TaskBulkCreateResult(
+            created=[TaskRead.model_validate(task) for task in tasks],
+            errors=errors,
+        )
+
+    async def update_task(
+        self,
+        task_id: int,
+        data: TaskUpdate,
+        user_id: int,
+        expected_version: Optional[int] = None,
+    ):
+        """
+        Update an existing task.
+        'expected_version' comes from If-Match; a stale version is a 409.
+        """
         update_data = data.model_dump(exclude_unset=True)
 
-        if update_data.get("assigned_to") is not None:
-            await self._validate_assigned_user(
-                task.project_id, update_data["assigned_to"]
-            )
+        task = await self._get_for_write(
+            task_id=task_id,
+            user_id=user_id,
+            assigned_to=update_data.get("assigned_to"),
+            sprint_id=update_data.get("sprint_id"),
+            parent_id=update_data.get("parent_id"),
+        )
 
-        before = {
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "priority": task.priority,
-            "assigned_to": task.assigned_to,
-            "due_date": format_date_to_string(task.due_date),
-        }
+        self.check_version(task, expected_version, EntityEnum.TASK.value)
 
-        task = await self.repository.update(task, update_data)
+        before = self._snapshot(task)
+        counters_before = self._counter_state(task)
+        counters_after = self._counter_state({**counters_before, **update_data})
 
-        after = {
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "priority": task.priority,
-            "assigned_to": task.assigned_to,
-            "due_date": format_date_to_string(task.due_date),
-        }
+        async with self.versioned_write(EntityEnum.TASK.value), self.parent_guard():
+            task = await self.repository.update_task(
+                task, update_data, (counters_before, counters_after)
+            )
 
-        self.task_history_repo.create(
-            task_id=task.id,
+        self.history.record(
+            entity=EntityEnum.TASK,
+            entity_id=task.id,
             changed_by=user_id,
-            action=HistoryAction.UPDATE.value,
-            details={"before": before, "after": after},
+            action=HistoryAction.UPDATE,
+            details=diff_snapshots(before, self._snapshot(task)),
         )
 
         await self.commit_or_rollback()
-        return await self.refresh(task)
-
-    async def delete_task(self, task_id: int, user_id: int):
-        """Soft delete a task."""
+        workload_cache.invalidate(task.project_id)
+        return task
 
-        task = await self.get_by_id_or_404(
-            entity_id=task_id, for_update=True, entity_name=EntityEnum.TASK.value
-        )
+    async def update_tasks_bulk(
+        self, project_id: int, data: TaskBulkUpdate, user_id: int
+    ) -> TaskBulkUpdateResult:
+        """
+        Apply the same changes to many tasks of a project in one statement.
+        Tasks are selected by id list and/or filters; history rows are written
+        from the old and new values returned by the update.
+        """
+        update_data = data.changes.model_dump(exclude_unset=True)
+        if not update_data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields to update",
+            )
 
-        await self.member_repo.check_permissions(
-            project_id=task.project_id,
+        context = await self.repository.get_create_context(
+            project_id=project_id,
             user_id=user_id,
-            required_roles=[
-                UserRole.OWNER.value,
-                UserRole.MAINTAINER.value,
-                UserRole.MEMBER.value,
-            ],
+            assigned_to=update_data.get("assigned_to"),
+            sprint_id=update_data.get("sprint_id"),
+            parent_id=update_data.get("parent_id"),
         )
+        self._check_create_context(context)
+
+        conditions = []
+        if data.ids:
+            conditions.append(self.repository.ids_condition(data.ids))
+
+        if data.filters:
+            for field, value in data.filters.model_dump(exclude_none=True).items():
+                conditions.append(getattr(Task, field) == value)
+
+        async with self.parent_guard():
+            task_ids = await self.repository.bulk_update(
+                project_id=project_id,
+                values=update_data,
+                changed_by=user_id,
+                action=HistoryAction.UPDATE.value,
+                conditions=conditions,
+            )
+
+        await self.commit_or_rollback()
+        workload_cache.invalidate(project_id)
+
+        return TaskBulkUpdateResult(updated=len(task_ids), task_ids=task_ids)
+
+    async def delete_task(self, task_id: int, user_id: int):
+        """Soft delete a task."""
+        task = await self._get_for_write(task_id=task_id, user_id=user_id)
+        counters_before = self._counter_state(task)
+
+        async with self.versioned_write(EntityEnum.TASK.value):
+            task = await self.repository.delete_task(task, counters_before)
 
-        self.task_history_repo.create(
-            task_id=task.id,
+        # Keep the status the task had, so history can be replayed (burndown)
+        self.history.record(
+            entity=EntityEnum.TASK,
+            entity_id=task.id,
             changed_by=user_id,
-            action=HistoryAction.DELETE.value,
-            details=None,
+            action=HistoryAction.DELETE,
+            details=diff_snapshots(
+                {"status": counters_before["status"]}, {"status": task.status}
+            ),
         )
-
-        await self.repository.delete_task(task)
         await self.commit_or_rollback()
+        workload_cache.invalidate(task.project_id)
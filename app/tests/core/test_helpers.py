@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.helpers import (
+    decode_cursor,
+    diff_snapshots,
+    encode_cursor,
+    reconstruct_history,
+)
+
+
+def test_diff_snapshots_keeps_only_changed_fields():
+    """Unchanged fields (e.g. a long description) are not stored."""
+    before = {"title": "Task", "description": "long text", "status": "todo"}
+    after = {"title": "Task", "description": "long text", "status": "done"}
+
+    assert diff_snapshots(before, after) == {
+        "before": {"status": "todo"},
+        "after": {"status": "done"},
+    }
+
+
+def test_reconstruct_history_folds_diffs_back_from_current():
+    """Each view is the full entity before and after its change."""
+    current = {"title": "Task", "status": "done", "priority": 1}
+    entries = [
+        {"before": {"priority": 2}, "after": {"priority": 1}},
+        {"before": {"status": "todo"}, "after": {"status": "done"}},
+        None,
+    ]
+
+    assert reconstruct_history(current, entries) == [
+        {
+            "before": {"title": "Task", "status": "done", "priority": 2},
+            "after": {"title": "Task", "status": "done", "priority": 1},
+        },
+        {
+            "before": {"title": "Task", "status": "todo", "priority": 2},
+            "after": {"title": "Task", "status": "done", "priority": 2},
+        },
+        {
+            "before": None,
+            "after": {"title": "Task", "status": "todo", "priority": 2},
+        },
+    ]
+
+
+def test_cursor_round_trips():
+    """Cursors are opaque url-safe strings holding the keyset values."""
+    cursor = encode_cursor(datetime(2025, 12, 11, 8, 30), 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ["2025-12-11T08:30:00", 42]
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,19 @@
+from datetime import date
+
+from app.jobs.history_partitions import add_months, partition_month, partition_name
+
+
+def test_add_months_crosses_years():
+    """Month arithmetic wraps around year boundaries in both directions."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+
+def test_partition_name_round_trips():
+    """Only '<table>_YYYY_MM' partitions are managed, not the default one."""
+    name = partition_name("task_history", date(2025, 12, 1))
+
+    assert name == "task_history_2025_12"
+    assert partition_month("task_history", name) == date(2025, 12, 1)
+    assert partition_month("task_history", "task_history_default") is None
+    assert partition_month("task_history", "sprint_history_2025_12") is None
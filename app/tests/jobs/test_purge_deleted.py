@@ -0,0 +1,61 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.purge_deleted import START, purge_batch
+
+
+def rows_result(*rows):
+    result = MagicMock()
+    result.all.return_value = [SimpleNamespace(id=i, deleted_at=d) for i, d in rows]
+    return result
+
+
+@pytest.mark.parametrize("archive", [False, True])
+async def test_purge_batch_deletes_history_before_rows(archive):
+    """History rows go first (their FK has no cascade); the keyset moves on."""
+    db = AsyncMock(spec=AsyncSession)
+    deleted = MagicMock(rowcount=2)
+    db.execute.side_effect = [
+        rows_result((4, datetime(2025, 1, 1)), (9, datetime(2025, 1, 2))),
+        *([MagicMock()] if archive else []),
+        MagicMock(rowcount=7),
+        deleted,
+    ]
+
+    batch = await purge_batch(db, "sprints", START, 90, 500, archive)
+
+    assert batch == ((datetime(2025, 1, 2), 9), 2, 7)
+    statements = [str(call.args[0]) for call in db.execute.await_args_list]
+    assert "NOT EXISTS (SELECT 1 FROM tasks" in statements[0]
+    assert "SKIP LOCKED" in statements[0]
+    assert ("INSERT INTO purged_records" in statements[1]) is archive
+    assert statements[-2].startswith("DELETE FROM sprint_history")
+    assert statements[-1].startswith("DELETE FROM sprints")
+    assert db.execute.await_args.args[1] == {"ids": [4, 9]}
+
+
+async def test_purge_batch_stops_when_nothing_is_left():
+    """An empty batch ends the table without any DELETE."""
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = rows_result()
+
+    assert await purge_batch(db, "tasks", START, 90, 500, False) is None
+    db.execute.assert_awaited_once()
+
+
+async def test_purge_batch_keeps_parents_of_live_subtasks():
+    """Purging a parent would detach (SET NULL) its subtasks that are still live."""
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = rows_result()
+
+    await purge_batch(db, "tasks", START, 90, 500, False)
+
+    statement = str(db.execute.await_args.args[0])
+    assert (
+        "NOT EXISTS (SELECT 1 FROM tasks AS c "
+        "WHERE c.parent_id = e.id AND c.deleted_at IS NULL)"
+    ) in statement
@@ -0,0 +1,115 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from app.jobs.rebuild_burndown import replay_deltas, replay_task
+
+
+def make_entry(action, changed_at, details=None):
+    return SimpleNamespace(action=action, changed_at=changed_at, details=details)
+
+
+def make_task(task_id, sprint_id, status, created_at):
+    return SimpleNamespace(
+        id=task_id,
+        sprint_id=sprint_id,
+        status=status,
+        priority=1,
+        deleted_at=None,
+        created_at=created_at,
+    )
+
+
+def test_replay_task_undoes_diffs_newest_first():
+    """Each update is replayed from the state left by undoing the newer ones."""
+    task = SimpleNamespace(
+        sprint_id=2,
+        status="done",
+        priority=1,
+        deleted_at=None,
+        created_at=datetime(2025, 12, 1),
+    )
+    history = [
+        make_entry(
+            "update",
+            datetime(2025, 12, 3, 10),
+            {"before": {"status": "in_progress"}, "after": {"status": "done"}},
+        ),
+        make_entry(
+            "update",
+            datetime(2025, 12, 2, 10),
+            {"before": {"sprint_id": None, "title": "x"}, "after": {"sprint_id": 2}},
+        ),
+        make_entry("create", datetime(2025, 12, 1, 10), {"title": "x"}),
+    ]
+
+    changes = replay_task(task, history)
+
+    in_progress = {"sprint_id": 2, "status": "in_progress", "priority": 1}
+    assert changes == [
+        (date(2025, 12, 3), in_progress, {**in_progress, "status": "done"}),
+        (date(2025, 12, 2), {**in_progress, "sprint_id": None}, in_progress),
+        (date(2025, 12, 1), None, {**in_progress, "sprint_id": None}),
+    ]
+
+
+def test_replay_deleted_task_without_create_row():
+    """A delete restores the status it overwrote; created_at stands in for the create row."""
+    task = SimpleNamespace(
+        sprint_id=2,
+        status="achieved",
+        priority=1,
+        deleted_at=datetime(2025, 12, 5),
+        created_at=datetime(2025, 12, 1),
+    )
+    history = [
+        make_entry(
+            "delete",
+            datetime(2025, 12, 5),
+            {"before": {"status": "todo"}, "after": {"status": "achieved"}},
+        )
+    ]
+
+    changes = replay_task(task, history)
+
+    todo = {"sprint_id": 2, "status": "todo", "priority": 1}
+    assert changes == [(date(2025, 12, 5), todo, None), (date(2025, 12, 1), None, todo)]
+
+
+def test_replay_keeps_unfinished_tasks_in_a_closed_sprint():
+    """A rebuild agrees with the deltas close_sprint wrote incrementally."""
+    created = datetime(2025, 12, 1, 9)
+    closed_at = datetime(2025, 12, 3, 17)
+    move = {"before": {"sprint_id": 2}, "after": {"sprint_id": 3}}
+    # Unfinished: moved to sprint 3 by close_sprint
+    moved = make_task(1, 3, "todo", created)
+    # Done: stays in sprint 2, then moved by hand two days later
+    done = make_task(2, 3, "done", created)
+    history = {
+        1: [
+            make_entry("update", closed_at, move),
+            make_entry("create", created),
+        ],
+        2: [
+            make_entry("update", datetime(2025, 12, 5, 10), move),
+            make_entry("create", created),
+        ],
+    }
+
+    deltas = replay_deltas(
+        [moved, done], history, {2: {closed_at.date()}}, sprint_id=None
+    )
+
+    # Incremental writes: both created in sprint 2, close_sprint only adds the
+    # unfinished task to sprint 3, the later PATCH moves the done one
+    assert deltas == {
+        (2, date(2025, 12, 1), 1): (1, 1),
+        (3, date(2025, 12, 3), 1): (1, 0),
+        (2, date(2025, 12, 5), 1): (0, -1),
+        (3, date(2025, 12, 5), 1): (0, 1),
+    }
+    # Without the close event the move would take it out of sprint 2
+    assert replay_deltas([moved, done], history, {}, sprint_id=2) == {
+        (2, date(2025, 12, 1), 1): (1, 1),
+        (2, date(2025, 12, 3), 1): (-1, 0),
+        (2, date(2025, 12, 5), 1): (0, -1),
+    }
@@ -0,0 +1,58 @@
+def test_list_my_tasks_success(client, mock_task_service):
+    """Test listing the tasks assigned to the current user."""
+    mock_task_service.get_my_tasks.return_value = {
+        "items": [
+            {
+                "id": 7,
+                "title": "Task 7",
+                "status": "todo",
+                "priority": 1,
+                "project_id": 3,
+                "sprint_id": None,
+                "parent_id": None,
+                "assigned_to": 1,
+                "due_date": "2025-12-20T00:00:00",
+                "created_at": "2025-12-11T00:00:00",
+                "updated_at": "2025-12-11T00:00:00",
+            }
+        ],
+        "page_size": 20,
+        "next_cursor": "abc",
+    }
+
+    response = client.get("/api/me/tasks")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["assigned_to"] == 1
+    assert data["next_cursor"] == "abc"
+
+
+def test_list_my_tasks_with_filters(client, mock_task_service):
+    """Test filtering my tasks and paging with a cursor."""
+    mock_task_service.get_my_tasks.return_value = {
+        "items": [],
+        "page_size": 50,
+        "next_cursor": None,
+    }
+
+    response = client.get(
+        "/api/me/tasks?status=todo&priority=1&due_to=2025-12-31T00:00:00"
+        "&page_size=50&cursor=abc"
+    )
+
+    assert response.status_code == 200
+    call = mock_task_service.get_my_tasks.await_args.kwargs
+    assert call["user_id"] == 1
+    assert call["status"] == "todo"
+    assert call["priority"] == 1
+    assert call["due_to"].isoformat() == "2025-12-31T00:00:00"
+    assert call["cursor"] == "abc"
+    assert call["page_size"] == 50
+
+
+def test_list_my_tasks_invalid_page_size(client, mock_task_service):
+    """page_size is bounded."""
+    response = client.get("/api/me/tasks?page_size=500")
+
+    assert response.status_code == 422
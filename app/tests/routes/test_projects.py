@@ -1,5 +1,9 @@
+from datetime import date
+
 from fastapi import HTTPException
 
+from app.schemas.project import ArchiveJobQueued
+
 
 def test_create_project_success(client, mock_project_service):
     """Test successful project creation."""
@@ -29,6 +33,28 @@ def test_create_project_success(client, mock_project_service):
     mock_project_service.create_project.assert_awaited_once()
 
 
+def test_create_project_forwards_idempotency_key(client, mock_project_service):
+    """The Idempotency-Key header is handed to the service."""
+    mock_project_service.create_project.return_value = {
+        "id": 1,
+        "title": "New Project",
+        "status": "planned",
+        "managed_by": 1,
+        "created_at": "2025-12-11T00:00:00",
+        "updated_at": "2025-12-11T00:00:00",
+    }
+
+    response = client.post(
+        "/api/projects",
+        json={"title": "New Project"},
+        headers={"Idempotency-Key": "retry-1"},
+    )
+
+    assert response.status_code == 201
+    kwargs = mock_project_service.create_project.await_args.kwargs
+    assert kwargs["idempotency_key"] == "retry-1"
+
+
 def test_create_project_missing_title(client):
     """Test project creation with missing title."""
     payload = {
@@ -169,6 +195,49 @@ def test_list_projects_with_sorting(client, mock_project_service):
     mock_project_service.get_user_projects.assert_awaited_once()
 
 
+def test_list_projects_with_counts(client, mock_project_service):
+    """Test listing projects with their counts and active sprint."""
+    mock_project_service.get_user_projects.return_value = {
+        "items": [
+            {
+                "id": 1,
+                "title": "Backend API",
+                "status": "active",
+                "managed_by": 1,
+                "created_at": "2025-12-11T00:00:00",
+                "updated_at": "2025-12-11T00:00:00",
+                "counts": {
+                    "tasks_total": 12,
+                    "tasks_open": 5,
+                    "members": 3,
+                    "active_sprint_id": 7,
+                    "active_sprint_title": "Sprint 7",
+                },
+            }
+        ],
+        "total": 1,
+        "page": 1,
+        "page_size": 20,
+        "total_pages": 1,
+    }
+
+    response = client.get("/api/projects?include=counts")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["counts"]["tasks_open"] == 5
+    assert data["items"][0]["counts"]["active_sprint_id"] == 7
+    call = mock_project_service.get_user_projects.await_args.kwargs
+    assert call["include_counts"] is True
+
+
+def test_list_projects_invalid_include(client, mock_project_service):
+    """Test that only known includes are accepted."""
+    response = client.get("/api/projects?include=tasks")
+
+    assert response.status_code == 422
+
+
 def test_get_project_detail_success(client, mock_project_service):
     """Test getting project detail."""
     mock_project_service.get_project_detail.return_value = {
@@ -191,9 +260,11 @@ def test_get_project_detail_success(client, mock_project_service):
                 "updated_at": "2025-12-11T00:00:00",
             }
         ],
+        "sprints_total": 240,
+        "sprints_url": "/api/projects/1/sprints",
     }
 
-    response = client.get("/api/projects/1")
+    response = client.get("/api/projects/1?sprints_limit=1")
 
     assert response.status_code == 200
     data = response.json()
@@ -201,6 +272,10 @@ def test_get_project_detail_success(client, mock_project_service):
     assert data["title"] == "Test Project"
     assert "sprints" in data
     assert len(data["sprints"]) == 1
+    assert data["sprints_total"] == 240
+    mock_project_service.get_project_detail.assert_awaited_once_with(
+        1, 1, sprints_limit=1
+    )
 
 
 def test_get_project_not_found(client, mock_project_service):
@@ -225,6 +300,93 @@ def test_get_project_forbidden(client, mock_project_service):
     assert response.status_code == 403
 
 
+def test_get_project_stats_success(client, mock_project_service):
+    """Test getting the task counters of a project."""
+    mock_project_service.get_project_stats.return_value = {
+        "project_id": 1,
+        "total": 5,
+        "overdue": 1,
+        "by_status": {"todo": 3, "done": 2},
+        "by_priority": {"1": 2, "3": 3},
+        "by_assignee": [{"user_id": 2, "count": 4}, {"user_id": None, "count": 1}],
+    }
+
+    response = client.get("/api/projects/1/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert data["by_priority"] == {"1": 2, "3": 3}
+    mock_project_service.get_project_stats.assert_awaited_once_with(
+        project_id=1, user_id=1
+    )
+
+
+def test_get_project_workload_of_sprint(client, mock_project_service):
+    """Test getting the per-assignee workload of one sprint."""
+    mock_project_service.get_project_workload.return_value = {
+        "project_id": 1,
+        "sprint_id": 3,
+        "generated_at": "2025-12-11T00:00:00",
+        "assignees": [
+            {
+                "user_id": 2,
+                "open": 3,
+                "load": 20,
+                "by_status": {"todo": 1, "in_progress": 2, "done": 4},
+                "by_priority": {"1": 2, "4": 1},
+            }
+        ],
+    }
+
+    response = client.get("/api/projects/1/workload?sprint_id=3")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["assignees"][0]["load"] == 20
+    assert data["assignees"][0]["by_priority"] == {"1": 2, "4": 1}
+    mock_project_service.get_project_workload.assert_awaited_once_with(
+        project_id=1, user_id=1, sprint_id=3
+    )
+
+
+def test_list_project_history_success(client, mock_project_service):
+    """Test listing the history of a project with filters."""
+    mock_project_service.get_project_history.return_value = {
+        "items": [
+            {
+                "id": 42,
+                "changed_by": 2,
+                "changed_at": "2025-12-20T10:00:00",
+                "action": "update",
+                "details": {"before": {"title": "Old"}, "after": {"title": "New"}},
+            }
+        ],
+        "page_size": 1,
+        "next_cursor": "WyIyMDI1LTEyLTIwVDEwOjAwOjAwIiwgNDJd",
+    }
+
+    response = client.get(
+        "/api/projects/1/history?page_size=1&changed_by=2&action=update"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["details"]["after"] == {"title": "New"}
+    assert data["next_cursor"] is not None
+    mock_project_service.get_project_history.assert_awaited_once_with(
+        project_id=1,
+        user_id=1,
+        page_size=1,
+        cursor=None,
+        changed_by=2,
+        action="update",
+        changed_from=None,
+        changed_to=None,
+        full=False,
+    )
+
+
 def test_update_project_success(client, mock_project_service):
     """Test updating a project."""
     mock_project_service.update_project.return_value = {
@@ -288,6 +450,43 @@ def test_delete_project_success(client, mock_project_service):
     )
 
 
+def test_delete_large_project_queues_an_archive_job(client, mock_project_service):
+    """Projects archived in the background answer 202 with the job to follow."""
+    mock_project_service.delete_project.return_value = ArchiveJobQueued(
+        job_id=7, status_url="/api/projects/1/archive-jobs/7"
+    )
+
+    response = client.delete("/api/projects/1")
+
+    assert response.status_code == 202
+    assert response.json() == {
+        "job_id": 7,
+        "status_url": "/api/projects/1/archive-jobs/7",
+    }
+
+
+def test_get_archive_job(client, mock_project_service):
+    """Archive job progress of a deleted project."""
+    mock_project_service.get_archive_job.return_value = {
+        "id": 7,
+        "project_id": 1,
+        "status": "running",
+        "tasks_total": 50000,
+        "tasks_archived": 20000,
+        "created_at": "2025-12-11T00:00:00",
+        "updated_at": "2025-12-11T00:05:00",
+        "finished_at": None,
+    }
+
+    response = client.get("/api/projects/1/archive-jobs/7")
+
+    assert response.status_code == 200
+    assert response.json()["tasks_archived"] == 20000
+    mock_project_service.get_archive_job.assert_awaited_once_with(
+        project_id=1, job_id=7, user_id=1
+    )
+
+
 def test_delete_project_not_found(client, mock_project_service):
     """Test deleting non-existent project."""
     mock_project_service.delete_project.side_effect = HTTPException(
@@ -340,6 +539,31 @@ def test_list_project_sprints_success(client, mock_sprint_service):
     assert len(data["items"]) == 1
 
 
+def test_list_project_sprints_date_filters(client, mock_sprint_service):
+    """Date filters are parsed as dates before reaching the service."""
+    mock_sprint_service.get_project_sprints.return_value = {
+        "items": [],
+        "total": 0,
+        "page": 1,
+        "page_size": 20,
+        "total_pages": 0,
+    }
+
+    response = client.get(
+        "/api/projects/1/sprints?active_on=2025-12-05&overlaps_to=2025-12-31"
+    )
+
+    assert response.status_code == 200
+    call = mock_sprint_service.get_project_sprints.await_args.kwargs
+    assert call["active_on"] == date(2025, 12, 5)
+    assert call["overlaps_from"] is None
+    assert call["overlaps_to"] == date(2025, 12, 31)
+
+    response = client.get("/api/projects/1/sprints?active_on=yesterday")
+
+    assert response.status_code == 422
+
+
 def test_create_sprint_in_project_success(client, mock_sprint_service):
     """Test creating a sprint in a project."""
     mock_sprint_service.create_sprint.return_value = {
@@ -369,6 +593,20 @@ def test_create_sprint_in_project_success(client, mock_sprint_service):
     assert data["project_id"] == 1
 
 
+def test_create_sprint_ending_before_start(client, mock_sprint_service):
+    """A sprint can't end before it starts."""
+    payload = {
+        "title": "New Sprint",
+        "start_date": "2025-12-14",
+        "end_date": "2025-12-01",
+    }
+
+    response = client.post("/api/projects/1/sprints", json=payload)
+
+    assert response.status_code == 422
+    mock_sprint_service.create_sprint.assert_not_awaited()
+
+
 def test_list_project_tasks_success(client, mock_task_service):
     """Test listing tasks in a project."""
     mock_task_service.get_project_tasks.return_value = {
@@ -401,6 +639,23 @@ def test_list_project_tasks_success(client, mock_task_service):
     assert len(data["items"]) == 1
 
 
+def test_list_project_tasks_under_parent(client, mock_task_service):
+    """Test listing the subtasks of an epic."""
+    mock_task_service.get_project_tasks.return_value = {
+        "items": [],
+        "total": 0,
+        "page": 1,
+        "page_size": 20,
+        "total_pages": 0,
+    }
+
+    response = client.get("/api/projects/1/tasks?parent_of=40")
+
+    assert response.status_code == 200
+    call = mock_task_service.get_project_tasks.await_args.kwargs
+    assert call["parent_of"] == 40
+
+
 def test_create_task_in_project_success(client, mock_task_service):
     """Test creating a task in a project."""
     mock_task_service.create_task.return_value = {
@@ -432,3 +687,76 @@ def test_create_task_in_project_success(client, mock_task_service):
     data = response.json()
     assert data["title"] == "New Task"
     assert data["project_id"] == 1
+
+
+def test_create_tasks_bulk_success(client, mock_task_service):
+    """Test creating many tasks in one request."""
+    mock_task_service.create_tasks_bulk.return_value = {
+        "created": [
+            {
+                "id": 1,
+                "title": "Imported Task",
+                "status": "new",
+                "priority": 3,
+                "project_id": 1,
+                "sprint_id": None,
+                "assigned_to": None,
+                "parent_id": None,
+                "created_at": "2025-12-11T00:00:00",
+                "updated_at": "2025-12-11T00:00:00",
+            }
+        ],
+        "errors": [
+            {
+                "index": 1,
+                "detail": "Cannot assign task to user who is not a project member",
+            }
+        ],
+    }
+
+    payload = {
+        "items": [
+            {"title": "Imported Task"},
+            {"title": "Bad Assignee", "assigned_to": 999},
+        ]
+    }
+
+    response = client.post("/api/projects/1/tasks/bulk", json=payload)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created"]) == 1
+    assert data["errors"][0]["index"] == 1
+    mock_task_service.create_tasks_bulk.assert_awaited_once()
+
+
+def test_create_tasks_bulk_empty_items(client):
+    """Test bulk creation rejects an empty batch."""
+    response = client.post("/api/projects/1/tasks/bulk", json={"items": []})
+
+    assert response.status_code == 422
+
+
+def test_update_tasks_bulk_success(client, mock_task_service):
+    """Test moving many tasks to another sprint in one request."""
+    mock_task_service.update_tasks_bulk.return_value = {
+        "updated": 2,
+        "task_ids": [1, 2],
+    }
+
+    payload = {"filters": {"sprint_id": 1}, "changes": {"sprint_id": 2}}
+
+    response = client.patch("/api/projects/1/tasks/bulk", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+    mock_task_service.update_tasks_bulk.assert_awaited_once()
+
+
+def test_update_tasks_bulk_requires_selector(client):
+    """Test bulk update rejects a payload without ids or filters."""
+    payload = {"changes": {"status": "done"}}
+
+    response = client.patch("/api/projects/1/tasks/bulk", json=payload)
+
+    assert response.status_code == 422
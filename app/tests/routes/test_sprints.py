@@ -134,7 +134,7 @@ def test_delete_sprint_forbidden(client, mock_sprint_service):
 def test_list_sprint_tasks_success(client, mock_task_service):
     """Test listing tasks in a sprint."""
     # NOTE: conftest already overrode TaskService for us!
-    mock_task_service.get_project_tasks.return_value = {
+    mock_task_service.get_sprint_tasks.return_value = {
         "items": [
             {
                 "id": 1,
@@ -163,27 +163,57 @@ def test_list_sprint_tasks_success(client, mock_task_service):
     assert "items" in data
     assert len(data["items"]) == 1
     assert data["items"][0]["sprint_id"] == 1
+    assert data["total"] == 1
 
 
 def test_list_sprint_tasks_with_filters(client, mock_task_service):
     """Test listing sprint tasks with filters."""
-    mock_task_service.get_project_tasks.return_value = {
+    mock_task_service.get_sprint_tasks.return_value = {
         "items": [],
         "total": 0,
-        "page": 1,
+        "page": 2,
         "page_size": 20,
         "total_pages": 0,
     }
 
-    response = client.get("/api/sprints/1/tasks?status=done&priority=1")
+    response = client.get(
+        "/api/sprints/1/tasks?status=done&priority=1&page=2&sort_by=priority"
+    )
 
     assert response.status_code == 200
-    mock_task_service.get_project_tasks.assert_awaited_once()
+    mock_task_service.get_sprint_tasks.assert_awaited_once_with(
+        sprint_id=1,
+        user_id=1,
+        page=2,
+        page_size=20,
+        cursor=None,
+        status="done",
+        priority=1,
+        assigned_to=None,
+        search=None,
+        sort_by="priority",
+        order="desc",
+    )
+
+
+def test_list_sprint_tasks_with_cursor(client, mock_task_service):
+    """A cursor switches to keyset pages by creation time."""
+    mock_task_service.get_sprint_tasks.return_value = {
+        "items": [],
+        "page_size": 20,
+        "next_cursor": "def",
+    }
+
+    response = client.get("/api/sprints/1/tasks?cursor=abc")
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "page_size": 20, "next_cursor": "def"}
+    assert mock_task_service.get_sprint_tasks.await_args.kwargs["cursor"] == "abc"
 
 
 def test_list_sprint_tasks_with_search(client, mock_task_service):
     """Test searching tasks in a sprint."""
-    mock_task_service.get_project_tasks.return_value = {
+    mock_task_service.get_sprint_tasks.return_value = {
         "items": [
             {
                 "id": 1,
@@ -208,3 +238,141 @@ def test_list_sprint_tasks_with_search(client, mock_task_service):
     assert response.status_code == 200
     data = response.json()
     assert len(data["items"]) == 1
+
+
+def test_get_sprint_board_success(client, mock_task_service):
+    """Test getting the sprint board grouped by status."""
+    mock_task_service.get_sprint_board.return_value = {
+        "sprint_id": 1,
+        "columns": [
+            {
+                "status": "todo",
+                "total": 42,
+                "tasks": [
+                    {
+                        "id": 1,
+                        "title": "Task 1",
+                        "status": "todo",
+                        "priority": 1,
+                        "project_id": 1,
+                        "sprint_id": 1,
+                        "parent_id": None,
+                        "created_at": "2025-12-11T00:00:00",
+                        "updated_at": "2025-12-11T00:00:00",
+                    }
+                ],
+            },
+            {"status": "done", "total": 0, "tasks": []},
+        ],
+    }
+
+    response = client.get("/api/sprints/1/board?per_status=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["columns"][0]["total"] == 42
+    assert len(data["columns"][0]["tasks"]) == 1
+    mock_task_service.get_sprint_board.assert_awaited_once_with(
+        sprint_id=1, user_id=1, per_status=1
+    )
+
+
+def test_get_sprint_board_invalid_per_status(client, mock_task_service):
+    """per_status is bounded."""
+    response = client.get("/api/sprints/1/board?per_status=0")
+
+    assert response.status_code == 422
+
+
+def test_get_sprint_burndown_success(client, mock_sprint_service):
+    """Test getting the daily burndown series of a sprint."""
+    mock_sprint_service.get_sprint_burndown.return_value = {
+        "sprint_id": 1,
+        "start_date": "2025-12-01",
+        "end_date": "2025-12-14",
+        "days": [
+            {
+                "day": "2025-12-01",
+                "remaining": 3,
+                "completed": 1,
+                "by_priority": [{"priority": 1, "remaining": 3, "completed": 1}],
+            }
+        ],
+    }
+
+    response = client.get("/api/sprints/1/burndown")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["days"][0]["remaining"] == 3
+    mock_sprint_service.get_sprint_burndown.assert_awaited_once_with(
+        sprint_id=1, user_id=1
+    )
+
+
+def test_close_sprint_success(client, mock_sprint_service):
+    """Test closing a sprint and rolling its tasks over."""
+    mock_sprint_service.close_sprint.return_value = {
+        "sprint": {
+            "id": 1,
+            "title": "Sprint 1",
+            "status": "completed",
+            "project_id": 1,
+            "start_date": "2025-12-01",
+            "end_date": "2025-12-14",
+            "created_at": "2025-12-11T00:00:00",
+            "updated_at": "2025-12-11T00:00:00",
+            "version": 2,
+        },
+        "target_sprint_id": 2,
+        "moved": 120,
+    }
+
+    response = client.post(
+        "/api/sprints/1/close", json={"target_sprint_id": 2}, headers={"If-Match": "1"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["moved"] == 120
+    assert data["sprint"]["status"] == "completed"
+    call = mock_sprint_service.close_sprint.await_args.kwargs
+    assert call["data"].target_sprint_id == 2
+    assert call["expected_version"] == 1
+
+
+def test_list_sprint_history_success(client, mock_sprint_service):
+    """Test listing the history of a sprint with filters."""
+    mock_sprint_service.get_sprint_history.return_value = {
+        "items": [
+            {
+                "id": 42,
+                "changed_by": 2,
+                "changed_at": "2025-12-20T10:00:00",
+                "action": "update",
+                "details": {"before": {"title": "Old"}, "after": {"title": "New"}},
+            }
+        ],
+        "page_size": 1,
+        "next_cursor": "WyIyMDI1LTEyLTIwVDEwOjAwOjAwIiwgNDJd",
+    }
+
+    response = client.get(
+        "/api/sprints/1/history?page_size=1&changed_by=2&action=update"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["details"]["after"] == {"title": "New"}
+    assert data["next_cursor"] is not None
+    mock_sprint_service.get_sprint_history.assert_awaited_once_with(
+        sprint_id=1,
+        user_id=1,
+        page_size=1,
+        cursor=None,
+        changed_by=2,
+        action="update",
+        changed_from=None,
+        changed_to=None,
+        full=False,
+    )
@@ -26,6 +26,92 @@ def test_get_task_detail_success(client, mock_task_service):
     assert data["status"] == "todo"
 
 
+def test_get_task_tree_success(client, mock_task_service):
+    """Test getting a task with its nested subtasks."""
+    node = {
+        "title": "Task",
+        "status": "todo",
+        "priority": 2,
+        "project_id": 1,
+        "sprint_id": None,
+        "created_at": "2025-12-11T00:00:00",
+        "updated_at": "2025-12-11T00:00:00",
+    }
+    mock_task_service.get_task_tree.return_value = {
+        **node,
+        "id": 1,
+        "parent_id": None,
+        "depth": 0,
+        "subtasks_total": 1,
+        "subtasks_done": 0,
+        "children": [
+            {
+                **node,
+                "id": 2,
+                "parent_id": 1,
+                "depth": 1,
+                "subtasks_total": 0,
+                "subtasks_done": 0,
+            }
+        ],
+    }
+
+    response = client.get("/api/tasks/1/tree?max_depth=3")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["subtasks_total"] == 1
+    assert data["children"][0]["id"] == 2
+    assert data["children"][0]["children"] == []
+    mock_task_service.get_task_tree.assert_awaited_once_with(
+        task_id=1, user_id=1, max_depth=3
+    )
+
+
+def test_list_task_history_success(client, mock_task_service):
+    """Test listing the history of a task with filters."""
+    mock_task_service.get_task_history.return_value = {
+        "items": [
+            {
+                "id": 42,
+                "changed_by": 2,
+                "changed_at": "2025-12-20T10:00:00",
+                "action": "update",
+                "details": {"before": {"title": "Old"}, "after": {"title": "New"}},
+            }
+        ],
+        "page_size": 1,
+        "next_cursor": "WyIyMDI1LTEyLTIwVDEwOjAwOjAwIiwgNDJd",
+    }
+
+    response = client.get("/api/tasks/1/history?page_size=1&changed_by=2&action=update")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["details"]["after"] == {"title": "New"}
+    assert data["next_cursor"] is not None
+    mock_task_service.get_task_history.assert_awaited_once_with(
+        task_id=1,
+        user_id=1,
+        page_size=1,
+        cursor=None,
+        changed_by=2,
+        action="update",
+        changed_from=None,
+        changed_to=None,
+        field=None,
+        to=None,
+        full=False,
+    )
+
+
+def test_get_task_tree_invalid_depth(client, mock_task_service):
+    """max_depth is bounded."""
+    response = client.get("/api/tasks/1/tree?max_depth=50")
+
+    assert response.status_code == 422
+
+
 def test_get_task_not_found(client, mock_task_service):
     """Test getting non-existent task."""
     mock_task_service.get_task_detail.side_effect = HTTPException(
@@ -104,6 +190,53 @@ def test_update_task_mark_as_done(client, mock_task_service):
     assert data["status"] == "done"
 
 
+def test_update_task_if_match_passes_version(client, mock_task_service):
+    """If-Match is forwarded to the service as the expected version."""
+    mock_task_service.update_task.return_value = {
+        "id": 1,
+        "title": "Task",
+        "status": "done",
+        "priority": 2,
+        "project_id": 1,
+        "sprint_id": None,
+        "parent_id": None,
+        "created_at": "2025-12-11T00:00:00",
+        "updated_at": "2025-12-11T02:00:00",
+        "version": 4,
+    }
+
+    response = client.patch(
+        "/api/tasks/1", json={"status": "done"}, headers={"If-Match": 'W/"3"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 4
+    assert mock_task_service.update_task.await_args.kwargs["expected_version"] == 3
+
+
+def test_update_task_version_conflict(client, mock_task_service):
+    """A stale If-Match version is a 409."""
+    mock_task_service.update_task.side_effect = HTTPException(
+        status_code=409, detail="Task was modified by another request"
+    )
+
+    response = client.patch(
+        "/api/tasks/1", json={"status": "done"}, headers={"If-Match": "2"}
+    )
+
+    assert response.status_code == 409
+
+
+def test_update_task_invalid_if_match(client, mock_task_service):
+    """If-Match must carry an entity version."""
+    response = client.patch(
+        "/api/tasks/1", json={"status": "done"}, headers={"If-Match": "abc"}
+    )
+
+    assert response.status_code == 400
+    mock_task_service.update_task.assert_not_awaited()
+
+
 def test_update_task_not_found(client, mock_task_service):
     """Test updating non-existent task."""
     mock_task_service.update_task.side_effect = HTTPException(
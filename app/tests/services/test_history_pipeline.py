@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import EntityEnum, HistoryAction, HistoryPipelineMode
+from app.models.history_outbox import HistoryOutbox
+from app.models.task_history import TaskHistory
+from app.services.history_pipeline import HistoryEvent, HistoryRecorder, HistoryWriter
+
+
+class RecordingWriter(HistoryWriter):
+    """History writer that keeps written batches in memory instead of the DB."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def _write(self, events):
+        self.batches.append(list(events))
+
+
+def make_event(entity_id: int = 1) -> HistoryEvent:
+    return HistoryEvent(
+        entity_type=EntityEnum.TASK.value,
+        entity_id=entity_id,
+        changed_by=1,
+        action=HistoryAction.UPDATE.value,
+    )
+
+
+@pytest.fixture
+def db():
+    return AsyncMock(spec=AsyncSession)
+
+
+def test_recorder_sync_mode_adds_history_row(db):
+    """Sync mode keeps writing history in the request transaction."""
+    recorder = HistoryRecorder(db, mode=HistoryPipelineMode.SYNC)
+
+    recorder.record(EntityEnum.TASK, 5, 1, HistoryAction.CREATE)
+
+    row = db.add.call_args.args[0]
+    assert isinstance(row, TaskHistory)
+    assert row.task_id == 5
+    assert row.action == "create"
+    assert recorder.pending == []
+
+
+def test_recorder_outbox_mode_adds_outbox_row(db):
+    """Outbox mode writes the event to history_outbox in the same transaction."""
+    recorder = HistoryRecorder(db, mode=HistoryPipelineMode.OUTBOX)
+
+    recorder.record(EntityEnum.SPRINT, 7, 1, HistoryAction.DELETE)
+
+    row = db.add.call_args.args[0]
+    assert isinstance(row, HistoryOutbox)
+    assert row.entity_type == EntityEnum.SPRINT.value
+    assert row.entity_id == 7
+
+
+async def test_recorder_queue_mode_publishes_after_commit(db):
+    """Queue mode buffers events and hands them to the writer on publish."""
+    recorder = HistoryRecorder(db, mode=HistoryPipelineMode.QUEUE)
+
+    recorder.record(EntityEnum.PROJECT, 3, 1, HistoryAction.UPDATE, {"after": {}})
+
+    db.add.assert_not_called()
+    assert recorder.pending[0].changed_at is not None
+
+    with patch(
+        "app.services.history_pipeline.history_writer.enqueue",
+        new_callable=AsyncMock,
+    ) as enqueue:
+        await recorder.publish()
+
+    enqueue.assert_awaited_once()
+    assert enqueue.await_args.args[0][0].entity_id == 3
+    assert recorder.pending == []
+
+
+def test_recorder_discard_drops_pending_events(db):
+    """Events of a rolled back transaction are never published."""
+    recorder = HistoryRecorder(db, mode=HistoryPipelineMode.QUEUE)
+    recorder.record(EntityEnum.TASK, 1, 1, HistoryAction.CREATE)
+
+    recorder.discard()
+
+    assert recorder.pending == []
+
+
+async def test_writer_flushes_in_batches_and_drains_on_stop():
+    """Events are written in batches of at most batch_size and none are lost."""
+    writer = RecordingWriter(
+        mode=HistoryPipelineMode.QUEUE, batch_size=3, flush_interval_ms=50
+    )
+    await writer.start()
+
+    await writer.enqueue([make_event(i) for i in range(7)])
+    await writer.stop()
+
+    assert all(len(batch) <= 3 for batch in writer.batches)
+    written = [event.entity_id for batch in writer.batches for event in batch]
+    assert written == list(range(7))
+
+
+async def test_writer_writes_inline_when_not_running():
+    """Without a running writer (sync mode, shutdown) events are written directly."""
+    writer = RecordingWriter(mode=HistoryPipelineMode.SYNC)
+    await writer.start()
+
+    await writer.enqueue([make_event()])
+
+    assert len(writer.batches) == 1
+
+
+async def test_writer_backpressure_falls_back_to_inline_write():
+    """A full queue slows producers down, then they write their own events."""
+    writer = RecordingWriter(
+        mode=HistoryPipelineMode.QUEUE, max_queue_size=1, enqueue_timeout_ms=10
+    )
+    writer._queue = asyncio.Queue(maxsize=1)
+    writer._queue.put_nowait(make_event(0))
+    writer._stopping = asyncio.Event()
+    writer._task = MagicMock()
+
+    await writer.enqueue([make_event(1), make_event(2)])
+
+    assert [event.entity_id for event in writer.batches[0]] == [1, 2]
@@ -0,0 +1,304 @@
+from collections import namedtuple
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.models.archive_job import ArchiveJob
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
+from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.project_service import ProjectService
+
+
+def scalar_result(value):
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = value
+    return result
+
+
+@pytest.fixture
+def db():
+    return AsyncMock(spec=AsyncSession)
+
+
+def make_project(**overrides) -> Project:
+    data = {
+        "id": 1,
+        "title": "Project 1",
+        "description": None,
+        "status": "planned",
+        "managed_by": 1,
+        "reject_sprint_overlaps": False,
+        "created_at": datetime(2025, 12, 11),
+        "updated_at": datetime(2025, 12, 11),
+        "deleted_at": None,
+    }
+    data.update(overrides)
+    return Project(**data)
+
+
+def test_project_mapper_fetches_server_defaults_eagerly():
+    """created_at/updated_at come back with RETURNING instead of a refresh."""
+    assert inspect(Project).eager_defaults is True
+
+
+async def test_create_project_skips_refresh(db):
+    """Create runs INSERT project, then member + history INSERTs on commit."""
+    service = ProjectService(db)
+    project = await service.create_project(ProjectCreate(title="Project 1"), owner_id=1)
+
+    assert project.title == "Project 1"
+    db.execute.assert_not_awaited()
+    assert db.flush.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_update_project_skips_refresh(db):
+    """Update runs permission + project lookups, UPDATE project, INSERT history."""
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(make_project()),
+    ]
+
+    service = ProjectService(db)
+    project = await service.update_project(
+        project_id=1, data=ProjectUpdate(title="Renamed"), user_id=1
+    )
+
+    assert project.title == "Renamed"
+    assert db.execute.await_count == 2
+    assert db.flush.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_list_projects_with_counts_is_one_page_query(db):
+    """Counts and the active sprint come with the page, not one query per project."""
+    Row = namedtuple(
+        "Row",
+        [
+            "Project",
+            "tasks_total",
+            "tasks_open",
+            "members",
+            "active_sprint_id",
+            "active_sprint_title",
+        ],
+    )
+    page = MagicMock()
+    page.all.return_value = [
+        Row(make_project(version=1), 12, 5, 3, 7, "Sprint 7"),
+        Row(make_project(id=2, version=1), 0, 0, 1, None, None),
+    ]
+    db.scalar.return_value = 2
+    db.execute.return_value = page
+
+    service = ProjectService(db)
+    result = await service.get_user_projects(user_id=1, include_counts=True)
+
+    assert [item.counts.tasks_open for item in result.items] == [5, 0]
+    assert result.items[0].counts.active_sprint_title == "Sprint 7"
+    assert result.items[1].counts.active_sprint_id is None
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0])
+    assert "LEFT OUTER JOIN LATERAL" in sql
+    assert "FROM project_task_stats" in sql
+    assert "FROM tasks" not in sql
+
+
+async def test_project_stats_read_counters_only(db):
+    """Stats are one membership check and one counter query, never a task scan."""
+    counters = MagicMock()
+    counters.all.return_value = [
+        ("status", "todo", 3),
+        ("status", "done", 2),
+        ("priority", "1", 5),
+        ("assignee", "2", 4),
+        ("assignee", "none", 1),
+        ("overdue", "", 1),
+    ]
+    db.execute.side_effect = [scalar_result(ProjectMember(role="viewer")), counters]
+
+    service = ProjectService(db)
+    stats = await service.get_project_stats(project_id=1, user_id=1)
+
+    assert stats.total == 5
+    assert stats.overdue == 1
+    assert stats.by_status == {"todo": 3, "done": 2}
+    assert stats.by_priority == {1: 5}
+    assert [(a.user_id, a.count) for a in stats.by_assignee] == [(2, 4), (None, 1)]
+    assert "tasks" not in str(db.execute.await_args.args[0])
+
+
+def workload_rows(*rows):
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    return result
+
+
+async def test_project_workload_weights_open_tasks_by_priority(db):
+    """One GROUP BY; done tasks are counted by status but carry no load."""
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="viewer")),
+        workload_rows(
+            (None, "todo", 1, 5),
+            (2, "todo", 4, 3),
+            (2, "done", 1, 7),
+            (3, "in_progress", 1, 1),
+            (3, "todo", 2, 1),
+        ),
+    ]
+
+    service = ProjectService(db)
+    workload = await service.get_project_workload(project_id=1, user_id=1)
+
+    assert [(a.user_id, a.open, a.load) for a in workload.assignees] == [
+        (3, 2, 12),
+        (2, 3, 3),
+        (None, 5, 40),
+    ]
+    assert workload.assignees[1].by_status == {"todo": 3, "done": 7}
+    assert workload.assignees[1].by_priority == {4: 3}
+    sql = str(db.execute.await_args.args[0])
+    assert "GROUP BY tasks.assigned_to, tasks.status, tasks.priority" in sql
+    assert "tasks.deleted_at IS NULL" in sql
+
+
+async def test_project_workload_is_served_from_cache(db, monkeypatch):
+    """A cached workload skips the task query, a task write drops it."""
+    cache = TTLCache(ttl=60)
+    monkeypatch.setattr("app.services.project_service.workload_cache", cache)
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="viewer")),
+        workload_rows((2, "todo", 1, 1)),
+        scalar_result(ProjectMember(role="viewer")),
+    ]
+
+    service = ProjectService(db)
+    first = await service.get_project_workload(project_id=1, user_id=1, sprint_id=3)
+    second = await service.get_project_workload(project_id=1, user_id=1, sprint_id=3)
+
+    assert second is first
+    assert db.execute.await_count == 3
+    cache.invalidate(1)
+    assert cache.get(1, 3) is None
+
+
+@pytest.mark.parametrize("live_tasks, archived_inline", [(120, True), (5001, False)])
+async def test_delete_project_archives_children_set_based(
+    db, live_tasks, archived_inline
+):
+    """Sprints are archived in one UPDATE; tasks too, unless a job is queued."""
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(make_project(version=1)),
+        MagicMock(),
+        MagicMock(),
+    ]
+    db.scalar.side_effect = [live_tasks, 50000]
+
+    def assign_job_id():
+        for call in db.add.call_args_list:
+            call.args[0].id = 7
+
+    db.commit.side_effect = assign_job_id
+
+    service = ProjectService(db)
+    queued = await service.delete_project(project_id=1, user_id=1)
+
+    statements = [str(call.args[0]) for call in db.execute.await_args_list[2:]]
+    assert "UPDATE sprints SET" in statements[0]
+    assert "INSERT INTO sprint_history" in statements[0]
+    assert ("UPDATE tasks SET" in statements[-1]) is archived_inline
+    count = db.scalar.await_args_list[0].args[0]
+    assert "LIMIT" in str(count)
+    assert 5001 in count.compile().params.values()
+    jobs = [
+        call.args[0]
+        for call in db.add.call_args_list
+        if isinstance(call.args[0], ArchiveJob)
+    ]
+    if archived_inline:
+        assert queued is None
+        assert not jobs
+    else:
+        assert jobs[0].tasks_total == 50000
+        assert queued.job_id == 7
+        assert queued.status_url == "/api/projects/1/archive-jobs/7"
+    db.commit.assert_awaited_once()
+
+
+async def test_archive_job_is_visible_to_members_of_the_deleted_project(db):
+    """Progress is read by job id within the project; other ids are a 404."""
+    job = ArchiveJob(
+        id=7,
+        project_id=1,
+        requested_by=1,
+        status="running",
+        tasks_total=50000,
+        tasks_archived=20000,
+        created_at=datetime(2025, 12, 11),
+        updated_at=datetime(2025, 12, 11, 0, 5),
+    )
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="viewer")),
+        scalar_result(job),
+        scalar_result(ProjectMember(role="viewer")),
+        scalar_result(None),
+    ]
+
+    service = ProjectService(db)
+    progress = await service.get_archive_job(project_id=1, job_id=7, user_id=2)
+
+    assert (progress.tasks_archived, progress.tasks_total) == (20000, 50000)
+    with pytest.raises(HTTPException) as exc:
+        await service.get_archive_job(project_id=2, job_id=7, user_id=2)
+    assert exc.value.status_code == 404
+
+
+async def test_project_detail_embeds_a_bounded_sprint_list(db):
+    """Project and its recent sprints are two plain queries, no join fan-out."""
+    SprintRow = namedtuple("SprintRow", ["Sprint", "total"])
+    sprints = MagicMock()
+    sprints.all.return_value = [
+        SprintRow(
+            Sprint(
+                id=sprint_id,
+                project_id=1,
+                title=f"Sprint {sprint_id}",
+                status="active",
+                start_date=date(2025, 12, 1),
+                end_date=date(2025, 12, 14),
+                created_at=datetime(2025, 12, 1),
+                updated_at=datetime(2025, 12, 1),
+                version=1,
+            ),
+            240,
+        )
+        for sprint_id in (9, 8)
+    ]
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="viewer")),
+        scalar_result(make_project(version=1)),
+        sprints,
+    ]
+
+    service = ProjectService(db)
+    detail = await service.get_project_detail(project_id=1, user_id=1, sprints_limit=2)
+
+    assert [sprint.id for sprint in detail.sprints] == [9, 8]
+    assert detail.sprints_total == 240
+    assert detail.sprints_url == "/api/projects/1/sprints"
+    query = db.execute.await_args.args[0]
+    assert "JOIN" not in str(query)
+    assert "sprints.deleted_at IS NULL" in str(query)
+    # Active and most recent ids come from two index-ordered LIMIT scans
+    assert "UNION ALL" in str(query)
+    assert "OVER ()" not in str(query)
@@ -0,0 +1,244 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
+from app.schemas.sprint import SprintClose, SprintCreate, SprintUpdate
+from app.services.sprint_service import SprintService
+
+
+def scalar_result(value):
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = value
+    return result
+
+
+@pytest.fixture
+def db():
+    return AsyncMock(spec=AsyncSession)
+
+
+def make_sprint(**overrides) -> Sprint:
+    data = {
+        "id": 1,
+        "project_id": 1,
+        "title": "Sprint 1",
+        "description": None,
+        "status": "new",
+        "start_date": date(2025, 12, 1),
+        "end_date": date(2025, 12, 14),
+        "created_at": datetime(2025, 12, 11),
+        "updated_at": datetime(2025, 12, 11),
+        "deleted_at": None,
+    }
+    data.update(overrides)
+    return Sprint(**data)
+
+
+def test_sprint_mapper_fetches_server_defaults_eagerly():
+    """created_at/updated_at come back with RETURNING instead of a refresh."""
+    assert inspect(Sprint).eager_defaults is True
+
+
+async def test_create_sprint_skips_refresh(db):
+    """Create runs permission + project lookups, INSERT sprint, INSERT history."""
+    db.execute.side_effect = [
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(Project(id=1, deleted_at=None)),
+    ]
+
+    service = SprintService(db)
+    data = SprintCreate(
+        title="Sprint 1", start_date=date(2025, 12, 1), end_date=date(2025, 12, 14)
+    )
+    sprint = await service.create_sprint(project_id=1, data=data, user_id=1)
+
+    assert sprint.title == "Sprint 1"
+    assert db.execute.await_count == 2
+    assert db.flush.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_update_sprint_skips_refresh(db):
+    """Update runs sprint + permission lookups, UPDATE sprint, INSERT history."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint()),
+        scalar_result(ProjectMember(role="maintainer")),
+    ]
+    # The project accepts overlapping active sprints: no overlap query
+    db.scalar.return_value = False
+
+    service = SprintService(db)
+    sprint = await service.update_sprint(
+        sprint_id=1, data=SprintUpdate(status="active"), user_id=1
+    )
+
+    assert sprint.status == "active"
+    assert db.execute.await_count == 2
+    assert db.scalar.await_count == 1
+    assert db.flush.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_update_sprint_end_date_before_stored_start_date(db):
+    """Changing one date only is checked against the other, stored one."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint()),
+        scalar_result(ProjectMember(role="maintainer")),
+    ]
+
+    service = SprintService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_sprint(
+            sprint_id=1,
+            data=SprintUpdate(end_date=make_sprint().start_date - timedelta(days=1)),
+            user_id=1,
+        )
+
+    assert exc.value.status_code == 400
+    db.flush.assert_not_awaited()
+
+
+async def test_update_sprint_overlapping_active_sprint_is_conflict(db):
+    """With reject_sprint_overlaps on, an overlapping active sprint is a 409."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint()),
+        scalar_result(ProjectMember(role="maintainer")),
+    ]
+    db.scalar.side_effect = [True, True]
+
+    service = SprintService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_sprint(
+            sprint_id=1, data=SprintUpdate(status="active"), user_id=1
+        )
+
+    assert exc.value.status_code == 409
+    setting, overlap = [str(call.args[0]) for call in db.scalar.await_args_list]
+    assert "FROM projects" in setting and "FOR UPDATE" in setting
+    assert "sprints.period && daterange(" in overlap
+    assert "sprints.id !=" in overlap
+    db.flush.assert_not_awaited()
+    db.commit.assert_not_awaited()
+
+
+async def test_close_sprint_moves_unfinished_tasks_in_one_statement(db):
+    """Lookups, target check, then a single UPDATE moves the tasks with their history."""
+    moved = MagicMock()
+    moved.scalars.return_value.all.return_value = [4, 5, 6]
+    db.execute.side_effect = [
+        scalar_result(make_sprint(status="active", version=1)),
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(make_sprint(id=2, status="planned")),
+        moved,
+    ]
+
+    service = SprintService(db)
+    result = await service.close_sprint(
+        sprint_id=1, data=SprintClose(target_sprint_id=2), user_id=1
+    )
+
+    assert result.sprint.status == "completed"
+    assert result.moved == 3
+    assert db.execute.await_count == 4
+    statement = str(db.execute.await_args.args[0])
+    assert "UPDATE tasks SET sprint_id" in statement
+    assert "INSERT INTO task_history" in statement
+    db.commit.assert_awaited_once()
+
+
+async def test_close_sprint_keeps_remaining_work_in_its_burndown(db):
+    """Moved tasks join the target's burndown but don't leave the closed one."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint(status="active", version=1)),
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(make_sprint(id=2, status="planned")),
+        MagicMock(),
+    ]
+
+    service = SprintService(db)
+    await service.close_sprint(
+        sprint_id=1, data=SprintClose(target_sprint_id=2), user_id=1
+    )
+
+    statement = db.execute.await_args.args[0]
+    sql = str(statement)
+    # Only the old side (leaving a sprint) of the burndown deltas is filtered
+    assert sql.count("updated.old_sprint_id != :old_sprint_id_1") == 1
+    assert "updated.new_sprint_id != " not in sql
+    assert statement.compile().params["old_sprint_id_1"] == 1
+
+
+@pytest.mark.parametrize(
+    "sprint_status, target",
+    [("completed", None), ("active", None), ("active", "completed")],
+)
+async def test_close_sprint_rejects_closed_sprints(db, sprint_status, target):
+    """Closed sprints can't be closed again or receive tasks."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint(status=sprint_status, version=1)),
+        scalar_result(ProjectMember(role="owner")),
+        scalar_result(make_sprint(id=2, status=target) if target else None),
+    ]
+    target_sprint_id = 2 if target or sprint_status == "active" else None
+
+    service = SprintService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.close_sprint(
+            sprint_id=1,
+            data=SprintClose(target_sprint_id=target_sprint_id),
+            user_id=1,
+        )
+
+    assert exc.value.status_code == 400
+    db.commit.assert_not_awaited()
+
+
+async def test_delete_sprint_archives_its_tasks_in_one_statement(db):
+    """Tasks of a deleted sprint are archived with one set-based UPDATE."""
+    db.execute.side_effect = [
+        scalar_result(make_sprint(version=1)),
+        scalar_result(ProjectMember(role="owner")),
+        MagicMock(),
+    ]
+
+    service = SprintService(db)
+    await service.delete_sprint(sprint_id=1, user_id=1)
+
+    assert db.execute.await_count == 3
+    statement = db.execute.await_args.args[0]
+    sql = str(statement)
+    assert "UPDATE tasks SET" in sql
+    assert "INSERT INTO task_history" in sql
+    assert statement.compile().params["sprint_id_1"] == 1
+    db.commit.assert_awaited_once()
+
+
+def test_fill_burndown_days_carries_counts_forward():
+    """Days without changes repeat the previous counts; earlier changes count on day one."""
+    rows = [
+        SimpleNamespace(day=date(2025, 11, 28), priority=1, remaining=2, completed=0),
+        SimpleNamespace(day=date(2025, 12, 2), priority=1, remaining=1, completed=1),
+        SimpleNamespace(day=date(2025, 12, 2), priority=3, remaining=4, completed=0),
+    ]
+
+    days = SprintService._fill_burndown_days(rows, date(2025, 12, 1), date(2025, 12, 3))
+
+    assert [(d.day.day, d.remaining, d.completed) for d in days] == [
+        (1, 2, 0),
+        (2, 5, 1),
+        (3, 5, 1),
+    ]
+    assert [p.priority for p in days[2].by_priority] == [1, 3]
@@ -0,0 +1,820 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.helpers import decode_cursor, encode_cursor, hash_request
+from app.models.idempotency_key import IdempotencyKey
+from app.models.task import Task
+from app.models.task_history import TaskHistory
+from app.repositories.project_stats_repository import stats_deltas, stats_rows
+from app.repositories.sprint_burndown_repository import burndown_rows
+from app.repositories.task_history_repository import TaskHistoryRepository
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+def db():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock()
+    return session
+
+
+def make_task(**overrides) -> Task:
+    data = {
+        "id": 1,
+        "project_id": 1,
+        "title": "Task 1",
+        "description": None,
+        "status": "todo",
+        "priority": 3,
+        "assigned_to": None,
+        "sprint_id": None,
+        "due_date": None,
+        "created_at": datetime(2025, 12, 11),
+        "updated_at": datetime(2025, 12, 11),
+        "deleted_at": None,
+        "version": 1,
+    }
+    data.update(overrides)
+    return Task(**data)
+
+
+def context_row(**overrides):
+    values = {
+        "role": "member",
+        "project_ok": True,
+        "assignee_ok": True,
+        "sprint_ok": True,
+    }
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def write_row(task: Task, **overrides):
+    values = {"Task": task, "role": "member", "assignee_ok": True, "sprint_ok": True}
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def returned_task(db, task: Task) -> None:
+    """Row returned by the task INSERT/UPDATE ... RETURNING statement."""
+    db.scalars.return_value = MagicMock()
+    db.scalars.return_value.one.return_value = task
+    db.scalars.return_value.one_or_none.return_value = task
+
+
+def counter_upserts(statement) -> dict:
+    """Counter upsert CTEs of a task write, by name."""
+    return {cte.name: cte.element for cte in statement._independent_ctes}
+
+
+def test_task_mapper_fetches_server_defaults_eagerly():
+    """created_at/updated_at come back with RETURNING instead of a refresh."""
+    assert inspect(Task).eager_defaults is True
+
+
+def test_task_mapper_uses_version_column():
+    """UPDATEs compare-and-swap on tasks.version instead of holding a row lock."""
+    assert inspect(Task).version_id_col is Task.__table__.c.version
+
+
+async def test_create_task_validates_in_one_query(db):
+    """Create runs 1 validation query + INSERT task + INSERT history, no refresh."""
+    db.execute.return_value.one.return_value = context_row()
+    returned_task(db, make_task(title="New Task", assigned_to=2, sprint_id=3))
+
+    service = TaskService(db)
+    data = TaskCreate(title="New Task", assigned_to=2, sprint_id=3)
+    task = await service.create_task(project_id=1, data=data, user_id=1)
+
+    assert task.title == "New Task"
+    assert db.execute.await_count == 1
+    assert db.scalars.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_create_task_forbidden_for_non_member(db):
+    """A non-member is rejected without any further queries."""
+    db.execute.return_value.one.return_value = context_row(role=None)
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.create_task(
+            project_id=1, data=TaskCreate(title="New Task"), user_id=1
+        )
+
+    assert exc.value.status_code == 403
+    assert db.execute.await_count == 1
+    db.flush.assert_not_awaited()
+    db.commit.assert_not_awaited()
+
+
+async def test_create_task_rejects_foreign_sprint(db):
+    """An invalid sprint is reported from the same validation query."""
+    db.execute.return_value.one.return_value = context_row(sprint_ok=False)
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.create_task(
+            project_id=1, data=TaskCreate(title="New Task", sprint_id=9), user_id=1
+        )
+
+    assert exc.value.status_code == 400
+    db.commit.assert_not_awaited()
+
+
+async def test_bulk_create_reports_bad_parents_by_index(db):
+    """Parents are checked with one query; a missing or foreign one is an error."""
+    context = MagicMock()
+    context.one.return_value = context_row()
+    parents = MagicMock()
+    parents.scalars.return_value.all.return_value = [5]
+    db.execute.side_effect = [context, parents, MagicMock(), MagicMock()]
+    db.scalars.return_value = MagicMock()
+    db.scalars.return_value.all.return_value = [make_task(id=10, parent_id=5)]
+
+    service = TaskService(db)
+    result = await service.create_tasks_bulk(
+        project_id=1,
+        items=[
+            TaskCreate(title="Subtask", parent_id=5),
+            TaskCreate(title="Orphan", parent_id=99),
+        ],
+        user_id=1,
+    )
+
+    assert [task.id for task in result.created] == [10]
+    assert [(error.index, error.detail) for error in result.errors] == [
+        (1, "Parent task does not belong to the project")
+    ]
+    parent_query = str(db.execute.await_args_list[1].args[0])
+    assert "tasks.project_id =" in parent_query
+    assert "tasks.deleted_at IS NULL" in parent_query
+    assert [row["parent_id"] for row in db.scalars.await_args.args[1]] == [5]
+
+
+async def test_update_task_validates_in_one_query(db):
+    """Update runs 1 locking/validation query + UPDATE + INSERT history."""
+    task = make_task()
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, make_task(status="done", assigned_to=2, version=2))
+
+    service = TaskService(db)
+    data = TaskUpdate(status="done", assigned_to=2)
+    updated = await service.update_task(task_id=1, data=data, user_id=1)
+
+    assert updated.status == "done"
+    assert db.execute.await_count == 1
+    assert db.scalars.await_count == 1
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+async def test_update_task_stores_only_changed_fields(db):
+    """History details keep only the fields that changed."""
+    task = make_task(description="A long description")
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, make_task(description="A long description", status="done"))
+
+    service = TaskService(db)
+    await service.update_task(
+        task_id=1, data=TaskUpdate(status="done", title="Task 1"), user_id=1
+    )
+
+    history = db.add.call_args.args[0]
+    assert history.details == {
+        "before": {"status": "todo"},
+        "after": {"status": "done"},
+    }
+
+
+async def test_update_task_stale_if_match_is_conflict(db):
+    """An If-Match version that is not the current one is rejected with 409."""
+    task = make_task(version=3)
+    db.execute.return_value.first.return_value = write_row(task)
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_task(
+            task_id=1, data=TaskUpdate(status="done"), user_id=1, expected_version=2
+        )
+
+    assert exc.value.status_code == 409
+    db.scalars.assert_not_awaited()
+
+
+async def test_update_task_lost_race_is_conflict(db):
+    """A concurrent edit makes the compare-and-swap UPDATE fail with 409."""
+    task = make_task(version=3)
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, None)
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_task(task_id=1, data=TaskUpdate(status="done"), user_id=1)
+
+    assert exc.value.status_code == 409
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+
+
+async def test_task_update_is_a_compare_and_swap(db):
+    """The UPDATE matches the loaded version only; no row back is a stale version."""
+    returned_task(db, None)
+    repository = TaskRepository(db)
+
+    with pytest.raises(StaleDataError):
+        await repository.update_task(
+            make_task(version=3), {"status": "done"}, (None, None)
+        )
+
+    statement = db.scalars.await_args.args[0]
+    assert "AND tasks.version = :version" in str(statement.whereclause)
+    assert 3 in statement.compile().params.values()
+
+
+async def test_update_task_parent_in_own_subtree_is_rejected(db):
+    """The validation query refuses a parent inside the task's own subtree."""
+    task = make_task()
+    db.execute.return_value.first.return_value = write_row(task, parent_ok=False)
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_task(task_id=1, data=TaskUpdate(parent_id=5), user_id=1)
+
+    assert exc.value.status_code == 400
+    statement = str(db.execute.await_args.args[0])
+    assert "NOT (tasks_1.path <@ tasks.path)" in statement
+    db.scalars.assert_not_awaited()
+
+
+async def test_update_task_parent_cycle_from_trigger_is_bad_request(db):
+    """A cycle created by a concurrent move is caught by the path trigger."""
+    task = make_task()
+    db.execute.return_value.first.return_value = write_row(task, parent_ok=True)
+    db.scalars.side_effect = IntegrityError(
+        "UPDATE tasks",
+        {},
+        Exception("ck_tasks_parent_not_descendant: task 1 can't be moved"),
+    )
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_task(task_id=1, data=TaskUpdate(parent_id=5), user_id=1)
+
+    assert exc.value.status_code == 400
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+
+
+async def test_update_task_not_found(db):
+    """A missing task is a 404."""
+    db.execute.return_value.first.return_value = None
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_task(
+            task_id=999, data=TaskUpdate(status="done"), user_id=1
+        )
+
+    assert exc.value.status_code == 404
+
+
+async def test_delete_task_validates_in_one_query(db):
+    """Delete runs 1 locking/validation query + a single soft-delete UPDATE."""
+    task = make_task()
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, make_task(status="achieved", deleted_at=datetime(2025, 12, 12)))
+
+    service = TaskService(db)
+    await service.delete_task(task_id=1, user_id=1)
+
+    statement = db.scalars.await_args.args[0]
+    assert "achieved" in statement.compile().params.values()
+    assert db.execute.await_count == 1
+    assert db.scalars.await_count == 1
+    db.commit.assert_awaited_once()
+
+
+async def test_create_task_replays_idempotency_key(db):
+    """A retried request returns the stored task without writing again."""
+    data = TaskCreate(title="New Task")
+    stored = IdempotencyKey(
+        user_id=1,
+        key="retry-1",
+        request_hash=hash_request("create_task:1", data.model_dump(mode="json")),
+        status_code=201,
+        response=TaskRead.model_validate(make_task(title="New Task")).model_dump(
+            mode="json"
+        ),
+    )
+    db.execute.return_value.scalars.return_value.first.return_value = stored
+
+    service = TaskService(db)
+    task = await service.create_task(
+        project_id=1, data=data, user_id=1, idempotency_key="retry-1"
+    )
+
+    assert task.id == 1
+    assert task.title == "New Task"
+    db.add.assert_not_called()
+    db.commit.assert_not_awaited()
+
+
+async def test_create_task_idempotency_key_reused_with_other_payload(db):
+    """The same key with a different request body is a 422."""
+    db.execute.return_value.scalars.return_value.first.return_value = IdempotencyKey(
+        request_hash="another-request", response={}
+    )
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.create_task(
+            project_id=1,
+            data=TaskCreate(title="New Task"),
+            user_id=1,
+            idempotency_key="retry-1",
+        )
+
+    assert exc.value.status_code == 422
+
+
+async def test_create_task_stores_idempotent_response(db):
+    """The first request stores its response in the same transaction."""
+    db.execute.return_value.scalars.return_value.first.return_value = None
+    db.execute.return_value.one.return_value = context_row()
+    returned_task(db, make_task(title="New Task"))
+
+    service = TaskService(db)
+    await service.create_task(
+        project_id=1,
+        data=TaskCreate(title="New Task"),
+        user_id=1,
+        idempotency_key="retry-1",
+    )
+
+    # advisory lock + lookup + validation + store
+    assert db.execute.await_count == 4
+    stored = db.execute.await_args.args[0]
+    assert stored.table.name == "idempotency_keys"
+    db.commit.assert_awaited_once()
+
+
+async def test_sprint_board_groups_tasks_in_one_query(db):
+    """Access check + one windowed query; every status column is returned."""
+    db.execute.return_value.first.return_value = MagicMock(project_id=1, role="member")
+    db.execute.return_value.all.return_value = [
+        (make_task(id=1, status="todo"), 7),
+        (make_task(id=2, status="todo"), 7),
+        (make_task(id=3, status="done"), 1),
+    ]
+
+    service = TaskService(db)
+    board = await service.get_sprint_board(sprint_id=1, user_id=1, per_status=2)
+
+    columns = {column.status: column for column in board.columns}
+    assert columns["todo"].total == 7
+    assert [task.id for task in columns["todo"].tasks] == [1, 2]
+    assert columns["done"].total == 1
+    assert columns["review"].total == 0
+    assert "achieved" not in columns
+    assert db.execute.await_count == 2
+
+
+@pytest.mark.parametrize("role, allowed", [("viewer", True), (None, False)])
+async def test_sprint_board_is_readable_by_viewers(db, role, allowed):
+    """Viewers read the board like any member; non-members get a 403."""
+    db.execute.return_value.first.return_value = MagicMock(project_id=1, role=role)
+    db.execute.return_value.all.return_value = []
+
+    service = TaskService(db)
+
+    if allowed:
+        board = await service.get_sprint_board(sprint_id=1, user_id=1)
+        assert all(column.total == 0 for column in board.columns)
+    else:
+        with pytest.raises(HTTPException) as exc:
+            await service.get_sprint_board(sprint_id=1, user_id=1)
+        assert exc.value.status_code == 403
+
+
+async def test_sprint_board_sprint_not_found(db):
+    """A missing or deleted sprint is a 404."""
+    db.execute.return_value.first.return_value = None
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.get_sprint_board(sprint_id=999, user_id=1)
+
+    assert exc.value.status_code == 404
+
+
+async def test_update_task_moves_burndown_bucket(db):
+    """Completing a sprint task moves it from remaining to completed."""
+    task = make_task(sprint_id=5, status="in_progress", priority=2)
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, make_task(sprint_id=5, status="done", priority=2))
+
+    service = TaskService(db)
+    await service.update_task(task_id=1, data=TaskUpdate(status="done"), user_id=1)
+
+    upsert = counter_upserts(db.scalars.await_args.args[0])["burndown"]
+    assert upsert.table.name == "sprint_burndown"
+    rows = upsert.compile().params
+    assert rows["sprint_id_m0"] == 5
+    assert rows["priority_m0"] == 2
+    assert rows["remaining_delta_m0"] == -1
+    assert rows["completed_delta_m0"] == 1
+
+
+async def test_sprint_tasks_keyset_page(db):
+    """One access check; an extra row yields a cursor that resumes after the last item."""
+    db.execute.return_value.first.return_value = MagicMock(project_id=1, role="member")
+    db.execute.return_value.scalars.return_value.all.return_value = [
+        make_task(id=3),
+        make_task(id=2),
+        make_task(id=1),
+    ]
+
+    service = TaskService(db)
+    page = await service.get_sprint_tasks(
+        sprint_id=1, user_id=1, page_size=2, cursor=""
+    )
+
+    assert [task.id for task in page.items] == [3, 2]
+    assert db.execute.await_count == 2
+    query = db.execute.await_args.args[0]
+    assert "project_id" not in str(query.whereclause)
+
+    db.execute.reset_mock()
+    await service.get_sprint_tasks(
+        sprint_id=1, user_id=1, page_size=2, cursor=page.next_cursor
+    )
+
+    params = db.execute.await_args.args[0].compile().params
+    assert params["param_1"] == datetime(2025, 12, 11)
+    assert params["param_2"] == 2
+
+
+async def test_sprint_tasks_offset_page_by_default(db):
+    """Without a cursor pages are numbered, within the sprint's project."""
+    db.execute.return_value.first.return_value = MagicMock(project_id=4, role="viewer")
+    db.execute.return_value.scalars.return_value.all.return_value = [make_task(id=3)]
+    db.scalar.return_value = 21
+
+    service = TaskService(db)
+    page = await service.get_sprint_tasks(
+        sprint_id=1, user_id=1, page=2, page_size=20, sort_by="priority"
+    )
+
+    assert (page.total, page.page, page.total_pages) == (21, 2, 2)
+    query = db.execute.await_args.args[0]
+    params = query.compile().params
+    assert params["project_id_1"] == 4 and params["sprint_id_1"] == 1
+    assert "ORDER BY tasks.priority" in str(query)
+
+
+async def test_sprint_tasks_invalid_cursor(db):
+    """A malformed cursor is a 400."""
+    db.execute.return_value.first.return_value = MagicMock(project_id=1, role="member")
+
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.get_sprint_tasks(sprint_id=1, user_id=1, cursor="not-a-cursor")
+
+    assert exc.value.status_code == 400
+
+
+async def test_update_task_moves_project_stats_counters(db):
+    """Reassigning a task moves one count between assignee counters."""
+    task = make_task(assigned_to=None)
+    db.execute.return_value.first.return_value = write_row(task)
+    returned_task(db, make_task(assigned_to=2))
+
+    service = TaskService(db)
+    await service.update_task(task_id=1, data=TaskUpdate(assigned_to=2), user_id=1)
+
+    upserts = counter_upserts(db.scalars.await_args.args[0])
+    assert "burndown" not in upserts
+    upsert = upserts["stats"]
+    assert upsert.table.name == "project_task_stats"
+    rows = upsert.compile().params
+    assert rows["key_m0"] == "2" and rows["count_m0"] == 1
+    assert rows["key_m1"] == "none" and rows["count_m1"] == -1
+
+
+def test_opposite_moves_upsert_counters_in_the_same_order():
+    """
+    todo -> done and done -> todo touch the same counter rows; both lock them
+    in primary key order, so two such writes can't deadlock each other.
+    """
+    todo = {
+        "project_id": 1,
+        "sprint_id": 5,
+        "status": "todo",
+        "priority": 2,
+        "assigned_to": None,
+        "due_date": None,
+    }
+    done = {**todo, "status": "done"}
+
+    def keys(rows, *columns):
+        return [tuple(row[column] for column in columns) for row in rows]
+
+    stats_key = ("project_id", "dimension", "key")
+    finishing = keys(stats_rows([(todo, done)]), *stats_key)
+    reopening = keys(stats_rows([(done, todo)]), *stats_key)
+    assert finishing == reopening == [(1, "status", "done"), (1, "status", "todo")]
+
+    # Burndown rows of one day differ by priority only
+    burndown_key = ("sprint_id", "priority")
+    assert keys(burndown_rows([(todo, {**done, "priority": 1})]), *burndown_key) == [
+        (5, 1),
+        (5, 2),
+    ]
+
+
+async def test_bulk_update_upserts_counters_in_key_order(db):
+    """The set-based counter upserts are ordered like the single-task ones."""
+    repository = TaskRepository(db)
+    await repository.archive_tasks(project_id=1, changed_by=1, conditions=[])
+
+    sql = str(db.execute.await_args.args[0])
+    assert "ORDER BY changes.sprint_id, changes.priority" in sql
+    assert (
+        'ORDER BY counters.project_id, counters.dimension COLLATE "C", '
+        'counters.key COLLATE "C"'
+    ) in sql
+
+
+def test_stats_deltas_track_open_due_dates():
+    """Finishing a task removes it from its due day; unchanged counters cancel out."""
+    before = {
+        "project_id": 1,
+        "status": "todo",
+        "priority": 2,
+        "assigned_to": 7,
+        "due_date": datetime(2025, 12, 11, 17, 0),
+    }
+
+    deltas = stats_deltas([(before, {**before, "status": "done"})])
+
+    assert deltas == {
+        (1, "status", "todo"): -1,
+        (1, "status", "done"): 1,
+        (1, "open_due", "2025-12-11"): -1,
+    }
+
+
+async def test_archive_tasks_drops_them_from_counters(db):
+    """Archived tasks only leave their burndown/stats buckets, never join new ones."""
+    repository = TaskRepository(db)
+    await repository.archive_tasks(project_id=1, changed_by=1, conditions=[], limit=500)
+
+    statement = db.execute.await_args.args[0]
+    sql = str(statement)
+    assert "updated.new_deleted_at IS NULL" in sql
+    assert "ORDER BY tasks.id" in sql
+    assert 500 in statement.compile().params.values()
+
+
+async def test_task_tree_nests_rows_from_one_recursive_query(db):
+    """Subtasks come from one recursive CTE and are nested by parent_id."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task()
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    tree = MagicMock()
+    tree.all.return_value = [
+        (make_task(), 0, 3, 1, False),
+        (make_task(id=2, parent_id=1, status="done"), 1, 0, 0, False),
+        (make_task(id=3, parent_id=1), 1, 1, 0, False),
+        (make_task(id=4, parent_id=3), 2, 0, 0, True),
+    ]
+    db.execute.side_effect = [found, member, tree]
+
+    service = TaskService(db)
+    root = await service.get_task_tree(task_id=1, user_id=1, max_depth=2)
+
+    assert (root.subtasks_total, root.subtasks_done) == (3, 1)
+    assert [child.id for child in root.children] == [2, 3]
+    assert [node.id for node in root.children[1].children] == [4]
+    assert root.children[1].children[0].truncated is True
+    statement = str(db.execute.await_args.args[0])
+    assert "WITH RECURSIVE tree" in statement
+    assert "!= ALL (tree.path)" in statement
+
+
+async def test_task_history_is_a_keyset_page_newest_first(db):
+    """One extra row tells there is a next page, its cursor resumes after it."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task()
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    history = MagicMock()
+    history.scalars.return_value.all.return_value = [
+        TaskHistory(
+            id=history_id,
+            task_id=1,
+            changed_by=2,
+            changed_at=datetime(2025, 12, day),
+            action="update",
+            details={"before": {}, "after": {}},
+        )
+        for history_id, day in [(9, 20), (7, 18), (4, 11)]
+    ]
+    db.execute.side_effect = [found, member, history]
+
+    service = TaskService(db)
+    page = await service.get_task_history(
+        task_id=1,
+        user_id=1,
+        page_size=2,
+        cursor=encode_cursor(datetime(2025, 12, 21), 12),
+        action="update",
+    )
+
+    assert [entry.id for entry in page.items] == [9, 7]
+    assert decode_cursor(page.next_cursor) == ["2025-12-18T00:00:00", 7]
+    statement = db.execute.await_args.args[0]
+    sql = str(statement)
+    assert "(task_history.changed_at, task_history.id) <" in sql
+    assert "ORDER BY task_history.changed_at DESC, task_history.id DESC" in sql
+    assert 3 in statement.compile().params.values()
+
+
+async def test_task_history_full_rebuilds_snapshots(db):
+    """Diffs of every newer row are folded back from the current task."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task(status="done", priority=1)
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    diffs = {
+        9: {"before": {"priority": 2}, "after": {"priority": 1}},
+        7: {"before": {"status": "todo"}, "after": {"status": "done"}},
+        4: None,
+    }
+    history = MagicMock()
+    history.scalars.return_value.all.return_value = [
+        TaskHistory(
+            id=history_id,
+            task_id=1,
+            changed_by=2,
+            changed_at=datetime(2025, 12, day),
+            action="create" if details is None else "update",
+            details=details,
+        )
+        for (history_id, details), day in zip(diffs.items(), [20, 18, 11])
+    ]
+    newer = MagicMock()
+    newer.all.return_value = [
+        MagicMock(id=history_id, details=details)
+        for history_id, details in diffs.items()
+    ]
+    db.execute.side_effect = [found, member, history, newer]
+
+    service = TaskService(db)
+    page = await service.get_task_history(task_id=1, user_id=1, full=True)
+
+    views = [entry.details for entry in page.items]
+    assert views[0]["before"]["priority"] == 2
+    assert views[0]["after"] == {**views[0]["before"], "priority": 1}
+    assert views[1]["before"]["status"] == "todo"
+    assert views[1]["after"] == {**views[1]["before"], "status": "done"}
+    assert views[1]["after"]["priority"] == 2
+    assert views[2] == {"before": None, "after": views[1]["before"]}
+    assert views[2]["after"]["title"] == "Task 1"
+
+
+async def test_task_history_rejects_a_malformed_cursor(db):
+    """A cursor that doesn't decode to (changed_at, id) is a 400."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task()
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    db.execute.side_effect = [found, member]
+
+    service = TaskService(db)
+    with pytest.raises(HTTPException) as exc:
+        await service.get_task_history(task_id=1, user_id=1, cursor="not-a-cursor")
+
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "to, operator, value",
+    [("done", "@>", {"after": {"status": "done"}}), (None, "@?", "$.after.status")],
+)
+async def test_task_history_filters_on_changed_field(db, to, operator, value):
+    """A new value is a GIN-indexable containment, a bare field a path match."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task()
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    db.execute.side_effect = [found, member, MagicMock()]
+
+    service = TaskService(db)
+    await service.get_task_history(task_id=1, user_id=1, field="status", to=to)
+
+    statement = db.execute.await_args.args[0]
+    assert f"task_history.details {operator}" in str(statement)
+    assert value in statement.compile().params.values()
+
+
+async def test_task_history_rejects_an_untracked_field(db):
+    """Only fields recorded in history details can be filtered on."""
+    found = MagicMock()
+    found.scalars.return_value.first.return_value = make_task()
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="viewer")
+    db.execute.side_effect = [found, member]
+
+    service = TaskService(db)
+    with pytest.raises(HTTPException) as exc:
+        await service.get_task_history(task_id=1, user_id=1, field="version")
+
+    assert exc.value.status_code == 400
+    assert db.execute.await_count == 2
+
+
+async def test_field_changes_across_tasks_match_new_value(db):
+    """Reassignments to a user by one author: containment plus changed_by."""
+    await TaskHistoryRepository(db).get_field_changes("assigned_to", to=5, changed_by=3)
+
+    statement = db.execute.await_args.args[0]
+    sql = str(statement)
+    assert "task_history.details @>" in sql
+    assert "task_history.changed_by =" in sql
+    assert {"after": {"assigned_to": 5}} in statement.compile().params.values()
+
+
+async def test_project_tasks_parent_of_uses_the_materialised_path(db):
+    """Everything under a task is one path <@ filter, not a recursive walk."""
+    member = MagicMock()
+    member.scalars.return_value.first.return_value = MagicMock(role="member")
+    page = MagicMock()
+    page.scalars.return_value.all.return_value = [make_task(id=41, parent_id=40)]
+    db.execute.side_effect = [member, page]
+    db.scalar.return_value = 1
+
+    service = TaskService(db)
+    result = await service.get_project_tasks(project_id=1, user_id=1, parent_of=40)
+
+    assert [task.id for task in result.items] == [41]
+    statement = str(db.execute.await_args.args[0])
+    assert "tasks.path <@ (SELECT tasks_1.path" in statement
+    assert "RECURSIVE" not in statement
+
+
+async def test_my_tasks_pages_by_due_date_keyset(db):
+    """One query per page; tasks without a due date continue after 'infinity'."""
+    page = MagicMock()
+    page.scalars.return_value.all.return_value = [
+        make_task(id=8, assigned_to=1),
+        make_task(id=9, assigned_to=1),
+    ]
+    db.execute.return_value = page
+    cursor = encode_cursor(None, 5)
+
+    service = TaskService(db)
+    result = await service.get_my_tasks(user_id=1, page_size=1, cursor=cursor)
+
+    assert [task.id for task in result.items] == [8]
+    assert decode_cursor(result.next_cursor) == [None, 8]
+    db.execute.assert_awaited_once()
+    statement = str(db.execute.await_args.args[0])
+    assert "FROM project_members, projects" in statement
+    assert "> ('infinity'::timestamp, " in statement
+    assert "ORDER BY coalesce(tasks.due_date, 'infinity'::timestamp), tasks.id" in (
+        statement
+    )
+
+
+async def test_my_tasks_invalid_cursor(db):
+    """A cursor that does not decode to (due date, id) is a 400."""
+    service = TaskService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.get_my_tasks(user_id=1, cursor=encode_cursor("soon", 5))
+
+    assert exc.value.status_code == 400
+    db.execute.assert_not_awaited()
@@ -0,0 +1,92 @@
+"""
+"My tasks" inbox benchmark: page latency for a user with many assigned tasks.
+
+Walks every keyset page of GET /api/me/tasks (ordered by due date, then id)
+for a user with '--tasks' live tasks spread over their projects, and reports
+the median/p95/max page time. Pages are served by the covering partial index
+ix_tasks_assignee_due_live, so the last page costs the same as the first.
+
+Needs a seeded database (python -m app.core.seed). The tasks are created
+inside a transaction that is rolled back, so the database is left unchanged.
+
+Usage:
+    python -m benchmarks.my_tasks --tasks 10000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.task_repository import TaskRepository
+
+FIND_MEMBER = """
+SELECT user_id FROM project_members
+GROUP BY user_id ORDER BY count(*) DESC LIMIT 1
+"""
+CREATE_TASKS = """
+INSERT INTO tasks (project_id, assigned_to, title, status, priority, due_date)
+SELECT projects[1 + n % cardinality(projects)], :user_id, 'Inbox task ' || n,
+       CASE WHEN n % 4 = 0 THEN 'done' ELSE 'todo' END, 1 + n % 4,
+       CASE WHEN n % 10 = 0 THEN NULL
+            ELSE now() + make_interval(days => n % 90) END
+FROM generate_series(1, :tasks) AS n,
+     (SELECT array_agg(project_id) AS projects FROM project_members
+      WHERE user_id = :user_id) AS member
+"""
+
+
+async def walk_pages(db, user_id: int, page_size: int) -> list:
+    repository = TaskRepository(db)
+    timings = []
+    after = None
+    while True:
+        start = time.perf_counter()
+        tasks = await repository.get_assigned_tasks(
+            user_id=user_id, limit=page_size, after=after
+        )
+        timings.append(time.perf_counter() - start)
+        if len(tasks) < page_size:
+            return timings
+        after = (tasks[-1].due_date, tasks[-1].id)
+
+
+async def main_async(args):
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(text(FIND_MEMBER))
+        if user_id is None:
+            raise SystemExit("No project member found, seed the database first")
+
+        await db.execute(text(CREATE_TASKS), {"user_id": user_id, "tasks": args.tasks})
+        await db.execute(text("ANALYZE tasks"))
+
+        timings = await walk_pages(db, user_id, args.page_size)
+        await db.rollback()
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[max(int(len(timings_ms) * 0.95) - 1, 0)]
+    print(
+        f"User {user_id}: {len(timings_ms)} pages of {args.page_size} "
+        f"(+{args.tasks} scratch tasks)"
+    )
+    print(
+        f"  page time: median {statistics.median(timings_ms):.2f} ms, "
+        f"p95 {p95:.2f} ms, max {timings_ms[-1]:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="My tasks inbox benchmark.")
+    parser.add_argument(
+        "--tasks", type=int, default=10000, help="Scratch tasks assigned to the user"
+    )
+    parser.add_argument("--page-size", type=int, default=50, help="Tasks per page")
+
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Project listing benchmark: a user who is a member of many projects.
+
+Compares listing every page of GET /api/projects and then fetching the
+counts of each project separately (task totals, open tasks, members, active
+sprint: N+1 queries per page) with GET /api/projects?include=counts, which
+returns the same counts with the page in one statement.
+
+Needs a seeded database (python -m app.core.seed). Every run works on
+'--projects' scratch projects created inside a transaction that is rolled
+back, so the database is left unchanged.
+
+Usage:
+    python -m benchmarks.project_listing --projects 600 --page-size 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.db import AsyncSessionLocal
+from app.repositories.project_repository import ProjectRepository
+
+FIND_USER = "SELECT id FROM users ORDER BY id LIMIT 1"
+CREATE_PROJECTS = """
+INSERT INTO projects (title, status, managed_by)
+SELECT 'Listing project ' || n, 'active', :user_id
+FROM generate_series(1, :projects) AS n
+RETURNING id
+"""
+CREATE_MEMBERS = """
+INSERT INTO project_members (project_id, user_id, role)
+SELECT project_id, :user_id, 'owner' FROM unnest(CAST(:ids AS int[])) AS project_id
+"""
+CREATE_SPRINTS = """
+INSERT INTO sprints (project_id, title, status, start_date, end_date)
+SELECT project_id, 'Current sprint', 'active', current_date, current_date + 14
+FROM unnest(CAST(:ids AS int[])) AS project_id
+"""
+CREATE_TASKS = """
+INSERT INTO tasks (project_id, title, status, priority)
+SELECT project_id, 'Listing task ' || n,
+       CASE WHEN n % 3 = 0 THEN 'done' ELSE 'todo' END, 1 + n % 4
+FROM unnest(CAST(:ids AS int[])) AS project_id, generate_series(1, :tasks) AS n
+"""
+CREATE_STATS = """
+INSERT INTO project_task_stats (project_id, dimension, key, count)
+SELECT project_id, 'status', status, count(*) FROM tasks
+WHERE project_id = ANY(CAST(:ids AS int[])) AND deleted_at IS NULL
+GROUP BY project_id, status
+"""
+COUNT_TASKS = """
+SELECT count(*) AS total, count(*) FILTER (WHERE status <> 'done') AS open
+FROM tasks WHERE project_id = :project_id AND deleted_at IS NULL
+"""
+COUNT_MEMBERS = "SELECT count(*) FROM project_members WHERE project_id = :project_id"
+ACTIVE_SPRINT = """
+SELECT id, title FROM sprints
+WHERE project_id = :project_id AND status = 'active' AND deleted_at IS NULL
+ORDER BY start_date DESC LIMIT 1
+"""
+
+
+async def prepare(db, projects: int, tasks: int) -> int:
+    user_id = await db.scalar(text(FIND_USER))
+    if user_id is None:
+        raise SystemExit("No user found, seed the database first")
+
+    ids = (
+        (
+            await db.execute(
+                text(CREATE_PROJECTS), {"user_id": user_id, "projects": projects}
+            )
+        )
+        .scalars()
+        .all()
+    )
+    params = {"ids": ids, "user_id": user_id, "tasks": tasks}
+    for statement in (CREATE_MEMBERS, CREATE_SPRINTS, CREATE_TASKS, CREATE_STATS):
+        await db.execute(text(statement), params)
+    return user_id
+
+
+async def list_n_plus_one(db, user_id, page, page_size):
+    projects, total = await ProjectRepository(db).get_user_projects(
+        user_id=user_id, page=page, page_size=page_size
+    )
+    for project in projects:
+        params = {"project_id": project.id}
+        (await db.execute(text(COUNT_TASKS), params)).first()
+        await db.scalar(text(COUNT_MEMBERS), params)
+        (await db.execute(text(ACTIVE_SPRINT), params)).first()
+    return len(projects), total
+
+
+async def list_with_counts(db, user_id, page, page_size):
+    rows, total = await ProjectRepository(db).get_user_projects(
+        user_id=user_id, page=page, page_size=page_size, include_counts=True
+    )
+    return len(rows), total
+
+
+async def run(mode, list_page, args):
+    async with AsyncSessionLocal() as db:
+        user_id = await prepare(db, args.projects, args.tasks)
+
+        start = time.perf_counter()
+        page, listed, total = 1, 0, None
+        while total is None or listed < total:
+            count, total = await list_page(db, user_id, page, args.page_size)
+            if not count:
+                break
+            listed += count
+            page += 1
+        elapsed = time.perf_counter() - start
+
+        await db.rollback()
+
+    print(
+        f"{mode:>12}: listed {listed} projects in {page - 1} pages, "
+        f"{elapsed * 1000:9.1f} ms ({elapsed * 1000 / max(page - 1, 1):7.1f} ms/page)"
+    )
+
+
+async def main_async(args):
+    print(
+        f"User in {args.projects}+ projects, {args.tasks} tasks each, "
+        f"{args.page_size} projects per page"
+    )
+    await run("N+1", list_n_plus_one, args)
+    await run("with counts", list_with_counts, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project listing benchmark.")
+    parser.add_argument(
+        "--projects", type=int, default=600, help="Scratch projects of the user"
+    )
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks per project")
+    parser.add_argument("--page-size", type=int, default=100, help="Projects per page")
+
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
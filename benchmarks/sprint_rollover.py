@@ -0,0 +1,150 @@
+"""
+Sprint rollover benchmark: moving the unfinished tasks of a large sprint.
+
+Compares what leads did before (one PATCH /api/tasks/{id} per task: load,
+compare-and-swap UPDATE, history INSERT) with the set-based move used by
+POST /api/sprints/{id}/close (one UPDATE ... RETURNING feeding the history
+and burndown inserts).
+
+Needs a seeded database (python -m app.core.seed). Every run works on
+scratch sprints filled with '--tasks' tasks inside a transaction that is
+rolled back, so the database is left unchanged.
+
+Usage:
+    python -m benchmarks.sprint_rollover --tasks 5000 --done-ratio 0.2
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.db import AsyncSessionLocal
+from app.core.enums import HistoryAction, TaskStatus
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+
+FIND_OWNER = """
+SELECT project_id, user_id FROM project_members
+WHERE role = 'owner' ORDER BY project_id LIMIT 1
+"""
+CREATE_SPRINT = """
+INSERT INTO sprints (project_id, title, status, start_date, end_date)
+VALUES (:project_id, :title, 'active', current_date, current_date + 14)
+RETURNING id
+"""
+CREATE_TASKS = """
+INSERT INTO tasks (project_id, sprint_id, title, status, priority)
+SELECT :project_id, :sprint_id, 'Rollover task ' || n,
+       CASE WHEN random() < :done_ratio THEN 'done' ELSE 'todo' END,
+       1 + n % 4
+FROM generate_series(1, :tasks) AS n
+"""
+READ = """
+SELECT id, version FROM tasks
+WHERE sprint_id = :sprint_id AND status <> 'done' AND deleted_at IS NULL
+"""
+MOVE_ONE = """
+UPDATE tasks SET sprint_id = :target_id, version = version + 1, updated_at = now()
+WHERE id = :task_id AND version = :version
+"""
+INSERT_HISTORY = """
+INSERT INTO task_history (task_id, changed_by, action, details)
+VALUES (:task_id, :user_id, 'update', CAST(:details AS jsonb))
+"""
+
+
+async def prepare(db, tasks: int, done_ratio: float):
+    owner = (await db.execute(text(FIND_OWNER))).first()
+    if owner is None:
+        raise SystemExit("No project found, seed the database first")
+
+    sprint_ids = []
+    for title in ("Rollover source", "Rollover target"):
+        sprint_ids.append(
+            await db.scalar(
+                text(CREATE_SPRINT), {"project_id": owner.project_id, "title": title}
+            )
+        )
+    await db.execute(
+        text(CREATE_TASKS),
+        {
+            "project_id": owner.project_id,
+            "sprint_id": sprint_ids[0],
+            "tasks": tasks,
+            "done_ratio": done_ratio,
+        },
+    )
+    return owner, sprint_ids
+
+
+async def move_per_task(db, owner, source_id, target_id) -> int:
+    rows = (await db.execute(text(READ), {"sprint_id": source_id})).all()
+    details = f'{{"before": {{"sprint_id": {source_id}}}, "after": {{"sprint_id": {target_id}}}}}'
+    for row in rows:
+        await db.execute(
+            text(MOVE_ONE),
+            {"target_id": target_id, "task_id": row.id, "version": row.version},
+        )
+        await db.execute(
+            text(INSERT_HISTORY),
+            {"task_id": row.id, "user_id": owner.user_id, "details": details},
+        )
+    return len(rows)
+
+
+async def move_set_based(db, owner, source_id, target_id) -> int:
+    task_ids = await TaskRepository(db).bulk_update(
+        project_id=owner.project_id,
+        values={"sprint_id": target_id},
+        changed_by=owner.user_id,
+        action=HistoryAction.UPDATE.value,
+        conditions=[
+            Task.sprint_id == source_id,
+            Task.status != TaskStatus.DONE.value,
+        ],
+    )
+    return len(task_ids)
+
+
+async def run(mode, move, tasks, done_ratio):
+    async with AsyncSessionLocal() as db:
+        owner, (source_id, target_id) = await prepare(db, tasks, done_ratio)
+
+        start = time.perf_counter()
+        moved = await move(db, owner, source_id, target_id)
+        elapsed = time.perf_counter() - start
+
+        await db.rollback()
+
+    print(
+        f"{mode:>10}: moved {moved} tasks in {elapsed * 1000:9.1f} ms "
+        f"({moved / elapsed:9.1f} tasks/s)"
+    )
+
+
+async def main_async(args):
+    print(
+        f"Sprint with {args.tasks} tasks, ~{args.done_ratio:.0%} done "
+        f"(done tasks stay in the closed sprint)"
+    )
+    await run("per task", move_per_task, args.tasks, args.done_ratio)
+    await run("set based", move_set_based, args.tasks, args.done_ratio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprint rollover benchmark.")
+    parser.add_argument("--tasks", type=int, default=5000, help="Tasks in the sprint")
+    parser.add_argument(
+        "--done-ratio",
+        type=float,
+        default=0.2,
+        help="Share of tasks already done",
+    )
+
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Contention benchmark: concurrent edits of the same few tasks.
+
+Compares the previous write path (SELECT ... FOR UPDATE held across the
+permission check, the update and the history insert) with the optimistic one
+(plain read, then UPDATE ... WHERE id = ? AND version = ?, retried on conflict).
+
+Needs a seeded database (python -m app.core.seed). Clients share the app's
+engine, so workers beyond its pool size (15 by default) also wait on the pool.
+
+Usage:
+    python -m benchmarks.task_contention --workers 50 --edits 20 --hot-tasks 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.db import AsyncSessionLocal
+
+READ_LOCKED = """
+SELECT t.id, t.version, t.project_id, t.status
+FROM tasks t WHERE t.id = :task_id
+FOR UPDATE
+"""
+READ = """
+SELECT t.id, t.version, t.project_id, t.status
+FROM tasks t WHERE t.id = :task_id
+"""
+CHECK_ROLE = """
+SELECT role FROM project_members
+WHERE project_id = :project_id AND user_id = :user_id
+"""
+UPDATE = """
+UPDATE tasks SET status = :status, version = version + 1, updated_at = now()
+WHERE id = :task_id
+RETURNING version
+"""
+UPDATE_IF_VERSION = """
+UPDATE tasks SET status = :status, version = version + 1, updated_at = now()
+WHERE id = :task_id AND version = :version
+RETURNING version
+"""
+INSERT_HISTORY = """
+INSERT INTO task_history (task_id, changed_by, action, details)
+VALUES (:task_id, :user_id, 'update', CAST(:details AS jsonb))
+"""
+
+STATUSES = ("todo", "in_progress", "review", "in_testing", "done")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.conflicts = 0
+        self.failures = 0
+
+
+async def edit_locked(task_id: int, user_id: int, work_ms: float, stats: Stats):
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(text(READ_LOCKED), {"task_id": task_id})).one()
+        await db.execute(
+            text(CHECK_ROLE), {"project_id": row.project_id, "user_id": user_id}
+        )
+        await asyncio.sleep(work_ms / 1000)
+        status = random.choice(STATUSES)
+        await db.execute(text(UPDATE), {"task_id": task_id, "status": status})
+        await db.execute(
+            text(INSERT_HISTORY),
+            {"task_id": task_id, "user_id": user_id, "details": "{}"},
+        )
+        await db.commit()
+
+
+async def edit_optimistic(
+    task_id: int, user_id: int, work_ms: float, stats: Stats, retries: int = 10
+):
+    for _ in range(retries):
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(text(READ), {"task_id": task_id})).one()
+            await db.execute(
+                text(CHECK_ROLE), {"project_id": row.project_id, "user_id": user_id}
+            )
+            await asyncio.sleep(work_ms / 1000)
+            status = random.choice(STATUSES)
+            updated = await db.scalar(
+                text(UPDATE_IF_VERSION),
+                {"task_id": task_id, "status": status, "version": row.version},
+            )
+            if updated is None:
+                # Lost the race: a client would get 409, reload and retry
+                stats.conflicts += 1
+                await db.rollback()
+                continue
+
+            await db.execute(
+                text(INSERT_HISTORY),
+                {"task_id": task_id, "user_id": user_id, "details": "{}"},
+            )
+            await db.commit()
+            return
+    stats.failures += 1
+
+
+async def worker(mode, task_ids, edits, work_ms, stats):
+    edit = edit_locked if mode == "lock" else edit_optimistic
+    for _ in range(edits):
+        start = time.perf_counter()
+        await edit(random.choice(task_ids), 1, work_ms, stats)
+        stats.latencies.append(time.perf_counter() - start)
+
+
+async def run(mode, task_ids, workers, edits, work_ms):
+    stats = Stats()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[worker(mode, task_ids, edits, work_ms, stats) for _ in range(workers)]
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(stats.latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{mode:>10}: {len(latencies) / elapsed:8.1f} edits/s | "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms | "
+        f"p95 {p95 * 1000:7.1f} ms | "
+        f"conflicts {stats.conflicts} | gave up {stats.failures}"
+    )
+
+
+async def main_async(args):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            text("SELECT id FROM tasks WHERE deleted_at IS NULL ORDER BY id LIMIT :n"),
+            {"n": args.hot_tasks},
+        )
+        task_ids = result.scalars().all()
+
+    if not task_ids:
+        raise SystemExit("No tasks found, seed the database first")
+
+    print(
+        f"{args.workers} workers x {args.edits} edits on {len(task_ids)} tasks, "
+        f"{args.work_ms} ms of work between read and write"
+    )
+    for mode in ("lock", "optimistic"):
+        await run(mode, task_ids, args.workers, args.edits, args.work_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent task edit benchmark.")
+    parser.add_argument("--workers", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--edits", type=int, default=20, help="Edits per client")
+    parser.add_argument(
+        "--hot-tasks", type=int, default=5, help="Number of tasks being edited"
+    )
+    parser.add_argument(
+        "--work-ms",
+        type=float,
+        default=5,
+        help="Time spent between read and write (permission checks, history)",
+    )
+
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
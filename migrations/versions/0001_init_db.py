@@ -0,0 +1,259 @@
+"""init_db
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-12-12 02:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import Text
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_index(op.f("ix_users_id"), "users", ["id"], unique=False)
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("managed_by", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["managed_by"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_projects_deleted_at"), "projects", ["deleted_at"], unique=False
+    )
+    op.create_table(
+        "project_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("changed_by", sa.Integer(), nullable=False),
+        sa.Column(
+            "changed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("details", postgresql.JSONB(astext_type=Text()), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["changed_by"],
+            ["users.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["project_id"],
+            ["projects.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_project_history_project_id"),
+        "project_history",
+        ["project_id"],
+        unique=False,
+    )
+    op.create_table(
+        "project_members",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_id", "user_id", name="uq_project_user"),
+    )
+    op.create_index(
+        op.f("ix_project_members_project_id"),
+        "project_members",
+        ["project_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_project_members_user_id"), "project_members", ["user_id"], unique=False
+    )
+    op.create_table(
+        "sprints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_sprints_deleted_at"), "sprints", ["deleted_at"], unique=False
+    )
+    op.create_index(
+        op.f("ix_sprints_project_id"), "sprints", ["project_id"], unique=False
+    )
+    op.create_index(
+        "ix_sprints_project_status_dates",
+        "sprints",
+        ["project_id", "status", "start_date", "end_date"],
+        unique=False,
+    )
+    op.create_table(
+        "sprint_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sprint_id", sa.Integer(), nullable=False),
+        sa.Column("changed_by", sa.Integer(), nullable=False),
+        sa.Column(
+            "changed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("details", postgresql.JSONB(astext_type=Text()), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["changed_by"],
+            ["users.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["sprint_id"],
+            ["sprints.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_sprint_history_sprint_id"),
+        "sprint_history",
+        ["sprint_id"],
+        unique=False,
+    )
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("sprint_id", sa.Integer(), nullable=True),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("assigned_to", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_to"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["parent_id"], ["tasks.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sprint_id"], ["sprints.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_tasks_assigned_to"), "tasks", ["assigned_to"], unique=False
+    )
+    op.create_index(op.f("ix_tasks_created_at"), "tasks", ["created_at"], unique=False)
+    op.create_index(op.f("ix_tasks_deleted_at"), "tasks", ["deleted_at"], unique=False)
+    op.create_index(op.f("ix_tasks_id"), "tasks", ["id"], unique=False)
+    op.create_index(op.f("ix_tasks_parent_id"), "tasks", ["parent_id"], unique=False)
+    op.create_index(op.f("ix_tasks_priority"), "tasks", ["priority"], unique=False)
+    op.create_index(op.f("ix_tasks_project_id"), "tasks", ["project_id"], unique=False)
+    op.create_index(op.f("ix_tasks_sprint_id"), "tasks", ["sprint_id"], unique=False)
+    op.create_index(op.f("ix_tasks_status"), "tasks", ["status"], unique=False)
+    op.create_index(op.f("ix_tasks_title"), "tasks", ["title"], unique=False)
+    op.create_table(
+        "task_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("changed_by", sa.Integer(), nullable=False),
+        sa.Column(
+            "changed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["changed_by"],
+            ["users.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["task_id"],
+            ["tasks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_task_history_task_id"), "task_history", ["task_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_task_history_task_id"), table_name="task_history")
+    op.drop_table("task_history")
+    op.drop_index(op.f("ix_tasks_assigned_to"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_created_at"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_deleted_at"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_id"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_parent_id"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_priority"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_project_id"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_sprint_id"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_status"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_title"), table_name="tasks")
+    op.drop_table("tasks")
+    op.drop_index(op.f("ix_sprint_history_sprint_id"), table_name="sprint_history")
+    op.drop_table("sprint_history")
+    op.drop_index(op.f("ix_sprints_deleted_at"), table_name="sprints")
+    op.drop_index(op.f("ix_sprints_project_id"), table_name="sprints")
+    op.drop_index("ix_sprints_project_status_dates", table_name="sprints")
+    op.drop_table("sprints")
+    op.drop_index(op.f("ix_project_members_project_id"), table_name="project_members")
+    op.drop_index(op.f("ix_project_members_user_id"), table_name="project_members")
+    op.drop_table("project_members")
+    op.drop_index(op.f("ix_project_history_project_id"), table_name="project_history")
+    op.drop_table("project_history")
+    op.drop_index(op.f("ix_projects_deleted_at"), table_name="projects")
+    op.drop_table("projects")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_index(op.f("ix_users_id"), table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,108 @@
+"""partition_history
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-12-16 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# History table -> (entity foreign key, referenced table, details type)
+HISTORY_TABLES = {
+    "task_history": ("task_id", "tasks", "json"),
+    "sprint_history": ("sprint_id", "sprints", "jsonb"),
+    "project_history": ("project_id", "projects", "jsonb"),
+}
+
+# Monthly partitions are created from the oldest row up to this many months
+# ahead; later months are created by app.jobs.history_partitions.
+MONTHS_AHEAD = 3
+
+
+def _swap_table(table: str, partitioned: bool) -> None:
+    """
+    Recreate 'table' (partitioned or plain) and copy its rows over.
+    The id sequence is kept, so ids keep increasing.
+    """
+    key, parent, details_type = HISTORY_TABLES[table]
+    legacy = f"{table}_legacy"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+    op.execute(f"ALTER INDEX ix_{table}_{key} RENAME TO ix_{legacy}_{key}")
+
+    primary_key = "id, changed_at" if partitioned else "id"
+    partition_by = "PARTITION BY RANGE (changed_at)" if partitioned else ""
+    op.execute(
+        f"""
+        CREATE TABLE {table} (
+            id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+            {key} INTEGER NOT NULL REFERENCES {parent} (id),
+            changed_by INTEGER NOT NULL REFERENCES users (id),
+            changed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            action VARCHAR(20) NOT NULL,
+            details {details_type},
+            CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})
+        ) {partition_by}
+        """
+    )
+    op.execute(f"CREATE INDEX ix_{table}_{key} ON {table} ({key})")
+
+    if partitioned:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(
+            f"""
+            DO $$
+            DECLARE
+                month DATE;
+            BEGIN
+                FOR month IN
+                    SELECT generate_series(
+                        date_trunc('month', coalesce(min(changed_at), now())),
+                        date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                        interval '1 month'
+                    )::date
+                    FROM {legacy}
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_' || to_char(month, 'YYYY_MM'),
+                        month,
+                        (month + interval '1 month')::date
+                    );
+                END LOOP;
+            END $$;
+            """
+        )
+
+    op.execute(
+        f"""
+        INSERT INTO {table} (id, {key}, changed_by, changed_at, action, details)
+        SELECT id, {key}, changed_by, changed_at, action, details FROM {legacy}
+        """
+    )
+
+    # Move the sequence to the new table before the legacy one is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {legacy}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in HISTORY_TABLES:
+        _swap_table(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in HISTORY_TABLES:
+        _swap_table(table, partitioned=False)
@@ -0,0 +1,38 @@
+"""sprint_burndown
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-12-20 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled for existing sprints by: python -m app.jobs.rebuild_burndown
+    op.create_table(
+        "sprint_burndown",
+        sa.Column("sprint_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("remaining_delta", sa.Integer(), nullable=False),
+        sa.Column("completed_delta", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["sprint_id"], ["sprints.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("sprint_id", "day", "priority"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("sprint_burndown")
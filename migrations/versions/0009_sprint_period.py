@@ -0,0 +1,74 @@
+"""sprint_period
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-12-22 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# daterange(start_date, end_date) fails on reversed dates: they are swapped,
+# on the assumption that they were entered the wrong way round
+SWAP_REVERSED_DATES = """
+UPDATE sprints SET start_date = end_date, end_date = start_date
+WHERE end_date < start_date
+RETURNING id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GiST support for plain equality on project_id
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    swapped = op.get_bind().execute(sa.text(SWAP_REVERSED_DATES)).scalars().all()
+    if swapped:
+        ids = ", ".join(str(sprint_id) for sprint_id in sorted(swapped))
+        print(f"### Swapped the reversed start/end dates of sprints {ids}")
+
+    op.add_column(
+        "sprints",
+        sa.Column(
+            "period",
+            postgresql.DATERANGE(),
+            sa.Computed("daterange(start_date, end_date, '[]')", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_sprints_project_period",
+        "sprints",
+        ["project_id", "period"],
+        unique=False,
+        postgresql_using="gist",
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+    # Opt-in: existing projects keep accepting overlapping active sprints
+    op.add_column(
+        "projects",
+        sa.Column(
+            "reject_sprint_overlaps",
+            sa.Boolean(),
+            server_default=sa.text("false"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "reject_sprint_overlaps")
+    op.drop_index("ix_sprints_project_period", table_name="sprints")
+    op.drop_column("sprints", "period")
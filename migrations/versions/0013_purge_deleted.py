@@ -0,0 +1,70 @@
+"""purge_deleted
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-12-26 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0013"
+down_revision: Union[str, Sequence[str], None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PURGE_TABLES = ("tasks", "sprints", "projects")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "purged_records",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "purged_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("data", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("history", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_purged_records_entity",
+        "purged_records",
+        ["entity_type", "entity_id"],
+        unique=False,
+    )
+
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for table in PURGE_TABLES:
+            op.create_index(
+                f"ix_{table}_deleted_purge",
+                table,
+                ["deleted_at", "id"],
+                unique=False,
+                postgresql_where=sa.text("deleted_at IS NOT NULL"),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in PURGE_TABLES:
+            op.drop_index(
+                f"ix_{table}_deleted_purge",
+                table_name=table,
+                postgresql_concurrently=True,
+            )
+
+    op.drop_index("ix_purged_records_entity", table_name="purged_records")
+    op.drop_table("purged_records")
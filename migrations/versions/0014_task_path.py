@@ -0,0 +1,113 @@
+"""task_path
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2025-12-27 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0014"
+down_revision: Union[str, Sequence[str], None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Paths of existing tasks, walking down from the root tasks
+BACKFILL_PATHS = """
+WITH RECURSIVE tree AS (
+    SELECT id, text2ltree(id::text) AS path FROM tasks WHERE parent_id IS NULL
+    UNION ALL
+    SELECT t.id, tree.path || t.id::text
+    FROM tasks AS t JOIN tree ON t.parent_id = tree.id
+)
+UPDATE tasks SET path = tree.path FROM tree WHERE tasks.id = tree.id
+"""
+
+# Path of a new or re-parented task from its parent's path; moving a task
+# under one of its own subtasks would create a cycle and is rejected.
+SET_PATH_FUNCTION = """
+CREATE FUNCTION tasks_set_path() RETURNS trigger AS $$
+DECLARE
+    parent_path ltree;
+BEGIN
+    IF NEW.parent_id IS NULL THEN
+        NEW.path := text2ltree(NEW.id::text);
+        RETURN NEW;
+    END IF;
+
+    SELECT path INTO parent_path FROM tasks WHERE id = NEW.parent_id;
+    IF TG_OP = 'UPDATE' AND parent_path <@ OLD.path THEN
+        RAISE EXCEPTION 'ck_tasks_parent_not_descendant: task % can''t be moved under its own subtask %',
+            NEW.id, NEW.parent_id
+            USING ERRCODE = 'check_violation';
+    END IF;
+
+    NEW.path := parent_path || NEW.id::text;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Re-parenting moves the whole subtree with one UPDATE
+MOVE_SUBTREE_FUNCTION = """
+CREATE FUNCTION tasks_move_subtree() RETURNS trigger AS $$
+BEGIN
+    UPDATE tasks SET path = NEW.path || subpath(path, nlevel(OLD.path))
+    WHERE path <@ OLD.path AND id <> NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS ltree")
+
+    op.execute("ALTER TABLE tasks ADD COLUMN path ltree")
+    op.execute(BACKFILL_PATHS)
+
+    op.execute(SET_PATH_FUNCTION)
+    op.execute(MOVE_SUBTREE_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER tasks_set_path
+        BEFORE INSERT OR UPDATE OF parent_id ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_set_path()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_move_subtree
+        AFTER UPDATE OF parent_id ON tasks
+        FOR EACH ROW WHEN (OLD.path IS DISTINCT FROM NEW.path)
+        EXECUTE FUNCTION tasks_move_subtree()
+        """
+    )
+
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_path",
+            "tasks",
+            ["path"],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_path", table_name="tasks", postgresql_concurrently=True)
+
+    op.execute("DROP TRIGGER tasks_move_subtree ON tasks")
+    op.execute("DROP TRIGGER tasks_set_path ON tasks")
+    op.execute("DROP FUNCTION tasks_move_subtree()")
+    op.execute("DROP FUNCTION tasks_set_path()")
+    op.drop_column("tasks", "path")
@@ -0,0 +1,47 @@
+"""my_tasks_index
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2025-12-28 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0015"
+down_revision: Union[str, Sequence[str], None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_assignee_due_live",
+            "tasks",
+            [
+                "assigned_to",
+                sa.text("coalesce(due_date, 'infinity'::timestamp)"),
+                "id",
+            ],
+            unique=False,
+            postgresql_include=["status", "priority", "project_id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_assignee_due_live",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,87 @@
+"""history_listing_indexes
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2025-12-30 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0017"
+down_revision: Union[str, Sequence[str], None] = "0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# History table -> entity foreign key
+HISTORY_TABLES = {
+    "task_history": "task_id",
+    "sprint_history": "sprint_id",
+    "project_history": "project_id",
+}
+
+LIST_PARTITIONS = """
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = :table
+"""
+
+
+def _indexes(key: str) -> dict:
+    """Index suffix -> (access method, columns)."""
+    return {
+        # History listing of one entity: keyset pages on (changed_at, id)
+        f"{key}_changed": ("btree", f"{key}, changed_at, id"),
+        # Time range scans; rows are appended in changed_at order
+        "changed_at": ("brin", "changed_at"),
+    }
+
+
+def _create_partitioned_index(table: str, suffix: str, using: str, columns: str):
+    """
+    CREATE INDEX CONCURRENTLY is not supported on a partitioned table: create
+    the parent index ON ONLY the table (invalid until every partition has its
+    index), build the partition indexes concurrently and attach them.
+    Partitions created later get the index automatically.
+    """
+    index = f"ix_{table}_{suffix}"
+    op.execute(f"CREATE INDEX {index} ON ONLY {table} USING {using} ({columns})")
+
+    with op.get_context().autocommit_block():
+        partitions = (
+            op.get_bind()
+            .execute(sa.text(LIST_PARTITIONS), {"table": table})
+            .scalars()
+            .all()
+        )
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{partition}_{suffix} "
+                f"ON {partition} USING {using} ({columns})"
+            )
+            op.execute(f"ALTER INDEX {index} ATTACH PARTITION ix_{partition}_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, key in HISTORY_TABLES.items():
+        for suffix, (using, columns) in _indexes(key).items():
+            _create_partitioned_index(table, suffix, using, columns)
+
+        # Covered by the leading column of ix_<table>_<key>_changed
+        op.execute(f"DROP INDEX ix_{table}_{key}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, key in HISTORY_TABLES.items():
+        op.execute(f"CREATE INDEX ix_{table}_{key} ON {table} ({key})")
+        for suffix in _indexes(key):
+            # Dropping the parent index drops the attached partition indexes
+            op.execute(f"DROP INDEX ix_{table}_{suffix}")
@@ -0,0 +1,119 @@
+"""task_history_jsonb
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2025-12-31 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0018"
+down_revision: Union[str, Sequence[str], None] = "0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows converted per transaction
+BATCH_SIZE = 5000
+
+# Keeps the new column in step with rows written while the backfill runs
+SYNC_FUNCTION = """
+CREATE FUNCTION task_history_sync_details() RETURNS trigger AS $$
+BEGIN
+    NEW.details_jsonb := NEW.details::jsonb;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+NEXT_BATCH_END = """
+SELECT max(id) FROM (
+    SELECT id FROM task_history
+    WHERE id > :after_id
+    ORDER BY id
+    LIMIT :batch_size
+) AS batch
+"""
+
+BACKFILL_BATCH = """
+UPDATE task_history SET details_jsonb = details::jsonb
+WHERE id > :after_id AND id <= :batch_end
+  AND details IS NOT NULL AND details_jsonb IS NULL
+"""
+
+LIST_PARTITIONS = """
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = 'task_history'
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ALTER COLUMN ... TYPE jsonb would rewrite the table under an ACCESS
+    # EXCLUSIVE lock. Instead fill a new jsonb column in short batches and
+    # swap the columns at the end, which only changes the catalog.
+    op.execute("ALTER TABLE task_history ADD COLUMN details_jsonb jsonb")
+    op.execute(SYNC_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER task_history_sync_details
+        BEFORE INSERT OR UPDATE OF details ON task_history
+        FOR EACH ROW EXECUTE FUNCTION task_history_sync_details()
+        """
+    )
+
+    # One transaction per batch; the trigger covers the rows written meanwhile
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after_id = 0
+        while True:
+            batch_end = bind.execute(
+                sa.text(NEXT_BATCH_END),
+                {"after_id": after_id, "batch_size": BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+            bind.execute(
+                sa.text(BACKFILL_BATCH),
+                {"after_id": after_id, "batch_end": batch_end},
+            )
+            after_id = batch_end
+
+    # Give up rather than queue writers behind the swap's short exclusive lock
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("DROP TRIGGER task_history_sync_details ON task_history")
+    op.execute("DROP FUNCTION task_history_sync_details()")
+    op.execute("ALTER TABLE task_history DROP COLUMN details")
+    op.execute("ALTER TABLE task_history RENAME COLUMN details_jsonb TO details")
+
+    # Same as the indexes of 0017: CONCURRENTLY per partition, then attached
+    op.execute(
+        "CREATE INDEX ix_task_history_details ON ONLY task_history "
+        "USING gin (details jsonb_path_ops)"
+    )
+    with op.get_context().autocommit_block():
+        partitions = op.get_bind().execute(sa.text(LIST_PARTITIONS)).scalars().all()
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{partition}_details "
+                f"ON {partition} USING gin (details jsonb_path_ops)"
+            )
+            op.execute(
+                f"ALTER INDEX ix_task_history_details "
+                f"ATTACH PARTITION ix_{partition}_details"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX ix_task_history_details")
+    op.execute(
+        "ALTER TABLE task_history ALTER COLUMN details TYPE json USING details::json"
+    )